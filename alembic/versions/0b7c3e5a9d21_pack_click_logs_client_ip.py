@@ -0,0 +1,88 @@
+"""store click_logs.client_ip as INET / packed 16 bytes, add network and country
+
+Revision ID: 0b7c3e5a9d21
+Revises: f2b8d4e6a1c3
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.ipaddr import normalize_ip, pack_ip, unpack_ip
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7c3e5a9d21'
+down_revision: Union[str, None] = 'f2b8d4e6a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _ip_type(bind):
+    return postgresql.INET() if bind.dialect.name == 'postgresql' else sa.LargeBinary(16)
+
+
+def _copy_column(bind, source: str, target: str, target_type, convert) -> None:
+    """id 순서로 배치 단위로 source 컬럼을 변환해 target 컬럼에 씁니다."""
+    click_logs = sa.table(
+        'click_logs', sa.column('id', sa.Integer()), sa.column(source), sa.column(target, target_type),
+    )
+    update = (
+        click_logs.update()
+        .where(click_logs.c.id == sa.bindparam('row_id'))
+        .values({target: sa.bindparam('value', type_=target_type)})
+    )
+    last = 0
+    while True:
+        rows = bind.execute(
+            sa.select(click_logs.c.id, click_logs.c[source])
+            .where(click_logs.c.id > last).order_by(click_logs.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        values = [{'row_id': row_id, 'value': convert(value)} for row_id, value in rows if value is not None]
+        values = [v for v in values if v['value'] is not None]
+        if values:
+            bind.execute(update, values)
+        last = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if 'click_logs' not in sa.inspect(bind).get_table_names():
+        return
+    ip_type = _ip_type(bind)
+    # Postgres는 INET에 문자열, 그 외는 16바이트 (IP가 아닌 값은 NULL)
+    convert = normalize_ip if bind.dialect.name == 'postgresql' else pack_ip
+    with op.batch_alter_table('click_logs') as batch_op:
+        batch_op.add_column(sa.Column('client_ip_packed', ip_type, nullable=True))
+        batch_op.add_column(sa.Column('network', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('country', sa.String(length=2), nullable=True))
+    _copy_column(bind, 'client_ip', 'client_ip_packed', ip_type, convert)
+    with op.batch_alter_table('click_logs') as batch_op:
+        batch_op.drop_column('client_ip')
+        batch_op.alter_column('client_ip_packed', new_column_name='client_ip')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if 'click_logs' not in sa.inspect(bind).get_table_names():
+        return
+    ip_type = _ip_type(bind)
+    convert = str if bind.dialect.name == 'postgresql' else unpack_ip
+    with op.batch_alter_table('click_logs') as batch_op:
+        batch_op.alter_column('client_ip', new_column_name='client_ip_packed', existing_type=ip_type)
+    with op.batch_alter_table('click_logs') as batch_op:
+        batch_op.add_column(sa.Column('client_ip', sa.String(), nullable=True))
+    _copy_column(bind, 'client_ip_packed', 'client_ip', sa.String(), convert)
+    with op.batch_alter_table('click_logs') as batch_op:
+        batch_op.drop_column('client_ip_packed')
+        batch_op.drop_column('country')
+        batch_op.drop_column('network')
@@ -0,0 +1,33 @@
+"""drop index on urls.created_at
+
+Revision ID: 5e3a7c9b1f28
+Revises: 1d4f6b8a2c57
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e3a7c9b1f28'
+down_revision: Union[str, None] = '1d4f6b8a2c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 단축 키 필터는 이제 id로 따라잡으므로 created_at 인덱스는 쓰이지 않음
+    if 'urls' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_index('ix_urls_created_at', table_name='urls')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'urls' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_index('ix_urls_created_at', 'urls', ['created_at'])
@@ -0,0 +1,75 @@
+"""add url_targets, drop click_logs.short_code foreign key
+
+Revision ID: 7b2e4c1d9a35
+Revises: 3f1c2a9d7b64
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4c1d9a35'
+down_revision: Union[str, None] = '3f1c2a9d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'url_targets',
+        sa.Column('target_hash', sa.String(length=64), primary_key=True),
+        sa.Column('target_url', sa.String(), nullable=False),
+        sa.Column('short_code', sa.String(), nullable=False),
+    )
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    # 기존 링크 백필 (같은 원본 URL이 여러 개면 가장 먼저 만든 링크를 사용)
+    if 'urls' in tables:
+        url_targets = sa.table(
+            'url_targets', sa.column('target_hash'), sa.column('target_url'), sa.column('short_code'),
+        )
+        rows = bind.execute(sa.text('SELECT target_url, short_code FROM urls ORDER BY id'))
+        seen = set()
+        batch = []
+        for target_url, short_code in rows:
+            target_hash = hashlib.sha256(target_url.encode('utf-8')).hexdigest()
+            if target_hash in seen:
+                continue
+            seen.add(target_hash)
+            batch.append({'target_hash': target_hash, 'target_url': target_url, 'short_code': short_code})
+            if len(batch) >= 1000:
+                op.bulk_insert(url_targets, batch)
+                batch = []
+        if batch:
+            op.bulk_insert(url_targets, batch)
+
+    # click_logs와 urls는 다른 샤드에 있을 수 있으므로 외래 키 제거, 조회용 인덱스 추가
+    if 'click_logs' in tables:
+        for fk in inspector.get_foreign_keys('click_logs'):
+            if fk['referred_table'] == 'urls' and fk.get('name'):
+                with op.batch_alter_table('click_logs') as batch_op:
+                    batch_op.drop_constraint(fk['name'], type_='foreignkey')
+        indexes = {index['name'] for index in inspector.get_indexes('click_logs')}
+        if 'ix_click_logs_short_code' not in indexes:
+            op.create_index('ix_click_logs_short_code', 'click_logs', ['short_code'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if 'click_logs' in sa.inspect(bind).get_table_names():
+        op.drop_index('ix_click_logs_short_code', table_name='click_logs')
+        with op.batch_alter_table('click_logs') as batch_op:
+            batch_op.create_foreign_key(
+                'click_logs_short_code_fkey', 'urls', ['short_code'], ['short_code'],
+            )
+    op.drop_table('url_targets')
@@ -0,0 +1,36 @@
+"""add urls.redirect_code, urls.updated_at
+
+Revision ID: a4d9e2f6c813
+Revises: 7b2e4c1d9a35
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e2f6c813'
+down_revision: Union[str, None] = '7b2e4c1d9a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'urls' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.add_column('urls', sa.Column('redirect_code', sa.Integer(), nullable=True))
+    op.add_column('urls', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # 기존 행은 생성 시각을 마지막 변경 시각으로 사용
+    op.execute('UPDATE urls SET updated_at = created_at')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'urls' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_column('urls', 'updated_at')
+    op.drop_column('urls', 'redirect_code')
@@ -0,0 +1,32 @@
+"""add index on urls.created_at
+
+Revision ID: d51f0b7e3c92
+Revises: a4d9e2f6c813
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd51f0b7e3c92'
+down_revision: Union[str, None] = 'a4d9e2f6c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if 'urls' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_index('ix_urls_created_at', 'urls', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'urls' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_index('ix_urls_created_at', table_name='urls')
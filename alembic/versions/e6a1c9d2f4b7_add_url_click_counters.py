@@ -0,0 +1,35 @@
+"""add url_click_counters
+
+Revision ID: e6a1c9d2f4b7
+Revises: d51f0b7e3c92
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1c9d2f4b7'
+down_revision: Union[str, None] = 'd51f0b7e3c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 링크는 카운터 행이 없어 urls.clicks를 직접 증가시킴 (백필 불필요)
+    op.create_table(
+        'url_click_counters',
+        sa.Column('short_code', sa.String(), primary_key=True),
+        sa.Column('slot', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('n', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('url_click_counters')
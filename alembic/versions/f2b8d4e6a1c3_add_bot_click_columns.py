@@ -0,0 +1,39 @@
+"""add click_logs.is_bot, urls.bot_clicks, url_click_counters.bots
+
+Revision ID: f2b8d4e6a1c3
+Revises: e6a1c9d2f4b7
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4e6a1c3'
+down_revision: Union[str, None] = 'e6a1c9d2f4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    # 기존 클릭 로그는 분류하지 않고 사람 클릭으로 둠
+    if 'click_logs' in tables:
+        op.add_column('click_logs', sa.Column('is_bot', sa.Boolean(), nullable=False, server_default=sa.false()))
+    if 'urls' in tables:
+        op.add_column('urls', sa.Column('bot_clicks', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('url_click_counters', sa.Column('bots', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    op.drop_column('url_click_counters', 'bots')
+    if 'urls' in tables:
+        op.drop_column('urls', 'bot_clicks')
+    if 'click_logs' in tables:
+        op.drop_column('click_logs', 'is_bot')
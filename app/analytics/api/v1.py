@@ -1,6 +1,11 @@
+# app/analytics/api/v1.py: 클릭 분석 API 엔드포인트 정의 모듈
+# - GET /{code}: 클릭 수와 로그 목록
+# - GET /{code}/networks, /{code}/countries: 네트워크 / 국가별 클릭 수
+# - POST /batch: 여러 단축 키의 통계와 클릭 수 (NDJSON 스트림, 청크마다 쿼리 2번)
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from starlette.responses import StreamingResponse
+from app.db.database import get_read_db
 
 from app.analytics.crud import *
 from app.analytics.models import *
@@ -11,7 +16,7 @@ router = APIRouter(
     tags=["analytics"])
 
 @router.get("/{code}", response_model=AnalyticsResponse)
-def read_analytics(code: str, db: Session = Depends(get_db)):
+def read_analytics(code: str, db: Session = Depends(get_read_db)):
     """단축코드의 전체 클릭 수와 로그 목록을 반환"""
     click_logs = get_clicks(db, code)
     click_logs_infos: list[ClickLogInfo] = []
@@ -19,11 +24,41 @@ def read_analytics(code: str, db: Session = Depends(get_db)):
         click_log_info_entry = ClickLogInfo(           
             timestamp=log_entry.timestamp,
             client_ip=log_entry.client_ip,
-            user_agent=log_entry.user_agent
+            user_agent=log_entry.user_agent,
+            is_bot=log_entry.is_bot,
         )
         click_logs_infos.append(click_log_info_entry)
     
     return AnalyticsResponse(
         total_clicks=len(click_logs),
+        bot_clicks=sum(1 for log_entry in click_logs if log_entry.is_bot),
         logs=click_logs_infos,
-    )
\ No newline at end of file
+    )
+
+def _breakdown(db: Session, code: str, column) -> BreakdownResponse:
+    items = [ClickBreakdown(value=value, clicks=clicks) for value, clicks in count_clicks_by(db, code, column)]
+    return BreakdownResponse(total_clicks=sum(item.clicks for item in items), items=items)
+
+@router.get("/{code}/networks", response_model=BreakdownResponse)
+def read_network_breakdown(code: str, db: Session = Depends(get_read_db)):
+    """단축코드의 클릭 수를 네트워크(IP 대역 DB의 network)별로 반환"""
+    return _breakdown(db, code, ClickLog.network)
+
+@router.get("/{code}/countries", response_model=BreakdownResponse)
+def read_country_breakdown(code: str, db: Session = Depends(get_read_db)):
+    """단축코드의 클릭 수를 국가 코드별로 반환"""
+    return _breakdown(db, code, ClickLog.country)
+
+@router.post("/batch")
+def read_analytics_batch(request: AnalyticsBatchRequest, db: Session = Depends(get_read_db)):
+    """
+    여러 단축 키의 통계와 클릭 수를 한 번에 반환 (리포트 작업용)
+    - 응답: application/x-ndjson, 요청 순서대로 키마다 한 줄 (형식은 iter_batch_stats 참고)
+    - 청크 단위로 조회하면서 바로 보냄 (키가 많아도 응답 전체를 메모리에 만들지 않음)
+    """
+    def lines():
+        # 의존성의 세션 정리는 스트리밍 전에 실행되므로 지연 세션을 여기서 다시 열고 닫음
+        with db:
+            yield from iter_batch_stats(db, request.short_codes, request.since, request.until)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,85 @@
+# app/analytics/bots.py: 봇 / 크롤러 User-Agent 분류 모듈
+# - 링크 미리보기(unfurler), 검색 크롤러, 모니터링 프로브, HTTP 라이브러리의 User-Agent 부분 문자열 목록을
+#   정규식 하나(대안 결합)로 한 번만 컴파일해 분류
+# - 실제 사용자의 앱 내 브라우저 / 앱 User-Agent가 걸리지 않도록 크롤러 토큰으로 한정
+#   ([Pinterest/Android], YandexSearch, Mastodon 앱, "Cubot" 휴대폰 등은 사람으로 분류)
+#   - "...bot" 토큰은 단어 경계로 검사 (DEFAULT_BOT_REGEXES, 휴대폰 제조사 Cubot 제외)
+# - 같은 User-Agent는 반복해서 들어오므로 결과를 LRU 캐시 (BOT_UA_CACHE_SIZE개)
+# - User-Agent가 없거나 빈 요청은 봇으로 분류 (브라우저는 항상 보냄)
+# - 추가 패턴: BOT_UA_EXTRA_PATTERNS (쉼표 구분, 대소문자 무시 부분 문자열)
+# - BOT_CLICKS_PERSIST=0이면 봇 클릭은 click_logs에 저장하지 않고 링크별 bot_clicks 합계에만 반영
+
+import os
+import re
+from functools import lru_cache
+
+from app.monitoring.metrics import Counter
+
+BOT_UA_CACHE_SIZE = int(os.getenv("BOT_UA_CACHE_SIZE", 4096))
+BOT_UA_EXTRA_PATTERNS = [p.strip() for p in os.getenv("BOT_UA_EXTRA_PATTERNS", "").split(",") if p.strip()]
+BOT_CLICKS_PERSIST = os.getenv("BOT_CLICKS_PERSIST", "1").lower() in ("1", "true", "yes")
+
+DEFAULT_BOT_PATTERNS = (
+    # 일반 표기
+    "crawler", "spider", "crawl", "scraper", "slurp", "archiver", "fetcher",
+    # 링크 미리보기 / 메신저
+    "facebookexternalhit", "facebookcatalog", "whatsapp", "skypeuripreview", "embedly", "iframely",
+    "vkshare", "quora link preview", "google web preview", "outbrain", "pinterestbot", "redditbot",
+    "(mastodon/", "bitlybot",
+    # 검색 엔진
+    "yandexbot", "yandex.com/bots", "baiduspider", "sogou", "mediapartners-google", "adsbot-google",
+    "google-inspectiontool", "feedfetcher", "bingpreview", "petalbot", "seznam",
+    # 모니터링 / 보안 스캐너
+    "pingdom", "uptimerobot", "statuscake", "site24x7", "datadog", "newrelicpinger", "nagios",
+    "zabbix", "checkly", "nessus", "nmap", "masscan", "zgrab", "nuclei",
+    # HTTP 클라이언트 / 헤드리스 브라우저
+    "curl/", "wget/", "python-requests", "python-urllib", "python-httpx", "aiohttp", "httpclient",
+    "go-http-client", "okhttp", "java/", "libwww-perl", "lwp::", "node-fetch", "axios/", "guzzlehttp",
+    "headlesschrome", "phantomjs", "selenium", "puppeteer", "playwright",
+)
+
+# 부분 문자열로는 너무 넓은 토큰: 정규식 그대로 사용 (소문자 User-Agent 기준)
+DEFAULT_BOT_REGEXES = (
+    r"(?<!cu)bot\b",  # Googlebot/2.1, Slackbot-LinkExpanding, ... (CUBOT 휴대폰 제외)
+)
+
+clicks_classified = Counter("clicks_classified_total", "Recorded clicks by user-agent class", labelnames=("kind",))
+
+
+class BotClassifier:
+    """
+    User-Agent 부분 문자열 목록으로 만든 봇 분류기
+    - patterns: 대소문자 무시 부분 문자열 목록
+    - regexes: 소문자 User-Agent에 검사할 정규식 목록 (단어 경계가 필요한 토큰)
+    - cache_size: 분류 결과 LRU 캐시 크기
+    """
+
+    def __init__(self, patterns=DEFAULT_BOT_PATTERNS, cache_size: int = BOT_UA_CACHE_SIZE,
+                 regexes=DEFAULT_BOT_REGEXES):
+        # 긴 패턴을 먼저 두고, 소문자로 바꾼 User-Agent에 대해 검사 (re.IGNORECASE보다 빠름)
+        unique = sorted({p.lower() for p in patterns}, key=len, reverse=True)
+        self.patterns = unique
+        self._regex = re.compile("|".join([re.escape(p) for p in unique] + list(regexes)))
+        self.is_bot = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, user_agent: str | None) -> bool:
+        if not user_agent or not user_agent.strip():
+            return True
+        return self._regex.search(user_agent.lower()) is not None
+
+    def cache_info(self):
+        return self.is_bot.cache_info()
+
+    def cache_clear(self):
+        self.is_bot.cache_clear()
+
+
+# 프로세스 전역 분류기
+bot_classifier = BotClassifier(DEFAULT_BOT_PATTERNS + tuple(BOT_UA_EXTRA_PATTERNS))
+
+
+def is_bot_user_agent(user_agent: str | None) -> bool:
+    """봇 / 크롤러 User-Agent면 True (메트릭에 분류 결과 기록)"""
+    bot = bot_classifier.is_bot(user_agent)
+    clicks_classified.labels("bot" if bot else "human").inc()
+    return bot
@@ -1,17 +1,116 @@
+import json
+import os
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
+from app.analytics.iprange import ip_ranges
 from app.analytics.models import ClickLog
+from app.shortener.queries import find_url_stats_many
+
+# 배치 분석에서 쿼리 한 쌍(통계 / 클릭 로그 집계)으로 처리할 단축 키 수
+ANALYTICS_BATCH_CHUNK = int(os.getenv("ANALYTICS_BATCH_CHUNK", 1000))
 
-def log_click(db: Session, code: str, client_ip: str | None, user_agent: str | None):
+def log_click(db: Session, code: str, client_ip: str | None, user_agent: str | None, commit: bool = True,
+              is_bot: bool = False):
+    """
+    클릭 로그를 저장합니다.
+    - is_bot: 봇 / 크롤러 클릭 여부 (app/analytics/bots.py로 분류)
+    - client_ip의 network / country는 IP 대역 인덱스로 찾아 함께 저장
+    - commit: False면 세션에 추가만 하고, 호출자가 다른 변경과 함께 한 번에 커밋
+    """
+    network, country = ip_ranges.lookup(client_ip)
     db_obj = ClickLog(
         short_code=code,
         client_ip=client_ip,
         user_agent=user_agent,
+        is_bot=is_bot,
+        network=network,
+        country=country,
     )
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    if commit:
+        db.commit()
     return db_obj
 
 def get_clicks(db: Session, code: str):
     logs = db.query(ClickLog).filter(ClickLog.short_code == code).all()
-    return logs
\ No newline at end of file
+    return logs
+
+def count_clicks_by(db: Session, code: str, column) -> list[tuple[str | None, int]]:
+    """
+    단축 키의 클릭 로그를 column(ClickLog.network / ClickLog.country) 값별로 셉니다.
+    - 반환: [(값, 클릭 수)] 클릭 수 내림차순 (대역 DB에 없는 IP는 값 None)
+    """
+    clicks = func.count().label("clicks")
+    return [
+        (value, count)
+        for value, count in db.execute(
+            select(column, clicks).where(ClickLog.short_code == code).group_by(column).order_by(clicks.desc(), column)
+        )
+    ]
+
+def count_clicks_for_codes(db: Session, codes: list[str], since: datetime | None = None,
+                           until: datetime | None = None) -> dict[str, tuple[int, int]]:
+    """
+    여러 단축 키의 클릭 로그 수를 한 번의 GROUP BY로 셉니다.
+    - since / until: 클릭 시각 범위 [since, until) (None이면 제한 없음)
+    - 반환: {short_code: (클릭 수, 봇 클릭 수)}, 로그가 없는 키는 빠짐
+      (샤딩 시 샤드별 결과를 합침)
+    """
+    if not codes:
+        return {}
+    statement = select(
+        ClickLog.short_code, func.count(), func.coalesce(func.sum(case((ClickLog.is_bot, 1), else_=0)), 0)
+    ).where(ClickLog.short_code.in_(codes))
+    if since is not None:
+        statement = statement.where(ClickLog.timestamp >= since)
+    if until is not None:
+        statement = statement.where(ClickLog.timestamp < until)
+    counts: dict[str, tuple[int, int]] = {}
+    for code, clicks, bot_clicks in db.execute(statement.group_by(ClickLog.short_code)):
+        previous_clicks, previous_bots = counts.get(code, (0, 0))
+        counts[code] = (previous_clicks + clicks, previous_bots + bot_clicks)
+    return counts
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+def iter_batch_stats(db: Session, codes: list[str], since: datetime | None = None, until: datetime | None = None,
+                     chunk_size: int | None = None) -> Iterator[bytes]:
+    """
+    여러 단축 키의 통계와 클릭 로그 집계를 NDJSON 줄(bytes)로 만듭니다.
+    - 청크(ANALYTICS_BATCH_CHUNK개)마다 쿼리 2번: urls(+ 보관 테이블) 통계 조회, click_logs GROUP BY 집계
+      → 쿼리 수는 링크 수가 아니라 청크 수에 비례
+    - 줄 순서는 요청 순서 (중복 키는 한 번만)
+    - clicks / bot_clicks: 전체 기간 클릭 수 (GET /stats/{short_code}와 같음)
+    - logged_clicks / logged_bot_clicks: since / until 범위의 클릭 로그 수
+    - 없는 키: {"short_code": ..., "found": false}
+    """
+    chunk_size = ANALYTICS_BATCH_CHUNK if chunk_size is None else chunk_size
+    codes = list(dict.fromkeys(codes))
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        stats = find_url_stats_many(db, chunk)
+        logged = count_clicks_for_codes(db, [code for code in chunk if code in stats], since, until)
+        lines = []
+        for code in chunk:
+            row = stats.get(code)
+            if row is None:
+                lines.append(json.dumps({"short_code": code, "found": False}))
+                continue
+            logged_clicks, logged_bot_clicks = logged.get(code, (0, 0))
+            lines.append(json.dumps({
+                "short_code": code,
+                "found": True,
+                "target_url": row.target_url,
+                "is_active": row.is_active,
+                "created_at": _isoformat(row.created_at),
+                "expires_at": _isoformat(row.expires_at),
+                "clicks": row.clicks,
+                "bot_clicks": row.bot_clicks,
+                "logged_clicks": logged_clicks,
+                "logged_bot_clicks": logged_bot_clicks,
+            }))
+        yield ("\n".join(lines) + "\n").encode()
@@ -0,0 +1,112 @@
+# app/analytics/dedup.py: 중복 클릭 억제 윈도 모듈
+# - 링크 미리보기 봇, 재시도, 더블 클릭은 같은 (short_code, client_ip, user_agent) 이벤트를 짧은 시간에 여러 번 보냄
+#   → 첫 이벤트 후 CLICK_DEDUP_WINDOW_SECONDS 동안 같은 이벤트는 DB에 쓰지 않음 (ClickLog INSERT / 클릭 수 증가 생략)
+# - 만료 해시 집합: 키(이벤트 해시 8바이트) -> 만료 시각을 삽입 순서대로 보관
+#   - 윈도 길이가 고정이므로 삽입 순서 = 만료 순서 → 앞에서부터 만료된 항목만 제거 (O(1) 분할 상환)
+#   - 반복 이벤트는 만료 시각을 늘리지 않음 (계속 재시도하는 봇도 윈도마다 한 번은 기록)
+#   - CLICK_DEDUP_MAX_ENTRIES를 넘으면 가장 오래된 항목부터 제거
+#     (메모리 상한, 이때는 중복을 기록하는 쪽으로 동작해 실제 방문을 잃지 않음)
+# - 처음 본 이벤트는 바로 기록(동시에 들어온 중복도 억제), 기록에 실패하면 forget으로 지움
+#   (실패한 클릭의 재시도가 윈도 안에 들어와도 중복으로 억제되지 않음)
+# - 프로세스(워커)별 상태: 다른 워커로 간 중복 요청은 억제하지 못함
+# - CLICK_DEDUP_WINDOW_SECONDS=0이면 비활성
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.monitoring.metrics import Counter, Gauge
+
+CLICK_DEDUP_WINDOW_SECONDS = float(os.getenv("CLICK_DEDUP_WINDOW_SECONDS", 2))
+CLICK_DEDUP_MAX_ENTRIES = int(os.getenv("CLICK_DEDUP_MAX_ENTRIES", 100_000))
+
+click_dedup_events = Counter(
+    "click_dedup_events_total", "Click events seen by the dedup window", labelnames=("result",)
+)
+click_dedup_entries = Gauge("click_dedup_entries", "Distinct click events currently held by the dedup window")
+
+
+class DedupWindow:
+    """
+    최근 이벤트의 만료 해시 집합
+    - window_seconds: 같은 이벤트를 중복으로 볼 시간
+    - max_entries: 보관할 최대 이벤트 수
+    """
+
+    def __init__(self, window_seconds: float = CLICK_DEDUP_WINDOW_SECONDS,
+                 max_entries: int = CLICK_DEDUP_MAX_ENTRIES, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._expires: OrderedDict[bytes, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0 and self.max_entries > 0
+
+    @staticmethod
+    def _key(parts) -> bytes:
+        data = "\x1f".join("" if part is None else part for part in parts)
+        return hashlib.blake2b(data.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+
+    def seen(self, *parts: str | None) -> bool:
+        """
+        윈도 안에 같은 이벤트가 있었으면 True (중복), 처음이면 기록하고 False
+        """
+        if not self.enabled:
+            return False
+        key = self._key(parts)
+        now = self._clock()
+        expires = self._expires
+        with self._lock:
+            while expires:
+                oldest, expires_at = next(iter(expires.items()))
+                if expires_at > now:
+                    break
+                del expires[oldest]
+            expires_at = expires.get(key)
+            if expires_at is not None:
+                return True
+            expires[key] = now + self.window_seconds
+            while len(expires) > self.max_entries:
+                expires.popitem(last=False)
+            size = len(expires)
+        click_dedup_entries.set(size)
+        return False
+
+    def forget(self, *parts: str | None) -> None:
+        """이벤트를 윈도에서 지웁니다. (seen이 처음이라고 답한 이벤트를 기록하지 못한 경우)"""
+        if not self.enabled:
+            return
+        key = self._key(parts)
+        with self._lock:
+            self._expires.pop(key, None)
+            size = len(self._expires)
+        click_dedup_entries.set(size)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def clear(self):
+        with self._lock:
+            self._expires.clear()
+        click_dedup_entries.set(0)
+
+
+# 프로세스 전역 클릭 중복 억제 윈도
+click_dedup = DedupWindow()
+
+
+def is_duplicate_click(short_code: str, client_ip: str | None, user_agent: str | None) -> bool:
+    """중복 클릭이면 True (메트릭에 suppressed로 기록), 아니면 False (recorded)"""
+    duplicate = click_dedup.seen(short_code, client_ip, user_agent)
+    click_dedup_events.labels("suppressed" if duplicate else "recorded").inc()
+    return duplicate
+
+
+def forget_click(short_code: str, client_ip: str | None, user_agent: str | None) -> None:
+    """기록하지 못한 클릭을 윈도에서 지웁니다. (재시도가 중복으로 억제되지 않도록)"""
+    click_dedup.forget(short_code, client_ip, user_agent)
@@ -0,0 +1,243 @@
+# app/analytics/iprange.py: IP 대역 -> 네트워크 / 국가 인메모리 인덱스 모듈
+# - 로컬 CSV 대역 DB(IP_RANGES_CSV)를 읽어 시작 주소 기준 정렬 배열을 만들고 bisect로 조회
+#   CSV 형식: start_ip,end_ip,network,country (예: 1.0.0.0,1.0.0.255,AS13335 Cloudflare,AU)
+#   - 헤더 / 빈 줄 / '#' 주석 줄은 무시, IPv4와 IPv6 대역을 함께 둘 수 있음
+#   - 대역은 겹치지 않아야 함 (겹치면 시작 주소가 가장 가까운 대역이 선택됨)
+# - IPv4는 array('I'), IPv6는 정수 리스트 (128비트) / 라벨은 (network, country) 목록의 인덱스로 보관
+#   → 대역 1백만 개 기준 IPv4 약 12MB + 라벨
+#   IPv4는 시작 주소 상위 16비트 버킷(65536개)으로 탐색 범위를 좁힌 뒤 bisect (조회당 비교 몇 번)
+# - 처음 읽은 CSV는 바이너리 캐시(<csv>.idx)로 저장해 다음 시작부터는 배열을 그대로 읽음
+# - 클릭 저장 시 client_ip의 network / country를 함께 기록 (app/shortener/service.record_click)
+# - 조회 결과는 IP별 LRU 캐시 (IP_RANGES_CACHE_SIZE개)
+# - 로드 전 / 대역 DB가 없으면 (None, None)
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import socket
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+from app.monitoring.health import readiness
+from app.utils.ipaddr import parse_ip
+
+logger = logging.getLogger(__name__)
+
+IP_RANGES_CSV = os.getenv("IP_RANGES_CSV", "")
+IP_RANGES_CACHE_SIZE = int(os.getenv("IP_RANGES_CACHE_SIZE", 65536))
+
+READINESS_CHECK = "ip_ranges"
+
+_UNKNOWN = (None, None)
+_CACHE_VERSION = 1
+_AF_INET = socket.AF_INET
+_inet_pton = socket.inet_pton
+_from_bytes = int.from_bytes
+
+
+class IPRangeIndex:
+    """정렬된 대역 배열에서 IP가 속한 대역의 (network, country)를 찾습니다."""
+
+    def __init__(self, cache_size: int = IP_RANGES_CACHE_SIZE):
+        self._tables = _build_tables(array("I"), array("I"), array("I"), [], [], array("I"), [])
+        # 같은 방문자 IP는 반복되므로 조회 결과를 LRU 캐시 (인덱스를 바꾸면 비움)
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def __len__(self) -> int:
+        tables = self._tables
+        return len(tables[0]) + len(tables[3])
+
+    @property
+    def loaded(self) -> bool:
+        return len(self) > 0
+
+    def _lookup(self, ip: str | None) -> tuple[str | None, str | None]:
+        """IP의 (network, country), 모르면 (None, None)"""
+        v4_starts, v4_ends, v4_labels, v6_starts, v6_ends, v6_labels, labels, buckets = self._tables
+        if ip and ":" not in ip:
+            try:
+                number = _from_bytes(_inet_pton(_AF_INET, ip), "big")
+            except (OSError, TypeError):
+                return _UNKNOWN
+            # 상위 16비트 버킷 안에서만 이진 탐색 (바로 앞 대역이 이어질 수 있으므로 하나 앞부터)
+            top = number >> 16
+            lo = buckets[top]
+            i = bisect_right(v4_starts, number, lo - 1 if lo else 0, buckets[top + 1]) - 1
+            if i >= 0 and number <= v4_ends[i]:
+                return labels[v4_labels[i]]
+            return _UNKNOWN
+        parsed = parse_ip(ip)
+        if parsed is None:
+            return _UNKNOWN
+        version, number = parsed
+        if version == 4:  # IPv4-mapped IPv6
+            return self._lookup(_int_to_v4(number))
+        i = bisect_right(v6_starts, number) - 1
+        if i >= 0 and number <= v6_ends[i]:
+            return labels[v6_labels[i]]
+        return _UNKNOWN
+
+    def load_rows(self, rows) -> int:
+        """(start_ip, end_ip, network, country) 행들로 인덱스를 다시 만듭니다. 반환: 대역 수"""
+        label_ids: dict[tuple, int] = {}
+        v4_starts, v4_ends, v4_labels = array("I"), array("I"), array("I")
+        v6: list[tuple[int, int, int]] = []
+        pton, from_bytes = _inet_pton, _from_bytes
+        for row in rows:
+            if len(row) < 2:
+                continue
+            first, last = row[0], row[1]
+            label = label_ids.setdefault(
+                (row[2] or None if len(row) > 2 else None, row[3].upper() or None if len(row) > 3 else None),
+                len(label_ids),
+            )
+            if ":" not in first:
+                try:
+                    v4_starts.append(from_bytes(pton(_AF_INET, first), "big"))
+                except OSError:
+                    continue  # 헤더 / 주석 / 잘못된 줄
+                try:
+                    v4_ends.append(from_bytes(pton(_AF_INET, last), "big"))
+                except OSError:
+                    v4_starts.pop()
+                    continue
+                v4_labels.append(label)
+                continue
+            start, end = parse_ip(first), parse_ip(last)
+            if start is None or end is None or start[0] != 6 or end[0] != 6:
+                continue
+            v6.append((start[1], end[1], label))
+        if any(v4_starts[i] > v4_starts[i + 1] for i in range(len(v4_starts) - 1)):
+            order = sorted(range(len(v4_starts)), key=v4_starts.__getitem__)
+            v4_starts = array("I", [v4_starts[i] for i in order])
+            v4_ends = array("I", [v4_ends[i] for i in order])
+            v4_labels = array("I", [v4_labels[i] for i in order])
+        v6.sort()
+        self._set_tables(_build_tables(
+            v4_starts, v4_ends, v4_labels,
+            [r[0] for r in v6], [r[1] for r in v6], array("I", [r[2] for r in v6]),
+            list(label_ids),
+        ))
+        return len(self)
+
+    def load_csv(self, path: str, cache: bool = True) -> int:
+        """
+        CSV 대역 DB를 읽습니다.
+        - cache: CSV 옆에 바이너리 캐시(<path>.idx)를 두고, CSV가 바뀌지 않았으면 캐시를 읽음
+        """
+        cache_path = f"{path}.idx"
+        stat = os.stat(path)
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if cache and self._load_cache(cache_path, signature):
+            return len(self)
+        with open(path, newline="", encoding="utf-8") as f:
+            count = self.load_rows(csv.reader(f))
+        if cache:
+            try:
+                self._save_cache(cache_path, signature)
+            except OSError:
+                logger.warning("could not write ip range cache %s", cache_path)
+        return count
+
+    def _save_cache(self, path: str, signature: str):
+        v4_starts, v4_ends, v4_labels, v6_starts, v6_ends, v6_labels, labels, _ = self._tables
+        header = json.dumps({"version": _CACHE_VERSION, "signature": signature, "labels": labels,
+                             "v4": len(v4_starts), "v6": len(v6_starts)}).encode("utf-8")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(struct.pack("<I", len(header)) + header)
+            for values in (v4_starts, v4_ends, v4_labels, v6_labels):
+                f.write(_little_endian(values).tobytes())
+            for values in (v6_starts, v6_ends):
+                f.write(b"".join(number.to_bytes(16, "big") for number in values))
+        os.replace(tmp_path, path)
+
+    def _load_cache(self, path: str, signature: str) -> bool:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            (size,) = struct.unpack_from("<I", data)
+            header = json.loads(data[4:4 + size])
+        except (OSError, ValueError, struct.error):
+            return False
+        if header.get("version") != _CACHE_VERSION or header.get("signature") != signature:
+            return False
+        offset = 4 + size
+        v4_count, v6_count = header["v4"], header["v6"]
+        columns = []
+        for count in (v4_count, v4_count, v4_count, v6_count):
+            values = array("I")
+            values.frombytes(data[offset:offset + count * 4])
+            columns.append(_little_endian(values))
+            offset += count * 4
+        v6_columns = []
+        for _ in range(2):
+            v6_columns.append([int.from_bytes(data[i:i + 16], "big") for i in range(offset, offset + v6_count * 16, 16)])
+            offset += v6_count * 16
+        labels = [tuple(label) for label in header["labels"]]
+        self._set_tables(_build_tables(columns[0], columns[1], columns[2], v6_columns[0], v6_columns[1], columns[3],
+                                     labels))
+        return True
+
+    def _set_tables(self, tables: tuple):
+        self._tables = tables
+        self.lookup.cache_clear()
+
+    def clear(self):
+        self._set_tables(_build_tables(array("I"), array("I"), array("I"), [], [], array("I"), []))
+
+
+def _build_tables(v4_starts, v4_ends, v4_labels, v6_starts, v6_ends, v6_labels, labels) -> tuple:
+    """조회용 테이블 튜플 (교체 시 한 번에 바꿔 조회 중인 스레드가 섞인 상태를 보지 않음)"""
+    # buckets[k]: 시작 주소의 상위 16비트가 k 이상인 첫 대역 위치
+    buckets = array("I", [bisect_left(v4_starts, top << 16) for top in range(65537)])
+    return v4_starts, v4_ends, v4_labels, v6_starts, v6_ends, v6_labels, labels, buckets
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _int_to_v4(number: int) -> str:
+    return socket.inet_ntop(_AF_INET, number.to_bytes(4, "big"))
+
+
+# 프로세스 전역 대역 인덱스
+ip_ranges = IPRangeIndex()
+
+
+def load_ip_ranges(path: str = IP_RANGES_CSV) -> dict:
+    started = time.monotonic()
+    count = ip_ranges.load_csv(path)
+    return {"ranges": count, "elapsed": round(time.monotonic() - started, 3)}
+
+
+def start_ip_ranges() -> asyncio.Task | None:
+    """
+    lifespan에서 호출: 대역 DB를 백그라운드로 읽습니다.
+    - 로드 전 클릭은 network / country 없이 저장되므로 readiness를 막지 않음 (상태만 노출)
+    """
+    if not IP_RANGES_CSV:
+        readiness.mark_done(READINESS_CHECK, status="disabled")
+        return None
+    readiness.mark_done(READINESS_CHECK, status="loading")
+    return asyncio.create_task(_run_load())
+
+
+async def _run_load():
+    try:
+        summary = await asyncio.to_thread(load_ip_ranges)
+    except Exception:
+        logger.exception("ip range database %s could not be loaded", IP_RANGES_CSV)
+        readiness.mark_done(READINESS_CHECK, status="failed")
+    else:
+        readiness.mark_done(READINESS_CHECK, status="ok", **summary)
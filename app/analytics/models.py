@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, false
 from datetime import datetime
 from app.db.database import Base
+from app.db.types import PackedIP
 
 class ClickLog(Base):
     __tablename__ = "click_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    short_code = Column(String, ForeignKey("urls.short_code"), nullable=False)
+    # urls와 다른 샤드에 있을 수 있어(리밸런싱 중) 외래 키 대신 인덱스만 둠
+    short_code = Column(String, index=True, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    client_ip = Column(String, nullable=True)
-    user_agent = Column(String, nullable=True)
\ No newline at end of file
+    client_ip = Column(PackedIP, nullable=True)  # Postgres INET / 그 외 16바이트 (IP가 아니면 NULL)
+    user_agent = Column(String, nullable=True)
+    is_bot = Column(Boolean, nullable=False, default=False, server_default=false())  # 봇 / 크롤러 User-Agent
+    # 클릭 시점의 IP 대역 DB 기준 (app/analytics/iprange.py)
+    network = Column(String, nullable=True)
+    country = Column(String(2), nullable=True)
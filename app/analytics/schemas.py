@@ -1,14 +1,53 @@
-from pydantic import BaseModel
-from datetime import datetime
+import os
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+from datetime import datetime, timezone
+
+# 배치 분석 요청 한 번에 받을 최대 단축 키 수
+ANALYTICS_BATCH_MAX_CODES = int(os.getenv("ANALYTICS_BATCH_MAX_CODES", 100_000))
 
 class ClickLogInfo(BaseModel):
     timestamp: datetime
     client_ip: str | None
     user_agent: str | None
+    is_bot: bool = False
 
     class Config:
         orm_mode = True
 
 class AnalyticsResponse(BaseModel):
     total_clicks: int
-    logs: list[ClickLogInfo]
\ No newline at end of file
+    bot_clicks: int = 0  # 저장된 로그 중 봇 클릭 수 (BOT_CLICKS_PERSIST=0이면 0)
+    logs: list[ClickLogInfo]
+
+class ClickBreakdown(BaseModel):
+    value: str | None  # 네트워크 이름 또는 국가 코드 (대역 DB에 없으면 null)
+    clicks: int
+
+class BreakdownResponse(BaseModel):
+    total_clicks: int
+    items: list[ClickBreakdown]
+
+class AnalyticsBatchRequest(BaseModel):
+    """
+    배치 분석 요청 스키마
+    - short_codes: 조회할 단축 키 목록
+    - since / until: 클릭 로그 집계 범위 [since, until) (시간대가 있으면 UTC로 변환, 없으면 UTC로 간주)
+    """
+    short_codes: list[str] = Field(min_length=1, max_length=ANALYTICS_BATCH_MAX_CODES)
+    since: datetime | None = None
+    until: datetime | None = None
+
+    @field_validator("since", "until")
+    @classmethod
+    def to_naive_utc(cls, value: datetime | None):
+        # click_logs.timestamp는 시간대 없는 UTC
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.since is not None and self.until is not None and self.since >= self.until:
+            raise ValueError("since must be earlier than until")
+        return self
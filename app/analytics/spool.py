@@ -0,0 +1,513 @@
+# app/analytics/spool.py: 클릭 이벤트 로컬 스풀(append-only 세그먼트 파일) 모듈
+# - 리디렉션은 클릭을 DB에 쓰지 않고 로컬 세그먼트 파일 끝에 덧붙이기만 함
+#   → 리디렉션 지연시간이 DB가 아니라 로컬 append에 좌우되고, DB 장애 중에도 클릭을 잃지 않음
+# - 레코드 형식: [길이 4바이트][CRC32 4바이트][본문] (빅 엔디언)
+#   본문: 시각(double) / 봇 여부(1바이트) / short_code · client_ip · user_agent (각각 2바이트 길이 + UTF-8)
+# - 내구성: 쓰기는 os.write만 하고, 백그라운드 스레드가 CLICK_SPOOL_FSYNC_MS마다 모아서 fsync
+#   (전원 장애 시 마지막 fsync 이후 최대 CLICK_SPOOL_FSYNC_MS 동안의 클릭은 잃을 수 있음, 프로세스 장애는 무손실)
+# - 세그먼트 회전: 세그먼트가 CLICK_SPOOL_SEGMENT_BYTES를 넘으면 다음 번호의 새 파일로 (clicks-<번호>.seg)
+# - 디스크 상한: 스풀 전체가 CLICK_SPOOL_MAX_BYTES를 넘으면 append를 거절 → 호출자가 DB에 직접 기록
+# - 드레이너: CLICK_SPOOL_DRAIN_SECONDS마다 체크포인트(세그먼트 번호 + 오프셋) 이후 레코드를 읽어
+#   click_logs에 일괄 INSERT, 클릭 수는 단축 키별로 합쳐 한 번에 증가 → 커밋 후 체크포인트 전진
+#   - 다 읽은(닫힌) 세그먼트는 삭제, 쓰는 중인 세그먼트는 fsync된 위치까지만 읽음
+#   - DB 오류 시 롤백하고 체크포인트를 그대로 두어 다음 주기에 다시 시도
+#   - 커밋 후 체크포인트 저장 전에 죽으면 그 배치를 다시 넣음 (최소 한 번 전달, 중복 가능)
+# - 장애 복구: 프로세스(워커)마다 자기 디렉터리(<호스트>-<pid>)를 잠금 파일(flock)로 잡고 씀
+#   - 잠금이 풀린(죽은 프로세스의) 디렉터리는 다른 프로세스의 드레이너가 가져가 끝까지 비우고 삭제
+#   - 마지막 레코드가 잘려 있으면(쓰는 중 장애) 그 레코드만 버림, CRC가 맞지 않으면 세그먼트의 나머지를 버림
+# - CLICK_SPOOL_DIR이 비어 있으면 비활성 (클릭을 요청 안에서 DB에 바로 기록)
+#
+# 사용 예 (앱이 내려가 있을 때 남은 스풀 비우기):
+#   python -m app.analytics.spool drain
+
+import argparse
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import shutil
+import socket
+import struct
+import threading
+import time
+import zlib
+from collections import Counter as TallyCounter
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.analytics.bots import BOT_CLICKS_PERSIST
+from app.analytics.iprange import ip_ranges
+from app.analytics.models import ClickLog
+from app.monitoring.metrics import Counter, Gauge
+from app.shortener.crud import increment_clicks
+
+logger = logging.getLogger(__name__)
+
+CLICK_SPOOL_DIR = os.getenv("CLICK_SPOOL_DIR", "")
+CLICK_SPOOL_SEGMENT_BYTES = int(os.getenv("CLICK_SPOOL_SEGMENT_BYTES", 16 * 1024 * 1024))
+CLICK_SPOOL_MAX_BYTES = int(os.getenv("CLICK_SPOOL_MAX_BYTES", 1024 * 1024 * 1024))
+CLICK_SPOOL_FSYNC_MS = float(os.getenv("CLICK_SPOOL_FSYNC_MS", 50))
+CLICK_SPOOL_DRAIN_SECONDS = float(os.getenv("CLICK_SPOOL_DRAIN_SECONDS", 1))
+# 한 트랜잭션에 넣는 최대 클릭 수
+CLICK_SPOOL_DRAIN_BATCH = int(os.getenv("CLICK_SPOOL_DRAIN_BATCH", 5000))
+
+_HEADER = struct.Struct(">II")  # 본문 길이, CRC32
+_EVENT = struct.Struct(">dBHHH")  # 시각, 봇 여부, short_code / client_ip / user_agent 바이트 수
+_MAX_FIELD = 0xFFFF
+_READ_CHUNK = 4 * 1024 * 1024
+SEGMENT_PREFIX = "clicks-"
+SEGMENT_SUFFIX = ".seg"
+LOCK_FILE = "lock"
+CHECKPOINT_FILE = "checkpoint"
+
+click_spool_appends = Counter("click_spool_appends_total", "Click spool appends", labelnames=("result",))
+click_spool_drained = Counter("click_spool_drained_total", "Clicks moved from the spool into click_logs")
+click_spool_drain_errors = Counter("click_spool_drain_errors_total", "Failed click spool drain cycles")
+click_spool_discarded = Counter(
+    "click_spool_discarded_records_total", "Spool records dropped while reading", labelnames=("reason",)
+)
+click_spool_bytes = Gauge("click_spool_bytes", "Bytes held by this process's click spool")
+click_spool_lag = Gauge("click_spool_lag_seconds", "Age of the oldest click in the last drained batch")
+
+
+class ClickEvent(NamedTuple):
+    short_code: str
+    client_ip: str | None
+    user_agent: str | None
+    is_bot: bool
+    timestamp: float
+
+
+def encode_event(event: ClickEvent) -> bytes:
+    """클릭 이벤트를 길이 / CRC가 붙은 레코드 바이트로 만듭니다. (None은 빈 문자열로 저장)"""
+    code = event.short_code.encode()
+    ip = (event.client_ip or "").encode()[:_MAX_FIELD]
+    ua = (event.user_agent or "").encode()[:_MAX_FIELD]
+    payload = _EVENT.pack(event.timestamp, event.is_bot, len(code), len(ip), len(ua)) + code + ip + ua
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_event(payload: bytes) -> ClickEvent:
+    timestamp, is_bot, code_len, ip_len, ua_len = _EVENT.unpack_from(payload)
+    pos = _EVENT.size
+    fields = []
+    for length in (code_len, ip_len, ua_len):
+        fields.append(payload[pos:pos + length].decode(errors="replace"))
+        pos += length
+    if pos != len(payload):
+        raise ValueError("record length mismatch")
+    code, ip, ua = fields
+    return ClickEvent(code, ip or None, ua or None, bool(is_bot), timestamp)
+
+
+def read_records(path: str, offset: int, end: int, limit: int) -> tuple[list[ClickEvent], int, str | None]:
+    """
+    세그먼트의 offset부터 end 바이트 전까지 최대 limit개 레코드를 읽습니다.
+    - 반환: (이벤트, 다음 오프셋, 문제) - 문제는 None / "torn"(end 전에 레코드가 끝나지 않음) / "corrupt"(CRC 불일치)
+    """
+    events: list[ClickEvent] = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(min(end - offset, _READ_CHUNK))
+    at_end = offset + len(data) >= end
+    pos = 0
+    problem = None
+    while len(events) < limit and pos < len(data):
+        if len(data) - pos < _HEADER.size:
+            problem = "torn" if at_end else None
+            break
+        length, crc = _HEADER.unpack_from(data, pos)
+        stop = pos + _HEADER.size + length
+        if stop > len(data):
+            if at_end:
+                problem = "torn"
+            elif pos == 0:
+                # 한 번에 읽는 크기보다 큰 레코드는 쓰지 않으므로 깨진 길이 값
+                problem = "corrupt"
+            break
+        payload = data[pos + _HEADER.size:stop]
+        try:
+            if zlib.crc32(payload) != crc:
+                raise ValueError("checksum mismatch")
+            events.append(decode_event(payload))
+        except (ValueError, struct.error):
+            problem = "corrupt"
+            break
+        pos = stop
+    return events, offset + pos, problem
+
+
+def _segment_name(seq: int) -> str:
+    return f"{SEGMENT_PREFIX}{seq:012d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory: str) -> list[int]:
+    """디렉터리의 세그먼트 번호를 오름차순으로 반환합니다."""
+    seqs = []
+    for name in os.listdir(directory):
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+            try:
+                seqs.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+            except ValueError:
+                continue
+    return sorted(seqs)
+
+
+def read_checkpoint(directory: str) -> tuple[int, int]:
+    """(다음에 읽을 세그먼트 번호, 오프셋), 체크포인트가 없으면 (0, 0)"""
+    try:
+        with open(os.path.join(directory, CHECKPOINT_FILE)) as f:
+            seq, offset = f.read().split()
+        return int(seq), int(offset)
+    except (FileNotFoundError, ValueError):
+        return 0, 0
+
+
+def write_checkpoint(directory: str, seq: int, offset: int) -> None:
+    """임시 파일에 쓰고 fsync 후 rename (중간에 죽어도 이전 / 새 체크포인트 중 하나가 남음)"""
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(f"{seq} {offset}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(directory)
+
+
+def _fsync_dir(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _try_lock(directory: str) -> int | None:
+    """디렉터리 잠금 파일을 잡으면 fd, 다른 프로세스가 쓰는 중이면 None"""
+    fd = os.open(os.path.join(directory, LOCK_FILE), os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def apply_events(db: Session, events: list[ClickEvent]) -> None:
+    """
+    클릭 이벤트를 한 트랜잭션으로 DB에 넣습니다.
+    - click_logs는 일괄 INSERT (BOT_CLICKS_PERSIST=0이면 봇 클릭 로그는 저장하지 않음)
+    - 클릭 수는 (단축 키, 봇 여부)별로 합쳐 한 번씩 증가
+    - 실패하면 롤백하고 예외를 그대로 올림
+    """
+    counts: TallyCounter = TallyCounter()
+    try:
+        for event in events:
+            counts[event.short_code, event.is_bot] += 1
+            if event.is_bot and not BOT_CLICKS_PERSIST:
+                continue
+            network, country = ip_ranges.lookup(event.client_ip)
+            db.add(ClickLog(
+                short_code=event.short_code,
+                timestamp=datetime.utcfromtimestamp(event.timestamp),
+                client_ip=event.client_ip,
+                user_agent=event.user_agent,
+                is_bot=event.is_bot,
+                network=network,
+                country=country,
+            ))
+        for (short_code, bot), amount in counts.items():
+            increment_clicks(db, short_code, bot=bot, amount=amount)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+class ClickSpool:
+    """
+    프로세스별 클릭 스풀 (쓰기 + 드레이너)
+    - append는 여러 스레드에서 호출 가능 (잠금 안에서 os.write만 수행)
+    - writer_id: 이 프로세스의 디렉터리 이름 (기본 <호스트>-<pid>)
+    """
+
+    def __init__(self, root: str = CLICK_SPOOL_DIR, segment_bytes: int = CLICK_SPOOL_SEGMENT_BYTES,
+                 max_bytes: int = CLICK_SPOOL_MAX_BYTES, fsync_ms: float = CLICK_SPOOL_FSYNC_MS,
+                 writer_id: str | None = None):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_ms / 1000
+        self.writer_id = writer_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.directory: str | None = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._lock_fd: int | None = None
+        self._fd: int | None = None
+        self._seq = 0
+        self._size = 0
+        self._bytes = 0
+        self._dirty = False
+        self._synced = (0, 0)  # (세그먼트 번호, fsync된 오프셋)
+        self._retired: list[tuple[int, int]] = []  # 회전 후 아직 fsync / close 하지 않은 (fd, 번호)
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.root)
+
+    @property
+    def opened(self) -> bool:
+        return self._fd is not None
+
+    def open(self) -> None:
+        """자기 디렉터리를 잠그고 새 세그먼트를 열어 fsync 스레드를 시작합니다."""
+        if self.opened:
+            return
+        directory = os.path.join(self.root, self.writer_id)
+        os.makedirs(directory, exist_ok=True)
+        lock_fd = _try_lock(directory)
+        if lock_fd is None:
+            raise RuntimeError(f"click spool directory is in use: {directory}")
+        self.directory = directory
+        self._lock_fd = lock_fd
+        # 같은 이름으로 다시 시작한 경우(pid 재사용 등) 남은 세그먼트는 드레이너가 이어서 비움
+        existing = list_segments(directory)
+        self._bytes = sum(os.path.getsize(os.path.join(directory, _segment_name(seq))) for seq in existing)
+        click_spool_bytes.set(self._bytes)
+        with self._lock:
+            self._open_segment((existing[-1] if existing else 0) + 1)
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="click-spool-fsync", daemon=True)
+        self._flusher.start()
+
+    def close(self) -> None:
+        """fsync 스레드를 멈추고 남은 쓰기를 fsync한 뒤 닫습니다. (남은 레코드는 다음 시작 / 다른 프로세스가 비움)"""
+        if not self.opened:
+            return
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.sync()
+        with self._lock:
+            os.close(self._fd)
+            self._fd = None
+        os.close(self._lock_fd)
+        self._lock_fd = None
+
+    def _open_segment(self, seq: int) -> None:
+        """(self._lock 안에서 호출)"""
+        self._fd = os.open(os.path.join(self.directory, _segment_name(seq)), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._seq = seq
+        self._size = 0
+        _fsync_dir(self.directory)
+
+    def append(self, short_code: str, client_ip: str | None, user_agent: str | None, is_bot: bool,
+               timestamp: float | None = None) -> bool:
+        """
+        클릭을 스풀에 덧붙입니다. (fsync는 기다리지 않음)
+        - 반환: 기록했으면 True, 디스크 상한을 넘었거나 쓰기에 실패하면 False (호출자가 DB에 직접 기록)
+        """
+        record = encode_event(ClickEvent(short_code, client_ip, user_agent, is_bot,
+                                         time.time() if timestamp is None else timestamp))
+        with self._lock:
+            if self._fd is None or self._bytes + len(record) > self.max_bytes:
+                click_spool_appends.labels("full").inc()
+                return False
+            try:
+                if self._size and self._size + len(record) > self.segment_bytes:
+                    # 닫는 것은 fsync 스레드가 fsync 후에 (append가 fsync를 기다리지 않도록)
+                    self._retired.append((self._fd, self._seq))
+                    self._open_segment(self._seq + 1)
+                os.write(self._fd, record)
+            except OSError:
+                logger.exception("click spool write failed")
+                click_spool_appends.labels("error").inc()
+                return False
+            self._size += len(record)
+            self._bytes += len(record)
+            self._dirty = True
+        click_spool_appends.labels("ok").inc()
+        return True
+
+    def sync(self) -> None:
+        """회전된 세그먼트와 쓰는 중인 세그먼트를 fsync합니다. (드레이너는 fsync된 위치까지만 읽음)"""
+        with self._sync_lock:
+            with self._lock:
+                retired, self._retired = self._retired, []
+                fd, seq, size, dirty = self._fd, self._seq, self._size, self._dirty
+                self._dirty = False
+            for old_fd, _ in retired:
+                os.fsync(old_fd)
+                os.close(old_fd)
+            if fd is not None and dirty:
+                os.fsync(fd)
+            with self._lock:
+                self._synced = (seq, size)
+        click_spool_bytes.set(self._bytes)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.fsync_interval):
+            try:
+                self.sync()
+            except OSError:
+                logger.exception("click spool fsync failed")
+
+    def drain(self, db: Session, batch_size: int = CLICK_SPOOL_DRAIN_BATCH) -> int:
+        """
+        자기 디렉터리와 잠금이 풀린 다른 디렉터리의 레코드를 DB로 옮깁니다.
+        - 반환: 옮긴 클릭 수 (DB 오류는 그대로 올림, 체크포인트는 마지막 커밋까지만 전진)
+        """
+        with self._drain_lock:
+            drained = 0
+            if self.opened:
+                drained += drain_directory(db, self.directory, batch_size, writer=self)
+            drained += drain_orphans(db, self.root, batch_size, skip=self.writer_id)
+            return drained
+
+    def _live_bounds(self) -> tuple[int, int, set[int]]:
+        with self._lock:
+            synced_seq, synced_offset = self._synced
+            return synced_seq, synced_offset, {seq for _, seq in self._retired}
+
+    def _release(self, size: int) -> None:
+        with self._lock:
+            self._bytes -= size
+        click_spool_bytes.set(self._bytes)
+
+
+def drain_directory(db: Session, directory: str, batch_size: int = CLICK_SPOOL_DRAIN_BATCH,
+                    writer: ClickSpool | None = None) -> int:
+    """
+    디렉터리 하나를 체크포인트부터 비웁니다.
+    - writer: 이 디렉터리에 쓰는 중인 스풀 (쓰는 중인 세그먼트는 fsync된 위치까지만, 회전 후 fsync 전 세그먼트는 다음에)
+    - writer가 없으면(주인이 죽은 디렉터리) 모든 세그먼트를 파일 끝까지 읽음
+    """
+    seq, offset = read_checkpoint(directory)
+    drained = 0
+    for segment in list_segments(directory):
+        path = os.path.join(directory, _segment_name(segment))
+        if segment < seq:
+            # 체크포인트를 저장한 뒤 삭제 전에 멈춘 경우
+            _remove_segment(path, writer)
+            continue
+        if segment > seq:
+            seq, offset = segment, 0
+        active = False
+        if writer is not None:
+            synced_seq, synced_offset, retired = writer._live_bounds()
+            if segment in retired or segment > synced_seq:
+                break
+            active = segment == synced_seq
+            end = synced_offset if segment == synced_seq else os.path.getsize(path)
+        else:
+            end = os.path.getsize(path)
+        while offset < end:
+            events, next_offset, problem = read_records(path, offset, end, batch_size)
+            if events:
+                apply_events(db, events)
+                write_checkpoint(directory, seq, next_offset)
+                click_spool_drained.inc(len(events))
+                click_spool_lag.set(max(0.0, time.time() - events[0].timestamp))
+                drained += len(events)
+                offset = next_offset
+            if problem is not None and not active:
+                # 잘린 마지막 레코드 / 깨진 레코드 이후는 읽을 수 없으므로 세그먼트의 나머지를 버림
+                logger.warning("click spool segment %s: %s record at offset %d, skipping the rest", path, problem, offset)
+                click_spool_discarded.labels(problem).inc()
+                offset = end
+                write_checkpoint(directory, seq, offset)
+                break
+            if not events:
+                break
+        if active or offset < end:
+            break
+        _remove_segment(path, writer)
+        seq, offset = segment + 1, 0
+        write_checkpoint(directory, seq, offset)
+    return drained
+
+
+def _remove_segment(path: str, writer: ClickSpool | None) -> None:
+    size = os.path.getsize(path)
+    os.remove(path)
+    if writer is not None:
+        writer._release(size)
+
+
+def drain_orphans(db: Session, root: str, batch_size: int = CLICK_SPOOL_DRAIN_BATCH, skip: str | None = None) -> int:
+    """잠금이 풀린(쓰던 프로세스가 끝난) 디렉터리를 모두 비우고 삭제합니다."""
+    if not root or not os.path.isdir(root):
+        return 0
+    drained = 0
+    for name in sorted(os.listdir(root)):
+        directory = os.path.join(root, name)
+        if name == skip or not os.path.isdir(directory):
+            continue
+        lock_fd = _try_lock(directory)
+        if lock_fd is None:
+            continue
+        try:
+            drained += drain_directory(db, directory, batch_size)
+            if not list_segments(directory):
+                shutil.rmtree(directory)
+                logger.info("drained and removed orphaned click spool %s", directory)
+        finally:
+            os.close(lock_fd)
+    return drained
+
+
+click_spool = ClickSpool()
+
+
+def run_drain() -> int:
+    from app.db.database import SessionLocal, get_engine
+
+    get_engine()
+    with SessionLocal() as db:
+        if click_spool.opened:
+            return click_spool.drain(db)
+        return drain_orphans(db, click_spool.root)
+
+
+def start_click_spool() -> asyncio.Task | None:
+    """lifespan에서 호출: 스풀을 열고 주기적으로 DB로 옮기는 태스크를 시작합니다."""
+    if not click_spool.enabled:
+        return None
+    click_spool.open()
+    return asyncio.create_task(_drain_loop())
+
+
+async def _drain_loop():
+    while True:
+        await asyncio.sleep(CLICK_SPOOL_DRAIN_SECONDS)
+        try:
+            await asyncio.to_thread(run_drain)
+        except Exception as exc:
+            # DB 장애 중에는 매 주기 실패하므로 스택 없이 기록 (레코드는 스풀에 남아 있음)
+            click_spool_drain_errors.inc()
+            logger.warning("click spool drain failed, will retry: %s", exc)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move spooled click events into click_logs")
+    parser.add_argument("command", choices=("drain",))
+    parser.add_argument("--dir", default=CLICK_SPOOL_DIR, help="spool root directory (default: CLICK_SPOOL_DIR)")
+    args = parser.parse_args(argv)
+    if not args.dir:
+        parser.error("CLICK_SPOOL_DIR is not set")
+    click_spool.root = args.dir
+    started = time.perf_counter()
+    drained = run_drain()
+    print(json.dumps({"drained": drained, "elapsed": round(time.perf_counter() - started, 3)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -137,8 +137,8 @@ def refresh_access_token(token_request: RefreshTokenRequest, db: Session = Depen
         )
 
     # 3. 사용된 리프레시 토큰 무효화 (삭제)
-    # crud.py에 delete_token 함수가 구현되어 있어야 합니다.
-    delete_token(db, db_token)
+    # 새 토큰 저장과 함께 한 번에 커밋합니다.
+    delete_token(db, db_token, commit=False)
 
     # 4. 새 액세스 토큰 및 리프레시 토큰 생성
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -240,12 +240,11 @@ def reset_password(reset_data: PasswordReset, db: Session = Depends(get_db)):
     hashed_new_password = security.get_password_hash(reset_data.new_password)
     user.hashed_password = hashed_new_password # 사용자 모델 직접 업데이트
     # 또는 crud 함수 사용: crud.update_user_password(db, user=user, hashed_password=hashed_new_password)
-    db.commit()
-    db.refresh(user)
 
     # 4. 사용된 비밀번호 재설정 토큰 삭제 (매우 중요)
-    # crud.py에 delete_token 함수가 구현되어 있어야 합니다.
-    delete_token(db, db_token)
+    # 비밀번호 변경과 토큰 삭제를 한 트랜잭션으로 커밋합니다.
+    delete_token(db, db_token, commit=False)
+    db.commit()
 
     return {"message": "Password has been reset successfully."}
 
@@ -283,11 +282,11 @@ def reset_user_password_by_poweruser(
 
     # 4. 대상 사용자의 비밀번호 해시를 새로 생성한 해시로 업데이트합니다.
     target_user.hashed_password = hashed_new_password
+    target_email = target_user.email # 커밋 후 다시 로드하지 않도록 미리 보관
 
-    # 5. 데이터베이스에 변경 사항을 커밋하고 대상 객체를 갱신합니다.
+    # 5. 데이터베이스에 변경 사항을 커밋합니다.
     db.commit()
-    db.refresh(target_user)
 
     # 6. 비밀번호 초기화 성공 메시지를 반환합니다.
     # 어떤 사용자의 비밀번호가 초기화되었는지 메시지에 포함할 수 있습니다.
-    return {"message": f"Password for user {target_user.email} has been reset."}
\ No newline at end of file
+    return {"message": f"Password for user {target_email} has been reset."}
\ No newline at end of file
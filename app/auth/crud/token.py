@@ -15,7 +15,6 @@ def create_token(db: Session, token: str, token_type: str, user_id: int, expires
     )
     db.add(db_token)
     db.commit()
-    db.refresh(db_token)
     return db_token
 
 def get_token_by_value(db: Session, token: str, token_type: str):
@@ -35,7 +34,11 @@ def get_valid_password_reset_token(db: Session, token: str):
     ).first()
 
 
-def delete_token(db: Session, db_token: Token):
-    """토큰 정보를 삭제합니다."""
+def delete_token(db: Session, db_token: Token, commit: bool = True):
+    """
+    토큰 정보를 삭제합니다.
+    - commit: False면 삭제만 예약하고, 호출자가 다른 변경과 함께 한 번에 커밋
+    """
     db.delete(db_token)
-    db.commit()
\ No newline at end of file
+    if commit:
+        db.commit()
\ No newline at end of file
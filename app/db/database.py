@@ -1,34 +1,284 @@
 # app/database.py: 데이터베이스 연결 및 ORM 설정 모듈
-# - 환경 변수 또는 기본값을 사용해 데이터베이스 URL 설정
-# - SQLAlchemy 엔진(engine) 생성 및 세션팩토리(SessionLocal) 설정
-# - ORM 모델(Base) 정의 준비
+# - 환경 변수 DATABASE_URL로 데이터베이스 URL 설정
+# - SQLAlchemy 엔진(engine)은 처음 필요할 때 생성 (import 시점에는 DB에 접근하지 않음)
+# - 세션팩토리(SessionLocal) 설정 및 ORM 모델(Base) 정의 준비
 # - FastAPI 의존성(get_db)으로 DB 세션 제공
+# - 읽기 전용 엔드포인트용 의존성(get_read_db): DATABASE_REPLICA_URLS가 설정되면 복제본에서 읽음
+# - DATABASE_SHARD_URLS가 설정되면 urls / click_logs / url_targets를 샤드로 분산 (app/db/sharding.py)
 
 import os
+import threading
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Session, sessionmaker
 
-# 환경 변수에서 DATABASE_URL을 읽어옵니다. 없으면 기본값(postgresql://postgres:postgres@db:5432/url_db)을 사용
-DATABASE_URL = os.getenv("DATABASE_URL")
+from app.db.lazy_session import LazySession
+from app.db.routing import ReadYourWrites, ReplicaSet
+from app.db.sharding import (
+    GLOBAL_SHARD, SHARD_KEYS, HashRing, ShardRouter, make_sharded_session_options, shard_ids_for,
+)
+from app.monitoring.sql import db_sessions_total
 
-# SQLAlchemy 엔진 생성: DB 연결을 관리하는 주요 객체
-engine = create_engine(DATABASE_URL)
+
+def _url_list(name: str) -> list[str]:
+    return [url.strip() for url in os.getenv(name, "").split(",") if url.strip()]
+
+
+# 읽기 복제본 설정 (쉼표로 구분된 URL 목록, 비어 있으면 모든 읽기를 primary에서 처리)
+DATABASE_REPLICA_URLS = _url_list("DATABASE_REPLICA_URLS")
+REPLICA_STRATEGY = os.getenv("REPLICA_STRATEGY", "round_robin")  # round_robin | least_connections
+REPLICA_EJECT_SECONDS = float(os.getenv("REPLICA_EJECT_SECONDS", 30))
+# 쓰기 후 같은 클라이언트의 읽기를 primary로 보내는 시간(초) - 복제 지연보다 길게
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+
+# 샤드 설정 (쉼표로 구분된 URL 목록, 순서가 샤드 ID가 되므로 새 샤드는 끝에만 추가)
+# 리밸런싱 중에는 DATABASE_SHARD_PREVIOUS_URLS에 이전 목록을 두어 이동 중인 키도 조회
+DATABASE_SHARD_URLS = _url_list("DATABASE_SHARD_URLS")
+DATABASE_SHARD_PREVIOUS_URLS = _url_list("DATABASE_SHARD_PREVIOUS_URLS")
 
 # 세션팩토리 설정: DB 트랜잭션 단위로 세션(SessionLocal)을 생성하는 공장 함수
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 엔진은 get_engine()에서 생성될 때 바인딩됩니다.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Base 클래스: ORM 모델 클래스들이 상속받아 테이블 메타데이터를 축적
 Base = declarative_base()
 
-def get_db():
+_engine: Engine | None = None
+_replica_set: ReplicaSet | None = None
+_shard_engines: dict[str, Engine] = {}
+_engine_lock = threading.Lock()
+
+# 최근 쓰기를 한 클라이언트 (read-your-writes)
+read_your_writes = ReadYourWrites(window=READ_YOUR_WRITES_SECONDS)
+
+
+def get_engine() -> Engine:
+    """
+    SQLAlchemy 엔진을 반환합니다. (최초 호출 시 생성)
+    - DATABASE_URL 환경 변수를 이 시점에 읽음
+    - 생성된 엔진을 SessionLocal에 바인딩
+    - 보통 FastAPI lifespan에서 앱 시작 시 호출되며, 그 외 경로에서는 처음 쓰일 때 생성
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                database_url = os.getenv("DATABASE_URL")
+                if not database_url:
+                    raise RuntimeError("DATABASE_URL environment variable is not set")
+                engine = create_engine(database_url)
+                SessionLocal.configure(bind=engine)
+                _engine = engine
+                if DATABASE_SHARD_URLS:
+                    _configure_shards(DATABASE_SHARD_URLS, DATABASE_SHARD_PREVIOUS_URLS)
+    return _engine
+
+
+def _configure_shards(urls: list[str], previous_urls: list[str]):
+    """SessionLocal을 샤드 라우팅 세션(ShardedSession)으로 전환합니다. (_engine_lock 안에서 호출)"""
+    global _shard_engines
+    # 샤드 ID는 목록 위치로 정해지므로 두 목록의 같은 위치는 같은 DB여야 함
+    if any(url != previous for url, previous in zip(urls, previous_urls)):
+        raise RuntimeError("DATABASE_SHARD_URLS must keep the order of DATABASE_SHARD_PREVIOUS_URLS")
+    engines = {GLOBAL_SHARD: _engine}
+    by_url = {os.getenv("DATABASE_URL"): _engine}
+    longest = urls if len(urls) >= len(previous_urls) else previous_urls
+    for shard_id, url in zip(shard_ids_for(len(longest)), longest):
+        if url not in by_url:
+            by_url[url] = create_engine(url)
+        engines[shard_id] = by_url[url]
+    previous_ring = HashRing(shard_ids_for(len(previous_urls))) if previous_urls else None
+    router = ShardRouter(HashRing(shard_ids_for(len(urls))), previous_ring)
+
+    SessionLocal.class_ = ShardedSession
+    SessionLocal.kw.pop("bind", None)
+    SessionLocal.configure(**make_sharded_session_options(router, engines))
+    _shard_engines = engines
+
+
+def _reset_shards():
+    """샤딩을 해제하고 단일 엔진 세션으로 되돌립니다. (_engine_lock 안에서 호출)"""
+    global _shard_engines
+    for engine in set(_shard_engines.values()):
+        if engine is not _engine:
+            engine.dispose()
+    _shard_engines = {}
+    SessionLocal.class_ = Session
+    for key in ("shards", "shard_chooser", "identity_chooser", "execute_chooser"):
+        SessionLocal.kw.pop(key, None)
+    if _engine is not None:
+        SessionLocal.configure(bind=_engine)
+
+
+def configure_shards(urls: list[str], previous_urls: list[str] | None = None):
+    """
+    샤드 구성을 교체합니다. (테스트 / 운영 도구용)
+    - urls가 비어 있으면 샤딩 해제
+    """
+    get_engine()
+    with _engine_lock:
+        _reset_shards()
+        if urls:
+            _configure_shards(urls, previous_urls or [])
+
+
+def get_shard_engines() -> dict[str, Engine]:
+    """
+    샤드 ID -> 엔진 (global 포함) 을 반환합니다.
+    - 샤딩하지 않으면 {"global": engine}
+    """
+    engine = get_engine()
+    return dict(_shard_engines) if _shard_engines else {GLOBAL_SHARD: engine}
+
+
+def is_sharded() -> bool:
+    return bool(_shard_engines)
+
+
+def create_all_tables():
+    """
+    모든 엔진에 테이블을 생성합니다. (개발 / 테스트용, 운영은 Alembic)
+    - 샤드에는 샤딩 테이블만, global에는 나머지 테이블만 생성
+    """
+    for shard_id, engine in get_shard_engines().items():
+        Base.metadata.create_all(bind=engine, tables=_tables_for(shard_id, engine))
+
+
+def drop_all_tables():
+    """create_all_tables()로 만든 테이블을 모두 삭제합니다. (테스트용)"""
+    for shard_id, engine in get_shard_engines().items():
+        Base.metadata.drop_all(bind=engine, tables=_tables_for(shard_id, engine))
+
+
+def _tables_for(shard_id: str, engine: Engine) -> list:
+    if not is_sharded():
+        return list(Base.metadata.sorted_tables)
+    # 같은 DB를 global과 샤드가 함께 쓰는 경우 양쪽 테이블을 모두 생성
+    shard_ids = {sid for sid, other in _shard_engines.items() if other is engine}
+    wanted = set()
+    if GLOBAL_SHARD in shard_ids:
+        wanted |= {t.name for t in Base.metadata.sorted_tables if t.name not in SHARD_KEYS}
+    if shard_ids - {GLOBAL_SHARD}:
+        wanted |= set(SHARD_KEYS)
+    return [table for table in Base.metadata.sorted_tables if table.name in wanted]
+
+
+def get_replica_set() -> ReplicaSet:
+    """읽기 복제본 집합을 반환합니다. (최초 호출 시 DATABASE_REPLICA_URLS로 생성)"""
+    global _replica_set
+    if _replica_set is None:
+        with _engine_lock:
+            if _replica_set is None:
+                _replica_set = ReplicaSet.from_urls(
+                    DATABASE_REPLICA_URLS, strategy=REPLICA_STRATEGY, eject_seconds=REPLICA_EJECT_SECONDS
+                )
+    return _replica_set
+
+
+def configure_replicas(urls: list[str], strategy: str = REPLICA_STRATEGY,
+                       eject_seconds: float = REPLICA_EJECT_SECONDS) -> ReplicaSet:
+    """복제본 구성을 교체합니다. (테스트 / 운영 도구용)"""
+    global _replica_set
+    replica_set = ReplicaSet.from_urls(urls, strategy=strategy, eject_seconds=eject_seconds)
+    with _engine_lock:
+        previous, _replica_set = _replica_set, replica_set
+    if previous is not None:
+        previous.dispose()
+    return replica_set
+
+
+def dispose_engine():
+    """엔진(복제본 포함)의 커넥션 풀을 정리하고, 다음 호출 때 다시 생성되도록 합니다."""
+    global _engine, _replica_set
+    with _engine_lock:
+        _reset_shards()
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+        if _replica_set is not None:
+            _replica_set.dispose()
+            _replica_set = None
+
+
+def __getattr__(name):
+    # 기존 코드 호환: `from app.db.database import engine`은 엔진을 지연 생성해서 반환
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def mark_user_write(db: Session):
+    """
+    요청이 사용자에게 보이는 쓰기(단축 / 비활성화 / 재활성화)를 했다고 표시합니다.
+    - get_db가 요청 종료 때 이 클라이언트를 read-your-writes 목록에 기록
+    - 클릭 기록 같은 부수 쓰기는 표시하지 않음 (리디렉션을 따라간 모든 클라이언트가 primary에 고정되지 않도록)
+    """
+    db.info["wrote"] = True
+
+
+def client_key(request: Request) -> str:
+    """read-your-writes 판단에 쓰는 클라이언트 식별자 (X-Client-Id 헤더, 없으면 IP)"""
+    return request.headers.get("x-client-id") or (request.client.host if request.client else "")
+
+
+def _primary_session(stack) -> Session:
+    get_engine()
+    return SessionLocal()
+
+
+def get_db(request: Request):
     """
     FastAPI 의존성 함수
-    - 요청이 들어올 때마다 새로운 DB 세션을 생성
+    - primary DB 세션을 지연 생성하는 프록시(LazySession)를 제공
+      (처음 쿼리 / add / commit 등을 할 때 세션 생성, 검증 실패나 캐시 응답 요청은 세션 없이 끝남)
     - 요청 처리 후 세션을 안전하게 종료(반납)함
+    - mark_user_write로 표시된 요청의 클라이언트는 read-your-writes 목록에 기록
     """
-    db = SessionLocal()
+    db = LazySession(_primary_session)
     try:
         yield db
     finally:
+        used = db.created
+        if used and db.info.get("wrote"):
+            read_your_writes.record_write(client_key(request))
         db.close()
+        db_sessions_total.labels("primary", "true" if used else "false").inc()
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    읽기 전용 엔드포인트용 FastAPI 의존성 함수
+    - 복제본이 없거나, 이 클라이언트가 최근에 쓰기를 했으면 primary 세션(get_db와 같은 세션) 사용
+    - 그 외에는 복제본 세션을 지연 생성하는 프록시를 제공 (처음 사용할 때 선택 전략에 따라 연결)
+    - 연결에 실패한 복제본은 제외(eject)하고 다음 후보를 시도, 모두 실패하면 primary 사용
+    - 샤딩 중에는 복제본 라우팅을 사용하지 않음 (샤드별 복제본은 미지원)
+    """
+    replica_set = get_replica_set()
+    if not len(replica_set) or is_sharded() or read_your_writes.must_read_primary(client_key(request)):
+        yield db
+        return
+
+    read_db = LazySession(lambda stack: _replica_session(replica_set, stack))
+    try:
+        yield read_db
+    finally:
+        used = read_db.created
+        read_db.close()
+        db_sessions_total.labels("replica", "true" if used else "false").inc()
+
+
+def _replica_session(replica_set: ReplicaSet, stack) -> Session:
+    for replica in replica_set.candidates():
+        try:
+            connection = replica.engine.connect()
+        except DBAPIError:
+            replica_set.eject(replica)
+            continue
+        stack.callback(connection.close)
+        return SessionLocal(bind=connection)
+    return _primary_session(stack)
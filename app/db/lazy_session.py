@@ -0,0 +1,56 @@
+# app/db/lazy_session.py: 지연 생성 DB 세션 프록시 모듈
+# - 요청마다 세션을 만들지 않고, 처음 속성에 접근(쿼리, add, commit 등)할 때 세션을 생성
+#   (검증 실패 / 캐시 응답 등 DB를 쓰지 않는 요청은 세션도, 커넥션 체크아웃도 없음)
+# - 세션 생성 함수는 ExitStack을 받아 정리 작업(커넥션 반납 등)을 등록할 수 있음
+# - close()는 생성된 경우에만 세션과 등록된 정리 작업을 실행하며, 여러 번 호출해도 안전
+
+from contextlib import ExitStack
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+
+class LazySession:
+    """
+    Session 대신 쓰는 프록시
+    - factory(stack): 실제 세션을 만들어 반환 (stack.callback으로 정리 작업 등록 가능)
+    - created: 실제 세션이 만들어졌는지 (= 요청이 DB를 사용했는지)
+    """
+    __slots__ = ("_factory", "_session", "_stack")
+
+    def __init__(self, factory: Callable[[ExitStack], Session]):
+        self._factory = factory
+        self._session: Session | None = None
+        self._stack: ExitStack | None = None
+
+    @property
+    def created(self) -> bool:
+        return self._session is not None
+
+    def _get(self) -> Session:
+        session = self._session
+        if session is None:
+            stack = ExitStack()
+            try:
+                session = self._factory(stack)
+            except BaseException:
+                stack.close()
+                raise
+            stack.callback(session.close)
+            self._session, self._stack = session, stack
+        return session
+
+    def __getattr__(self, name):
+        # __slots__ 외의 모든 속성은 실제 세션으로 위임 (이 시점에 세션 생성)
+        return getattr(self._get(), name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        stack, self._stack, self._session = self._stack, None, None
+        if stack is not None:
+            stack.close()
@@ -0,0 +1,56 @@
+# app/db/query_counter.py: SQL 실행 횟수 측정 모듈
+# - count_queries(): 블록 안에서 실행된 SQL 문장을 기록하는 컨텍스트 매니저
+# - 테스트에서 엔드포인트별 쿼리 예산(budget)을 검증하거나,
+#   N+1 / 중복 쿼리를 찾을 때 사용
+#
+# 사용 예:
+#   with count_queries() as counter:
+#       client.get("/shortener/v1/stats/abc123")
+#   assert counter.count <= 1, counter.report()
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    블록 안에서 실행된 SQL 문장 목록
+    - statements: 실행된 SQL 문자열 (실행 순서대로)
+    - count: 실행된 SQL 문장 수
+    """
+
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        """실패 메시지용으로 실행된 쿼리 목록을 번호와 함께 반환합니다."""
+        lines = [f"{self.count} statement(s) executed:"]
+        for i, statement in enumerate(self.statements, start=1):
+            lines.append(f"  {i}. {' '.join(statement.split())}")
+        return "\n".join(lines)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    블록 안에서 실행된 SQL 문장을 기록합니다.
+    - engine: 특정 엔진만 측정할 때 지정 (기본값: 모든 Engine)
+    - 반환: QueryCounter
+    주의: 엔진 단위 이벤트이므로 같은 엔진을 쓰는 다른 스레드의 쿼리도 함께 기록됩니다.
+    """
+    target = engine if engine is not None else Engine
+    counter = QueryCounter()
+    event.listen(target, "after_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "after_cursor_execute", counter._record)
@@ -0,0 +1,182 @@
+# app/db/rebalance.py: 샤드 추가/제거 시 데이터 이동(리밸런싱) 도구
+# - 이전 샤드 목록(--from-shards)과 새 샤드 목록(--to-shards)의 해시 링을 비교해
+#   소유 샤드가 바뀌는 행만 새 샤드로 복사한 뒤 이전 샤드에서 삭제
+# - 기본 키(복합 키 포함) 순서대로 배치(--batch-size) 단위로 이동해 긴 트랜잭션/락을 피함
+#
+# 온라인 리밸런싱 절차:
+#   1. DATABASE_SHARD_URLS=<새 목록>, DATABASE_SHARD_PREVIOUS_URLS=<이전 목록>으로 배포
+#      (쓰기는 새 소유 샤드로, 읽기/수정은 두 소유 샤드 모두 조회)
+#   2. python -m app.db.rebalance --from-shards <이전 목록> --to-shards <새 목록>
+#   3. DATABASE_SHARD_PREVIOUS_URLS를 제거하고 다시 배포
+#
+# - url_click_counters는 대상 샤드에 같은 (short_code, slot) 행이 있으면 건너뛰지 않고 n / bots를 더함
+#   (이전 실행에서 옮겨진 행이나 이동 중 새 소유 샤드에 쌓인 클릭이 있어도 아직 접지 않은 클릭을 잃지 않음)
+#
+# 주의: 복사(새 샤드)와 삭제(이전 샤드)는 서로 다른 DB의 트랜잭션입니다. 중간에 중단되면 다시 실행하면 되며,
+#       urls / url_targets / archived_urls는 이미 복사된 행을 건너뛰지만, 복사 후 삭제 전에 중단된 배치는
+#       click_logs가 중복되고 url_click_counters의 n / bots가 한 번 더 더해질 수 있습니다.
+
+import argparse
+import logging
+
+from sqlalchemy import bindparam, case, create_engine, delete, select, tuple_, update
+
+from app.db.database import Base, DATABASE_SHARD_PREVIOUS_URLS, DATABASE_SHARD_URLS
+from app.db.sharding import SHARD_KEYS, HashRing, shard_ids_for
+import app.analytics.models  # noqa: F401  (샤딩 테이블을 메타데이터에 등록)
+import app.shortener.models  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+# 이미 복사된 행을 확인할 수 있는 고유 키 (중단 후 재실행 시 중복 방지)
+UNIQUE_KEYS = {
+    "urls": ("short_code",),
+    "url_targets": ("target_hash",),
+    "url_click_counters": ("short_code", "slot"),
+    "archived_urls": ("short_code",),
+}
+
+# 대상 샤드에 같은 고유 키의 행이 있을 때 값을 더해 합치는 컬럼 (나머지 테이블은 건너뜀)
+# updated_at은 둘 중 늦은 값을 남김
+MERGE_COLUMNS = {
+    "url_click_counters": ("n", "bots"),
+}
+
+
+def _key(columns: list):
+    """컬럼이 하나면 그 컬럼, 여러 개면 행 값(tuple_) 표현식"""
+    return columns[0] if len(columns) == 1 else tuple_(*columns)
+
+
+def _key_value(row, names: list[str]):
+    return row[names[0]] if len(names) == 1 else tuple(row[name] for name in names)
+
+
+def _merge_statement(table, unique_names: list[str], merge_names: tuple[str, ...]):
+    """고유 키가 같은 대상 행에 merge_names 값을 더하는 UPDATE (executemany용, 바인드 이름은 b_<컬럼>)"""
+    values = {name: table.c[name] + bindparam(f"b_{name}") for name in merge_names}
+    if "updated_at" in table.c:
+        column, incoming = table.c.updated_at, bindparam("b_updated_at", type_=table.c.updated_at.type)
+        values["updated_at"] = case((column.is_(None), incoming), (incoming > column, incoming), else_=column)
+    return update(table).where(*(table.c[name] == bindparam(f"b_{name}") for name in unique_names)).values(values)
+
+
+def _shard_engines(from_urls: list[str], to_urls: list[str]) -> dict:
+    if any(url != previous for url, previous in zip(to_urls, from_urls)):
+        raise ValueError("--to-shards must keep the order of --from-shards (append or remove at the end only)")
+    longest = to_urls if len(to_urls) >= len(from_urls) else from_urls
+    engines = {}
+    by_url = {}
+    for shard_id, url in zip(shard_ids_for(len(longest)), longest):
+        if url not in by_url:
+            by_url[url] = create_engine(url)
+        engines[shard_id] = by_url[url]
+    return engines
+
+
+def move_table(table, source, engines: dict, new_ring: HashRing, batch_size: int) -> int:
+    """
+    source 샤드의 table에서 새 링 기준 소유 샤드가 바뀐 행을 옮깁니다.
+    - 반환: 이동한 행 수
+    """
+    key_name = SHARD_KEYS[table.name]
+    pk_columns = list(table.primary_key.columns)
+    pk_names = [c.name for c in pk_columns]
+    pk = _key(pk_columns)
+    unique_names = list(UNIQUE_KEYS.get(table.name, ()))
+    merge_names = MERGE_COLUMNS.get(table.name, ())
+    # 자동 증가 id는 샤드마다 따로 발급되므로 대상 샤드에서 새로 발급받음
+    surrogate = pk_columns[0] if len(pk_columns) == 1 and pk_names[0] not in unique_names else None
+    copy_columns = [c.name for c in table.columns if c is not surrogate]
+    source_engine = engines[source]
+    moved = 0
+    last = None
+    while True:
+        statement = select(table).order_by(*pk_columns).limit(batch_size)
+        if last is not None:
+            statement = statement.where(pk > (last if len(pk_names) == 1 else tuple_(*last)))
+        with source_engine.connect() as conn:
+            rows = conn.execute(statement).mappings().all()
+        if not rows:
+            return moved
+        last = _key_value(rows[-1], pk_names)
+
+        by_target: dict[str, list] = {}
+        for row in rows:
+            target = new_ring.shard_for(row[key_name])
+            if engines[target] is not source_engine:
+                by_target.setdefault(target, []).append(row)
+
+        for target, target_rows in by_target.items():
+            with engines[target].begin() as conn:
+                values = [{name: row[name] for name in copy_columns} for row in target_rows]
+                if unique_names:
+                    unique_columns = [table.c[name] for name in unique_names]
+                    existing = {
+                        _key_value(row, unique_names)
+                        for row in conn.execute(
+                            select(*unique_columns).where(
+                                _key(unique_columns).in_([_key_value(v, unique_names) for v in values])
+                            )
+                        ).mappings()
+                    }
+                    if merge_names:
+                        merges = [v for v in values if _key_value(v, unique_names) in existing]
+                        if merges:
+                            conn.execute(
+                                _merge_statement(table, unique_names, merge_names),
+                                [{f"b_{name}": v[name] for name in v} for v in merges],
+                            )
+                    values = [v for v in values if _key_value(v, unique_names) not in existing]
+                if values:
+                    conn.execute(table.insert(), values)
+            with source_engine.begin() as conn:
+                conn.execute(delete(table).where(pk.in_([_key_value(row, pk_names) for row in target_rows])))
+            moved += len(target_rows)
+
+
+def rebalance(from_urls: list[str], to_urls: list[str], batch_size: int = 1000) -> dict:
+    """
+    이전 샤드 목록에서 새 샤드 목록으로 샤딩 테이블의 행을 옮깁니다.
+    - 반환: {"<테이블>": 이동한 행 수}
+    """
+    if not from_urls or not to_urls:
+        raise ValueError("both shard lists are required")
+    engines = _shard_engines(from_urls, to_urls)
+    new_ring = HashRing(shard_ids_for(len(to_urls)))
+    summary = {}
+    try:
+        for table_name in SHARD_KEYS:
+            table = Base.metadata.tables[table_name]
+            # 제거되는 샤드를 포함해 이전 링의 모든 샤드를 훑음
+            for source in shard_ids_for(len(from_urls)):
+                moved = move_table(table, source, engines, new_ring, batch_size)
+                summary[table_name] = summary.get(table_name, 0) + moved
+                logger.info("%s: moved %d rows out of %s", table_name, moved, source)
+    finally:
+        for engine in set(engines.values()):
+            engine.dispose()
+    return summary
+
+
+def _split(value: str) -> list[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move sharded rows after changing the shard list")
+    parser.add_argument("--from-shards", default=",".join(DATABASE_SHARD_PREVIOUS_URLS),
+                        help="previous comma-separated shard URLs (default: DATABASE_SHARD_PREVIOUS_URLS)")
+    parser.add_argument("--to-shards", default=",".join(DATABASE_SHARD_URLS),
+                        help="new comma-separated shard URLs (default: DATABASE_SHARD_URLS)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    summary = rebalance(_split(args.from_shards), _split(args.to_shards), args.batch_size)
+    for table_name, moved in summary.items():
+        print(f"{table_name:<12} {moved:>10} rows moved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# app/db/routing.py: 읽기 복제본(replica) 라우팅 모듈
+# - ReplicaSet: 복제본 엔진 목록 관리, 라운드로빈 / 최소 연결(least connections) 선택
+# - 연결 실패한 복제본은 일정 시간(eject_seconds) 동안 제외했다가 다시 시도
+#   연결은 되지만 쿼리가 OperationalError로 실패하는 복제본(복구 충돌, 읽기 전용 오류, 지연으로 인한 시간 초과 등)도
+#   엔진 handle_error 이벤트에서 같은 방식으로 제외 (실패한 요청 자체는 그대로 에러)
+# - ReadYourWrites: 최근 쓰기를 한 클라이언트를 기억해 일정 시간 동안 primary에서 읽도록 함
+#   (복제 지연 때문에 방금 만든 링크가 복제본에서 안 보이는 문제 방지)
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+STRATEGIES = ("round_robin", "least_connections")
+
+
+class Replica:
+    """복제본 엔진 하나와 상태 정보"""
+    __slots__ = ("engine", "in_use", "ejected_until")
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.in_use = 0
+        self.ejected_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+
+class ReplicaSet:
+    """
+    읽기 전용 복제본 엔진 집합
+    - strategy: "round_robin" 또는 "least_connections"
+    - eject_seconds: 실패한 복제본을 선택 대상에서 제외하는 시간(초)
+    """
+
+    def __init__(self, engines: list[Engine], strategy: str = "round_robin", eject_seconds: float = 30.0):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown replica strategy: {strategy}")
+        self.replicas = [Replica(engine) for engine in engines]
+        self.strategy = strategy
+        self.eject_seconds = eject_seconds
+        self._cursor = itertools.count()
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            self._track_connections(replica)
+
+    @classmethod
+    def from_urls(cls, urls: list[str], **kwargs) -> "ReplicaSet":
+        # pool_pre_ping: 풀에 있던 끊어진 연결을 꺼낼 때 감지해 장애 복제본을 빨리 제외
+        return cls([create_engine(url, pool_pre_ping=True) for url in urls], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def _track_connections(self, replica: Replica):
+        # 커넥션 풀 checkout/checkin 이벤트로 복제본별 사용 중 연결 수를 추적
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                replica.in_use += 1
+
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                replica.in_use = max(0, replica.in_use - 1)
+
+        def on_error(exception_context):
+            # 연결 후 쿼리 단계의 실패도 제외 대상 (SQL 문법 / 제약 조건 오류 등은 복제본 문제가 아니므로 제외하지 않음)
+            if isinstance(exception_context.sqlalchemy_exception, OperationalError):
+                self.eject(replica)
+
+        event.listen(replica.engine, "checkout", on_checkout)
+        event.listen(replica.engine, "checkin", on_checkin)
+        event.listen(replica.engine, "handle_error", on_error)
+
+    def candidates(self) -> list[Replica]:
+        """
+        선택 우선순위대로 정렬된 정상 복제본 목록을 반환합니다.
+        - 첫 번째 후보 연결에 실패하면 호출자가 다음 후보를 시도
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return []
+        if self.strategy == "least_connections":
+            with self._lock:
+                return sorted(healthy, key=lambda replica: replica.in_use)
+        start = next(self._cursor) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def eject(self, replica: Replica):
+        """연결 / 쿼리에 실패한 복제본을 eject_seconds 동안 제외합니다."""
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+
+class ReadYourWrites:
+    """
+    최근 쓰기를 한 클라이언트 목록 (read-your-writes 일관성용)
+    - window: 쓰기 후 primary에서 읽을 시간(초), 복제 지연보다 길게 설정
+    - max_clients: 기억할 최대 클라이언트 수 (메모리 상한)
+    """
+
+    def __init__(self, window: float = 5.0, max_clients: int = 100_000):
+        self.window = window
+        self.max_clients = max_clients
+        self._writes: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record_write(self, client_key: str):
+        with self._lock:
+            self._writes[client_key] = time.monotonic() + self.window
+            self._writes.move_to_end(client_key)
+            while len(self._writes) > self.max_clients:
+                self._writes.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._writes.clear()
+
+    def must_read_primary(self, client_key: str) -> bool:
+        with self._lock:
+            until = self._writes.get(client_key)
+            if until is None:
+                return False
+            if until < time.monotonic():
+                del self._writes[client_key]
+                return False
+            return True
@@ -0,0 +1,199 @@
+# app/db/sharding.py: urls / click_logs 수평 샤딩 모듈
+# - HashRing: 가상 노드를 둔 consistent hashing 링 (샤드 추가 시 약 1/N 키만 이동)
+# - 샤드 키
+#   - urls, click_logs, url_click_counters, archived_urls: short_code
+#   - url_targets (원본 URL 중복 확인용 조회 테이블): target_hash (원본 URL 해시로 파티셔닝)
+#   - 그 외 테이블(users, tokens 등): 샤딩하지 않고 "global" 엔진(DATABASE_URL)에 저장
+# - SQLAlchemy ShardedSession의 chooser 함수로 CRUD 코드 변경 없이 투명하게 라우팅
+#   - INSERT: 객체의 샤드 키로 소유 샤드 선택
+#   - SELECT/UPDATE/DELETE: WHERE 절의 `샤드 키 == 값` / `샤드 키 IN (...)` 조건으로 대상 샤드 결정,
+#     조건이 없으면 모든 샤드에 실행 후 결과 병합
+# - 리밸런싱 중에는 이전 링(previous ring)의 소유 샤드도 함께 조회해 이동 중인 키를 놓치지 않음
+#   (app/db/rebalance.py 참고)
+
+import bisect
+import hashlib
+
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+
+GLOBAL_SHARD = "global"
+
+# 테이블 이름 -> 샤드 키 컬럼 이름
+SHARD_KEYS = {
+    "urls": "short_code",
+    "click_logs": "short_code",
+    "url_click_counters": "short_code",
+    "archived_urls": "short_code",
+    "url_targets": "target_hash",
+}
+
+
+def stable_hash(key: str) -> int:
+    """프로세스/머신이 달라도 같은 값을 주는 64비트 해시 (파이썬 hash()는 실행마다 달라짐)"""
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+def shard_ids_for(count: int) -> list[str]:
+    """샤드 목록의 위치로 샤드 ID를 만듭니다. (샤드는 목록 끝에만 추가해야 ID가 유지됨)"""
+    return [f"shard{i}" for i in range(count)]
+
+
+class HashRing:
+    """
+    consistent hashing 링
+    - shard_ids: 샤드 ID 목록
+    - vnodes: 샤드당 가상 노드 수 (클수록 키 분포가 고름)
+    """
+
+    def __init__(self, shard_ids: list[str], vnodes: int = 128):
+        if not shard_ids:
+            raise ValueError("hash ring needs at least one shard")
+        points = sorted(
+            (stable_hash(f"{shard_id}#{i}"), shard_id)
+            for shard_id in shard_ids
+            for i in range(vnodes)
+        )
+        self.shard_ids = list(shard_ids)
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard_id for _, shard_id in points]
+
+    def shard_for(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, stable_hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class ShardRouter:
+    """
+    ShardedSession에 넘길 chooser 함수 묶음
+    - ring: 현재 링 (쓰기 대상)
+    - previous_ring: 리밸런싱 중인 이전 링 (읽기/수정 시 함께 조회), 없으면 None
+    """
+
+    def __init__(self, ring: HashRing, previous_ring: HashRing | None = None):
+        self.ring = ring
+        self.previous_ring = previous_ring
+
+    def owners(self, key: str) -> list[str]:
+        """키를 가지고 있을 수 있는 샤드 목록 (현재 소유 샤드가 먼저)"""
+        owner = self.ring.shard_for(key)
+        if self.previous_ring is None:
+            return [owner]
+        previous = self.previous_ring.shard_for(key)
+        return [owner] if previous == owner else [owner, previous]
+
+    @property
+    def all_shards(self) -> list[str]:
+        shard_ids = list(self.ring.shard_ids)
+        if self.previous_ring is not None:
+            shard_ids += [s for s in self.previous_ring.shard_ids if s not in shard_ids]
+        return shard_ids
+
+    def shard_chooser(self, mapper, instance, clause=None):
+        """새 객체(INSERT)의 저장 샤드를 고릅니다."""
+        table = mapper.local_table.name if mapper is not None else None
+        key_name = SHARD_KEYS.get(table)
+        if key_name is None:
+            return GLOBAL_SHARD
+        if instance is not None:
+            return self.ring.shard_for(getattr(instance, key_name))
+        # 인스턴스 없이 호출되는 경우(예: 세션 get_bind) - 조건에서 키를 찾을 수 없으면 첫 샤드
+        keys = _shard_key_values(clause, key_name, {}) if clause is not None else None
+        return self.ring.shard_for(next(iter(keys))) if keys else self.ring.shard_ids[0]
+
+    def identity_chooser(self, mapper, primary_key, **kw):
+        """기본 키(id)만으로 조회할 때 - id에는 샤드 정보가 없으므로 모든 후보 샤드"""
+        if SHARD_KEYS.get(mapper.local_table.name) is None:
+            return [GLOBAL_SHARD]
+        lazy_loaded_from = kw.get("lazy_loaded_from")
+        if lazy_loaded_from is not None and lazy_loaded_from.identity_token is not None:
+            return [lazy_loaded_from.identity_token]
+        return self.all_shards
+
+    def execute_chooser(self, orm_context):
+        """SELECT/UPDATE/DELETE 대상 샤드를 WHERE 조건으로 고릅니다."""
+        statement = _unwrap_subquery(orm_context.statement)
+        # UNION: 첫 SELECT 기준 (같은 샤드 키로 샤딩된 테이블끼리만 합쳐 사용)
+        while getattr(statement, "selects", None):
+            statement = statement.selects[0]
+        key_name = SHARD_KEYS.get(_statement_table(statement))
+        if key_name is None:
+            return [GLOBAL_SHARD]
+        whereclause = getattr(statement, "whereclause", None)
+        keys = _shard_key_values(whereclause, key_name, orm_context.parameters or {})
+        if not keys:
+            return self.all_shards
+        shard_ids = []
+        for key in keys:
+            for shard_id in self.owners(key):
+                if shard_id not in shard_ids:
+                    shard_ids.append(shard_id)
+        return shard_ids
+
+
+def _unwrap_subquery(statement):
+    """query.count()처럼 `SELECT ... FROM (SELECT ...)` 로 감싼 문장은 안쪽 SELECT를 기준으로 판단"""
+    while True:
+        froms = statement.get_final_froms() if hasattr(statement, "get_final_froms") else []
+        if len(froms) != 1:
+            return statement
+        inner = froms[0]
+        while hasattr(inner, "element") and not hasattr(inner, "whereclause"):  # Alias -> Subquery -> Select
+            inner = inner.element
+        if inner is froms[0] or not hasattr(inner, "whereclause"):
+            return statement
+        statement = inner
+
+
+def _statement_table(statement) -> str | None:
+    """ORM 문장의 주 대상 테이블 이름"""
+    table = getattr(statement, "table", None)  # UPDATE / DELETE
+    if table is not None:
+        return getattr(table, "name", None)
+    for description in getattr(statement, "column_descriptions", []):
+        entity = description.get("entity")
+        if entity is not None and hasattr(entity, "__table__"):
+            return entity.__table__.name
+    froms = statement.get_final_froms() if hasattr(statement, "get_final_froms") else []
+    return getattr(froms[0], "name", None) if froms else None
+
+
+def _shard_key_values(whereclause, key_name: str, parameters) -> set[str] | None:
+    """
+    WHERE 절의 최상위 AND 조건에서 `key == 값`, `key IN (...)` 값을 찾습니다.
+    - OR 등 다른 조건 안에 있는 비교는 범위를 좁히지 못하므로 무시
+    - 반환: 키 값 집합, 찾지 못하면 None (= 모든 샤드)
+    """
+    if whereclause is None:
+        return None
+    if isinstance(whereclause, BooleanClauseList):
+        if whereclause.operator is not operators.and_:
+            return None
+        found = None
+        for clause in whereclause.clauses:
+            values = _shard_key_values(clause, key_name, parameters)
+            if values is not None:
+                found = values if found is None else (found & values)
+        return found
+    if not isinstance(whereclause, BinaryExpression):
+        return None
+    column, bind = whereclause.left, whereclause.right
+    if getattr(column, "key", None) != key_name or not isinstance(bind, BindParameter):
+        return None
+    value = bind.effective_value if bind.value is not None or bind.callable is not None else parameters.get(bind.key)
+    if whereclause.operator is operators.eq:
+        return {value}
+    if whereclause.operator is operators.in_op:
+        return set(value)
+    return None
+
+
+def make_sharded_session_options(router: ShardRouter, shards: dict) -> dict:
+    """sessionmaker.configure()에 넘길 ShardedSession 옵션"""
+    return {
+        "shards": shards,
+        "shard_chooser": router.shard_chooser,
+        "identity_chooser": router.identity_chooser,
+        "execute_chooser": router.execute_chooser,
+    }
+
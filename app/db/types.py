@@ -0,0 +1,35 @@
+# app/db/types.py: 공용 SQLAlchemy 컬럼 타입 모듈
+# - PackedIP: IP 주소 컬럼
+#   - PostgreSQL: 네이티브 INET (접두사 / 범위 연산자 사용 가능)
+#   - 그 외 DB: 16바이트 BLOB (app/utils/ipaddr.pack_ip, 바이트 순서 = 주소 순서)
+#   - 파이썬 쪽 값은 항상 정규화된 문자열, IP가 아닌 값은 NULL로 저장
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects.postgresql import INET
+from sqlalchemy.types import TypeDecorator
+
+from app.utils.ipaddr import normalize_ip, pack_ip, unpack_ip
+
+
+class PackedIP(TypeDecorator):
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(INET())
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return normalize_ip(value)
+        return pack_ip(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return str(value)
+        return unpack_ip(value)
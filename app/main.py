@@ -1,15 +1,33 @@
 # app/main.py: FastAPI 서버 진입점 및 라우터 설정 모듈
 #
 # 이 파일은 FastAPI 애플리케이션을 초기화하고,
-# 데이터베이스 테이블을 생성(Base.metadata.create_all)하며,
 # URL 단축 기능을 제공하는 라우터를 등록합니다.
+#
+# import 시점에는 DB에 접근하지 않습니다. 엔진 생성은 lifespan(앱 시작)에서 수행하고,
+# 테이블 생성(Base.metadata.create_all)은 DB_CREATE_ALL=1 일 때만 수행합니다.
+# 운영 환경의 스키마는 Alembic 마이그레이션(alembic upgrade head)으로 관리합니다.
+
+import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from app.auth.api.user import router as user_router
 from app.shortener.api import v1 as shortener_api
 from app.analytics.api import v1 as analytics_api
+from app.monitoring.api import v1 as monitoring_api
+from app.monitoring.admission import ADMISSION_CONTROL, AdmissionMiddleware
+from app.monitoring.middleware import MetricsMiddleware
+from app.monitoring.sql import install_sql_hooks
+from app.shortener.fastpath import REDIRECT_FAST_PATH, RedirectFastPathMiddleware
 
-from app.db.database import Base, engine
+from app.db.database import create_all_tables, dispose_engine, get_engine
+from app.analytics.iprange import start_ip_ranges
+from app.analytics.spool import click_spool, start_click_spool
+from app.shortener.code_filter import code_filter, start_code_filter
+from app.shortener.counters import start_counter_fold
+from app.shortener.snapshot import REDIRECT_SOURCE, start_snapshot_refresh
+from app.shortener.tiering import start_tiering
+from app.shortener.warmup import start_warmup
 
 # OpenAPI 스펙에 추가할 보안 스킴 정의
 openapi_security_scheme = {
@@ -35,11 +53,59 @@ openapi_security_requirements = [
     # 만약 둘 중 하나만 요구한다면 (더 복잡한 설정 필요, Depends 조합 함수 사용이 더 간편)
 ]
 
-app = FastAPI(title="URL Shortener with Auth")
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작/종료 처리
+    - 시작: SQL 계측 훅 등록 (백그라운드 DB 작업보다 먼저)
+    - 시작: DB 엔진 생성, (DB_CREATE_ALL=1 인 경우) 테이블 자동 생성 - 개발용 (샤드 포함)
+    - 시작: 리디렉션 캐시 warm-up을 백그라운드로 실행 (완료/시간 초과 시 ready)
+    - 시작: 단축 키 Bloom 필터 생성을 백그라운드로 실행
+    - 시작: IP 대역 DB(IP_RANGES_CSV)를 백그라운드로 읽음 (클릭의 network / country 기록용)
+    - 시작: 클릭 분산 카운터를 urls.clicks로 주기적으로 접는 작업 시작 (CLICK_COUNTER_FOLD_SECONDS)
+    - 시작: 비활성 / 오래 쓰이지 않은 링크를 보관 테이블로 옮기는 작업 시작 (ARCHIVE_INTERVAL_SECONDS)
+    - 시작: (CLICK_SPOOL_DIR 설정 시) 클릭 스풀을 열고 DB로 옮기는 드레이너 시작
+    - 시작: REDIRECT_SOURCE=fallback / edge 이면 리디렉션 스냅샷을 열고 주기적으로 갱신
+      (edge 모드는 DB에 접근하지 않으므로 warm-up / 단축 키 필터 / 카운터 접기 / 보관 작업 / 클릭 스풀을 실행하지 않음)
+    - 종료: 클릭 스풀 fsync 후 닫기 (남은 클릭은 다음 시작 / 다른 워커의 드레이너가 기록),
+      단축 키 필터 스냅샷 저장(BLOOM_SNAPSHOT_PATH), 커넥션 풀 정리
+    """
+    install_sql_hooks()
+    get_engine()
+    if _env_flag("DB_CREATE_ALL"):
+        create_all_tables()
+    tasks = [start_snapshot_refresh()]
+    if REDIRECT_SOURCE != "edge":
+        tasks += [start_warmup(), start_code_filter(), start_counter_fold(), start_ip_ranges(),
+                  start_tiering(), start_click_spool()]
+    yield
+    for task in tasks:
+        if task is not None:
+            task.cancel()
+    click_spool.close()
+    code_filter.save_snapshot()
+    dispose_engine()
+
+
+app = FastAPI(title="URL Shortener with Auth", lifespan=lifespan)
 
 app.include_router(user_router)
 app.include_router(shortener_api.router)
 app.include_router(analytics_api.router)
+app.include_router(monitoring_api.router)
+
+# 리디렉션 전용 fast path (나중에 추가한 미들웨어가 바깥쪽이므로 메트릭 미들웨어보다 먼저 추가)
+if REDIRECT_FAST_PATH:
+    app.add_middleware(RedirectFastPathMiddleware)
+
+# 요청 수락 제어 / 부하 차단 (ADMISSION_CONTROL=1일 때만)
+# (fast path 바깥쪽: 리디렉션도 분류에 포함, 메트릭 안쪽: 503도 계측)
+if ADMISSION_CONTROL:
+    app.add_middleware(AdmissionMiddleware)
 
-# 자동 테이블 생성 (개발용)
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+# 요청 지연시간 / 상태코드 / 요청별 SQL 계측 (Prometheus: GET /internal/metrics)
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,262 @@
+# app/monitoring/admission.py: 요청 수락 제어(admission control) / 부하 차단(load shedding) 미들웨어
+# - DB가 느려지면 get_db 뒤 스레드풀에 요청이 쌓여 모든 엔드포인트(리디렉션 포함)의 지연시간이 함께 늘어남
+#   → 앱 앞단에서 동시 처리 수(ADMISSION_MAX_IN_FLIGHT)를 제한하고, 넘치는 요청은 여기서 대기 / 거절
+# - 요청 분류(route class)와 우선순위: redirect > auth > write > analytics
+#   - 분류마다 전체 한도 중 사용할 수 있는 비율(share)이 달라 낮은 우선순위부터 먼저 한도에 걸림
+#     → 리디렉션용 여유(1 - share)는 항상 남겨 둠
+#   - 자리가 나면 우선순위가 높은 분류의 대기 요청부터 수락
+# - 분류별 CoDel 방식 과부하 판정 (Nichols & Jacobson, 2012 / "Fail at Scale" 변형)
+#   - ADMISSION_INTERVAL_SECONDS 동안 수락된 요청의 최소 대기 시간이 ADMISSION_TARGET_SECONDS를 넘으면 과부하
+#     (대기 없이 수락된 요청이 하나라도 있으면 대기열이 계속 쌓여 있는 상태가 아님)
+#   - 과부하 중에는 대기 후 수락된 요청은 짧게 기다렸어도 회복으로 보지 않음 (대기 없이 수락되어야 회복)
+#   - 평상시: 한도가 차면 최대 ADMISSION_MAX_QUEUE_SECONDS까지 대기
+#   - 과부하: 최대 ADMISSION_TARGET_SECONDS만 대기하고 503 + Retry-After (늦은 성공 대신 빠른 실패로 대기열을 비움)
+# - /internal/* (헬스 체크 / 메트릭)과 클릭 수 스트림(SSE)은 제한하지 않음
+#   (스트림은 연결이 계속 열려 있어 자리를 차지하므로 구독 수 한도로 따로 제한, app/shortener/stream.py)
+# - 결정은 메트릭으로 노출 (admission_decisions_total 등, GET /internal/metrics)
+#
+# - 기본값은 비활성: ADMISSION_CONTROL=1일 때만 등록
+#   (한도는 배포마다 다른 스레드풀 / DB 커넥션 풀 크기에 맞춰야 하므로 켤 때 ADMISSION_MAX_IN_FLIGHT도 함께 설정)
+#
+# MetricsMiddleware 안쪽, 리디렉션 fast path 바깥쪽에 등록합니다. (app/main.py)
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+from app.monitoring.metrics import Counter, Gauge, Histogram
+
+# 요청 수락 제어 사용 여부 (기본 비활성, 켜면 아래 한도로 동시 처리 수를 제한하고 넘치면 503)
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "").lower() in ("1", "true", "yes")
+# 동시에 처리할 최대 요청 수 (스레드풀 크기(기본 40)와 DB 커넥션 풀 크기보다 작게 두어 대기열이 여기서 생기도록)
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", 32))
+ADMISSION_TARGET_SECONDS = float(os.getenv("ADMISSION_TARGET_SECONDS", 0.05))
+ADMISSION_INTERVAL_SECONDS = float(os.getenv("ADMISSION_INTERVAL_SECONDS", 0.5))
+ADMISSION_MAX_QUEUE_SECONDS = float(os.getenv("ADMISSION_MAX_QUEUE_SECONDS", 0.5))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", 1))
+
+# 분류: (우선순위 - 작을수록 먼저, 전체 한도 중 사용할 수 있는 비율)
+ROUTE_CLASSES = {
+    "redirect": (0, 1.0),
+    "auth": (1, 0.9),
+    "write": (2, 0.8),
+    "analytics": (3, 0.6),
+}
+
+admission_decisions = Counter(
+    "admission_decisions_total", "Admission control decisions", labelnames=("route_class", "decision")
+)
+admission_in_flight = Gauge(
+    "admission_in_flight", "Admitted requests currently being processed", labelnames=("route_class",)
+)
+admission_queue_seconds = Histogram(
+    "admission_queue_seconds", "Time spent waiting for admission", labelnames=("route_class",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+admission_overloaded = Gauge(
+    "admission_overloaded", "1 while the route class is shedding load", labelnames=("route_class",)
+)
+
+
+# 응답이 오래 열려 있는 스트리밍 경로
+STREAMING_PATHS = ("/shortener/v1/stats/stream",)
+
+
+def classify(method: str, path: str) -> str | None:
+    """요청 경로로 분류를 정합니다. (None: 제한하지 않음)"""
+    if path.startswith("/internal/") or path in STREAMING_PATHS:
+        return None
+    if path.startswith("/user/"):
+        return "auth"
+    if path.startswith("/analytics/"):
+        return "analytics"
+    if path.startswith("/shortener/v1/"):
+        rest = path[len("/shortener/v1/"):]
+        if method in ("GET", "HEAD"):
+            if rest.startswith(("urls/", "stats/")):
+                return "analytics"
+            if rest and "/" not in rest:
+                return "redirect"
+        return "write"
+    return "write" if method not in ("GET", "HEAD") else "analytics"
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    route_class: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class _ClassState:
+    """분류별 CoDel 상태"""
+    __slots__ = ("name", "priority", "share", "in_flight", "interval_end", "min_delay", "overloaded", "metrics")
+
+    def __init__(self, name: str, priority: int, share: float):
+        self.name = name
+        self.priority = priority
+        self.share = share
+        self.in_flight = 0
+        self.interval_end = 0.0
+        self.min_delay = float("inf")
+        self.overloaded = False
+        self.metrics = {
+            decision: admission_decisions.labels(name, decision)
+            for decision in ("admitted", "queued", "shed_overloaded", "shed_timeout")
+        }
+
+    def observe(self, delay: float, now: float, target: float, interval: float):
+        """수락된 요청의 대기 시간을 기록하고, 구간이 끝났으면 과부하 여부를 다시 판정합니다."""
+        if self.overloaded and delay > 0:
+            delay = float("inf")
+        if delay < self.min_delay:
+            self.min_delay = delay
+        if now >= self.interval_end:
+            self.overloaded = self.min_delay > target
+            self.min_delay = float("inf")
+            self.interval_end = now + interval
+            admission_overloaded.labels(self.name).set(1 if self.overloaded else 0)
+
+
+class AdmissionController:
+    """
+    우선순위별 비율 한도 + 분류별 CoDel 과부하 판정
+    - 한 이벤트 루프에서만 사용 (잠금 없음)
+    - clock: 테스트에서 시간을 주입할 때 사용
+    """
+
+    def __init__(self, max_in_flight: int = ADMISSION_MAX_IN_FLIGHT, target: float = ADMISSION_TARGET_SECONDS,
+                 interval: float = ADMISSION_INTERVAL_SECONDS, max_queue: float = ADMISSION_MAX_QUEUE_SECONDS,
+                 clock=time.monotonic):
+        self.max_in_flight = max_in_flight
+        self.target = target
+        self.interval = interval
+        self.max_queue = max_queue
+        self.clock = clock
+        self.in_flight = 0
+        self.classes = {name: _ClassState(name, priority, share) for name, (priority, share) in ROUTE_CLASSES.items()}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+    def _has_room(self, state: _ClassState) -> bool:
+        return self.in_flight < max(1, int(self.max_in_flight * state.share))
+
+    def _admit(self, state: _ClassState, delay: float, now: float):
+        self.in_flight += 1
+        state.in_flight += 1
+        admission_in_flight.labels(state.name).set(state.in_flight)
+        admission_queue_seconds.labels(state.name).observe(delay)
+        state.observe(delay, now, self.target, self.interval)
+
+    async def acquire(self, route_class: str) -> bool:
+        """
+        요청을 수락하면 True (처리 후 release 호출), 거절하면 False
+        - 자리가 있고 같은 분류 이상의 대기 요청이 없으면 바로 수락
+        - 그 외에는 대기: 평상시 최대 max_queue초, 과부하 분류는 최대 target초
+        """
+        state = self.classes[route_class]
+        now = self.clock()
+        # 힙의 첫 항목이 가장 높은 우선순위의 대기 요청
+        if self._has_room(state) and not (self._waiters and self._waiters[0].priority <= state.priority):
+            self._admit(state, 0.0, now)
+            state.metrics["admitted"].inc()
+            return True
+        timeout, shed = (self.target, "shed_overloaded") if state.overloaded else (self.max_queue, "shed_timeout")
+        waiter = _Waiter(state.priority, next(self._seq), route_class, now, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiters, waiter)
+        state.metrics["queued"].inc()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                # 대기 시간이 target 이상이므로 이 구간은 과부하로 판정됨
+                state.observe(self.clock() - waiter.enqueued_at, self.clock(), self.target, self.interval)
+                state.metrics[shed].inc()
+                return False
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료 등: 이미 수락됐으면 자리를 돌려줌
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(route_class)
+            elif waiter in self._waiters:
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+        state.metrics["admitted"].inc()
+        return True
+
+    def release(self, route_class: str):
+        """처리가 끝난 요청의 자리를 돌려주고, 우선순위 순서로 대기 요청을 수락합니다."""
+        state = self.classes[route_class]
+        self.in_flight -= 1
+        state.in_flight -= 1
+        admission_in_flight.labels(state.name).set(state.in_flight)
+        now = self.clock()
+        while self._waiters:
+            waiter = self._waiters[0]
+            head = self.classes[waiter.route_class]
+            if not self._has_room(head):
+                # 가장 우선순위가 높은 대기 요청도 자리가 없으면 더 낮은 분류도 없음
+                break
+            heapq.heappop(self._waiters)
+            if waiter.future.done():
+                continue
+            self._admit(head, now - waiter.enqueued_at, now)
+            waiter.future.set_result(True)
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "classes": {
+                name: {"in_flight": state.in_flight, "overloaded": state.overloaded}
+                for name, state in self.classes.items()
+            },
+        }
+
+
+_SHED_BODY = json.dumps({"detail": "Server is overloaded, retry later"}).encode()
+
+
+class AdmissionMiddleware:
+    """요청을 분류해 AdmissionController로 수락 / 거절하는 ASGI 미들웨어"""
+
+    def __init__(self, app, controller: AdmissionController | None = None,
+                 retry_after: int = ADMISSION_RETRY_AFTER_SECONDS):
+        self.app = app
+        self.controller = controller or AdmissionController()
+        self._shed_start = {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-length", str(len(_SHED_BODY)).encode()),
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+        if not await self.controller.acquire(route_class):
+            await send(self._shed_start)
+            await send({"type": "http.response.body", "body": _SHED_BODY})
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route_class)
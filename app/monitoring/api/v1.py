@@ -0,0 +1,71 @@
+# app/monitoring/api/v1.py: 내부 운영용 API 엔드포인트 정의 모듈
+# - GET /internal/metrics: Prometheus text format 메트릭 노출
+# - GET /internal/health/live: 프로세스 생존 확인
+# - GET /internal/health/ready: 시작 작업(캐시 warm-up 등) 완료 후 200, 그 전에는 503
+# - POST /internal/profile: N초 동안 샘플링 프로파일 (collapsed 형식, superuser 전용)
+# - GET /internal/profile/slow: 최근 느린 요청 캡처 목록 (superuser 전용)
+#
+# 내부 엔드포인트이므로 OpenAPI 문서에는 노출하지 않습니다.
+# 외부 공개 여부는 리버스 프록시/네트워크 정책에서 제한해야 합니다.
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+from app.auth.models.user import User
+from app.monitoring.health import readiness
+from app.monitoring.metrics import CONTENT_TYPE, REGISTRY
+from app.monitoring.profiler import PROFILE_MAX_SECONDS, ProfilerBusy, collapse, profiler, slow_request_monitor
+from app.security import get_current_active_superuser
+
+router = APIRouter(
+    prefix="/internal", # API 경로 접두사 설정
+    tags=["internal"],
+    include_in_schema=False,
+)
+
+
+@router.get("/metrics")
+def read_metrics():
+    """Prometheus 스크레이프 엔드포인트"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@router.get("/health/live")
+def read_liveness():
+    """프로세스가 요청을 처리할 수 있으면 항상 200"""
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+def read_readiness():
+    """시작 작업이 모두 끝났으면 200, 아니면 503"""
+    ready = readiness.is_ready
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "starting", "checks": readiness.snapshot()},
+    )
+
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_profile(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(None, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_superuser),
+):
+    """
+    seconds초 동안 모든 스레드를 샘플링해 collapsed 형식(flame graph 입력)으로 반환합니다.
+    - 샘플링은 별도 스레드에서 실행 (이벤트 루프는 계속 요청 처리)
+    - 다른 프로파일이 실행 중이면 409
+    """
+    try:
+        counts, samples = await asyncio.to_thread(profiler.run, seconds, interval_ms)
+    except ProfilerBusy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+    return PlainTextResponse(collapse(counts), headers={"X-Profile-Samples": str(samples)})
+
+
+@router.get("/profile/slow")
+def read_slow_requests(current_user: User = Depends(get_current_active_superuser)):
+    """최근 느린 요청 캡처 (최신순)"""
+    return {"threshold_seconds": slow_request_monitor.threshold, "captures": list(reversed(slow_request_monitor.captures))}
@@ -0,0 +1,45 @@
+# app/monitoring/health.py: 준비 상태(readiness) 관리 모듈
+# - 앱 시작 시 수행되는 작업(캐시 warm-up 등)을 이름으로 등록하고 완료 여부를 추적
+# - 등록된 작업이 모두 끝나야(완료 또는 시간 초과) ready 상태가 됨
+# - GET /internal/health/ready 에서 사용
+
+import threading
+
+
+class Readiness:
+    """시작 작업들의 진행 상태"""
+
+    def __init__(self):
+        self._checks: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add_pending(self, name: str):
+        """완료되기 전까지 readiness를 막는 작업을 등록합니다."""
+        with self._lock:
+            self._checks[name] = {"status": "pending"}
+
+    def mark_done(self, name: str, status: str = "ok", **detail):
+        """
+        작업 완료를 기록합니다.
+        - status: "ok", "timeout", "failed" 등 (어떤 값이든 완료로 간주)
+        - detail: 상태 조회 시 함께 노출할 부가 정보
+        """
+        with self._lock:
+            self._checks[name] = {"status": status, **detail}
+
+    @property
+    def is_ready(self) -> bool:
+        with self._lock:
+            return all(check["status"] != "pending" for check in self._checks.values())
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: dict(check) for name, check in self._checks.items()}
+
+    def reset(self):
+        with self._lock:
+            self._checks.clear()
+
+
+# 프로세스 전역 readiness 상태
+readiness = Readiness()
@@ -0,0 +1,118 @@
+# app/monitoring/middleware.py: 요청 계측 ASGI 미들웨어 모듈
+# - 라우트별 지연시간 히스토그램, 상태코드별 요청 수, 처리 중 요청 수(in-flight)
+# - 요청별 쿼리 수 / DB 소요 시간 히스토그램 (app.monitoring.sql 훅과 연동)
+# - 느린 요청 캡처(app/monitoring/profiler.py)에 요청 시작 / 종료를 알림
+#
+# 라우트 라벨은 실제 경로가 아닌 라우트 템플릿(/shortener/v1/{short_code})을 사용해
+# 라벨 조합 수를 라우트 수로 제한합니다. 앱 시작(lifespan) 시 prime()으로 라벨 조합을 미리 생성합니다.
+
+import time
+
+from fastapi.routing import APIRoute
+
+from app.monitoring.metrics import Counter, Gauge, Histogram
+from app.monitoring.profiler import slow_request_monitor
+from app.monitoring.sql import RequestDBStats, current_db_stats, install_sql_hooks
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_requests_total = Counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")
+)
+http_request_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed"
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("method", "route"),
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 50),
+)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds", "Time spent in SQL per request", ("method", "route")
+)
+
+# 상태코드 숫자 -> 라벨 문자열 캐시 (요청마다 str() 할당을 피함)
+_STATUS_LABELS = {code: str(code) for code in range(100, 600)}
+
+
+class _RouteMetrics:
+    """(method, route) 조합에 해당하는 자식 메트릭 묶음"""
+    __slots__ = ("method", "route", "latency", "db_queries", "db_seconds", "statuses")
+
+    def __init__(self, method: str, route: str):
+        self.method = method
+        self.route = route
+        self.latency = http_request_seconds.labels(method, route)
+        self.db_queries = http_request_db_queries.labels(method, route)
+        self.db_seconds = http_request_db_seconds.labels(method, route)
+        self.statuses = {}
+
+    def status(self, code: int):
+        child = self.statuses.get(code)
+        if child is None:
+            child = http_requests_total.labels(self.method, self.route, _STATUS_LABELS.get(code, str(code)))
+            self.statuses[code] = child
+        return child
+
+
+class MetricsMiddleware:
+    """
+    요청 계측 ASGI 미들웨어
+    - 요청마다 RequestDBStats, send 래퍼 정도만 새로 만들고 나머지는 캐시된 객체 사용
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+        install_sql_hooks()
+
+    def prime(self, routes):
+        """앱의 라우트 목록으로 라벨 조합을 미리 생성합니다."""
+        for route in routes:
+            if isinstance(route, APIRoute):
+                for method in route.methods:
+                    self._route_metrics(method, route.path).status(200)
+
+    def _route_metrics(self, method: str, route: str) -> _RouteMetrics:
+        key = (method, route)
+        metrics = self._routes.get(key)
+        if metrics is None:
+            metrics = self._routes[key] = _RouteMetrics(method, route)
+        return metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            if scope["type"] == "lifespan":
+                self.prime(scope["app"].routes)
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = current_db_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        slow_id = slow_request_monitor.begin(scope["method"], scope["path"], stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            current_db_stats.reset(token)
+
+            route = scope.get("route")
+            slow_request_monitor.end(slow_id, status_code, route.path if route else None)
+            metrics = self._route_metrics(scope["method"], route.path if route else UNMATCHED_ROUTE)
+            metrics.latency.observe(elapsed)
+            metrics.status(status_code).inc()
+            metrics.db_queries.observe(stats.queries)
+            metrics.db_seconds.observe(stats.db_time)
@@ -0,0 +1,256 @@
+# app/monitoring/profiler.py: 샘플링 프로파일러 / 느린 요청 캡처 모듈
+# - 외부 패키지 없이 sys._current_frames()로 모든 스레드의 스택을 주기적으로 읽어 집계
+#   (이벤트 루프 스레드와 동기 엔드포인트가 실행되는 스레드풀 스레드를 함께 봄)
+#   - 출력: collapsed 형식 "스레드;프레임;...;프레임 횟수" 한 줄에 스택 하나
+#     (flamegraph.pl / speedscope / inferno에 그대로 넣어 flame graph로 볼 수 있음)
+#   - 대기 중인 스레드(잠금 / 큐 / selector 대기)는 제외 → 실제로 일하는 스택만 남음
+# - 요청형 프로파일: POST /internal/profile?seconds=N (superuser) → N초 동안 샘플링한 결과를 반환
+#   한 번에 하나만 실행, 최대 PROFILE_MAX_SECONDS초
+# - 느린 요청 캡처: 처리 중 요청이 SLOW_REQUEST_SECONDS를 넘으면 그 요청이 끝날 때까지 샘플링해
+#   경로 / 상태코드 / 소요 시간 / 쿼리 수 / DB 시간과 함께 최근 SLOW_REQUEST_KEEP개를 보관
+#   (GET /internal/profile/slow, 로그에도 한 줄 기록)
+#   - 분당 SLOW_REQUEST_CAPTURES_PER_MINUTE개까지만 캡처 (토큰 버킷, 장애 중 샘플링 부하가 쌓이지 않도록)
+#   - 샘플은 프로세스 전체 스레드 기준: 같은 시각에 느린 요청이 여러 개면 서로의 스택이 섞일 수 있음
+# - 평상시 비용: 요청마다 dict 추가 / 삭제, 감시 스레드는 SLOW_REQUEST_SECONDS / 4마다 깨어나 시간만 비교
+#   (샘플링은 느린 요청이 있거나 프로파일을 요청했을 때만)
+# - SLOW_REQUEST_SECONDS=0이면 느린 요청 캡처 비활성, 스트리밍 경로(SSE)는 항상 제외
+
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter as TallyCounter
+from collections import deque
+from datetime import datetime
+
+from app.monitoring.admission import STREAMING_PATHS
+from app.monitoring.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", 5))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", 1.0))
+SLOW_REQUEST_CAPTURES_PER_MINUTE = float(os.getenv("SLOW_REQUEST_CAPTURES_PER_MINUTE", 6))
+SLOW_REQUEST_KEEP = int(os.getenv("SLOW_REQUEST_KEEP", 20))
+
+profile_runs = Counter("profile_runs_total", "On-demand profiling sessions", labelnames=("result",))
+slow_requests = Counter(
+    "slow_requests_total", "Requests slower than SLOW_REQUEST_SECONDS", labelnames=("result",)
+)
+
+# 잎 프레임이 여기 있는 스레드는 대기 중으로 봄
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py", "thread.py")
+_labels: dict = {}
+
+
+def _frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for prefix in sorted(sys.path, key=len, reverse=True):
+            if prefix and filename.startswith(prefix + os.sep):
+                filename = filename[len(prefix) + 1:]
+                break
+        label = _labels[code] = f"{code.co_qualname} ({filename})"
+    return label
+
+
+def sample_stacks(exclude: set[int] = frozenset(), include_idle: bool = False) -> list[str]:
+    """
+    모든 스레드의 현재 스택을 collapsed 형식 문자열(바깥 → 안쪽, ';'로 연결)로 반환합니다.
+    - exclude: 제외할 스레드 ident (샘플링 스레드 자신)
+    """
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks = []
+    for ident, frame in sys._current_frames().items():
+        if ident in exclude:
+            continue
+        if not include_idle and os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+            continue
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.append(names.get(ident, str(ident)))
+        labels.reverse()
+        stacks.append(";".join(labels))
+    return stacks
+
+
+def collapse(counts: TallyCounter) -> str:
+    """스택별 횟수를 collapsed 형식 텍스트로 (많이 나온 스택부터)"""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class ProfilerBusy(Exception):
+    """다른 프로파일이 이미 실행 중"""
+
+
+class SamplingProfiler:
+    """요청형 프로파일러 (한 번에 하나)"""
+
+    def __init__(self, interval_ms: float = PROFILE_SAMPLE_MS, max_seconds: float = PROFILE_MAX_SECONDS):
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self._running = threading.Lock()
+
+    def run(self, seconds: float, interval_ms: float | None = None) -> tuple[TallyCounter, int]:
+        """
+        호출한 스레드에서 seconds초 동안 샘플링합니다. (호출 스레드 자신은 제외)
+        - 반환: (스택별 횟수, 샘플링 횟수)
+        - 다른 프로파일이 실행 중이면 ProfilerBusy
+        """
+        if not self._running.acquire(blocking=False):
+            profile_runs.labels("busy").inc()
+            raise ProfilerBusy()
+        try:
+            interval = self.interval if interval_ms is None else interval_ms / 1000
+            exclude = {threading.get_ident()}
+            counts: TallyCounter = TallyCounter()
+            samples = 0
+            deadline = time.perf_counter() + min(seconds, self.max_seconds)
+            while time.perf_counter() < deadline:
+                counts.update(sample_stacks(exclude))
+                samples += 1
+                time.sleep(interval)
+            profile_runs.labels("ok").inc()
+            return counts, samples
+        finally:
+            self._running.release()
+
+
+class _InFlight:
+    __slots__ = ("method", "path", "started", "stats", "counts", "samples")
+
+    def __init__(self, method: str, path: str, started: float, stats):
+        self.method = method
+        self.path = path
+        self.started = started
+        self.stats = stats
+        self.counts: TallyCounter | None = None  # 캡처 중이면 스택별 횟수
+        self.samples = 0
+
+
+class SlowRequestMonitor:
+    """
+    느린 요청 캡처
+    - begin / end: 요청 시작 / 종료 때 호출 (MetricsMiddleware)
+    - 감시 스레드는 첫 요청 때 시작
+    """
+
+    def __init__(self, threshold: float = SLOW_REQUEST_SECONDS, per_minute: float = SLOW_REQUEST_CAPTURES_PER_MINUTE,
+                 keep: int = SLOW_REQUEST_KEEP, interval_ms: float = PROFILE_SAMPLE_MS, clock=time.perf_counter):
+        self.threshold = threshold
+        self.rate = per_minute / 60
+        self.burst = max(1.0, per_minute)
+        self.interval = interval_ms / 1000
+        self.clock = clock
+        self.captures: deque[dict] = deque(maxlen=keep)
+        self._tokens = self.burst
+        self._refilled = clock()
+        self._inflight: dict[int, _InFlight] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def begin(self, method: str, path: str, stats=None) -> int | None:
+        if not self.enabled or path in STREAMING_PATHS:
+            return None
+        if self._thread is None:
+            self._start()
+        request_id = next(self._ids)
+        with self._lock:
+            self._inflight[request_id] = _InFlight(method, path, self.clock(), stats)
+        return request_id
+
+    def end(self, request_id: int | None, status: int, route: str | None = None) -> dict | None:
+        """요청이 끝났을 때 호출: 느린 요청이었으면 캡처 결과를 보관하고 반환"""
+        if request_id is None:
+            return None
+        with self._lock:
+            entry = self._inflight.pop(request_id, None)
+            counts = TallyCounter(entry.counts) if entry is not None and entry.counts is not None else None
+        if entry is None:
+            return None
+        elapsed = self.clock() - entry.started
+        if elapsed < self.threshold:
+            return None
+        # 감시 스레드가 보기 전에 끝난 요청은 스택 없이 기록 (토큰은 여기서 사용)
+        if counts is None:
+            if not self._take_token():
+                slow_requests.labels("dropped").inc()
+                return None
+            counts = TallyCounter()
+        slow_requests.labels("captured").inc()
+        capture = {
+            "captured_at": datetime.utcnow().isoformat(),
+            "method": entry.method,
+            "path": entry.path,
+            "route": route,
+            "status": status,
+            "seconds": round(elapsed, 4),
+            "db_queries": entry.stats.queries if entry.stats is not None else None,
+            "db_seconds": round(entry.stats.db_time, 4) if entry.stats is not None else None,
+            "samples": entry.samples,
+            "stacks": collapse(counts),
+        }
+        self.captures.append(capture)
+        top = counts.most_common(1)
+        logger.warning(
+            "slow request %s %s: %.3fs status=%d db_queries=%s samples=%d top=%s",
+            entry.method, entry.path, elapsed, status, capture["db_queries"], entry.samples,
+            top[0][0].rsplit(";", 1)[-1] if top else "-",
+        )
+        return capture
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, name="slow-request-watchdog", daemon=True)
+                self._thread.start()
+
+    def _watch(self):
+        own = {threading.get_ident()}
+        check_interval = self.threshold / 4
+        while True:
+            now = self.clock()
+            capturing = []
+            with self._lock:
+                entries = list(self._inflight.values())
+            for entry in entries:
+                if entry.counts is None and now - entry.started >= self.threshold:
+                    if not self._take_token():
+                        continue
+                    entry.counts = TallyCounter()
+                if entry.counts is not None:
+                    capturing.append(entry)
+            if not capturing:
+                time.sleep(check_interval)
+                continue
+            stacks = sample_stacks(own)
+            with self._lock:
+                for entry in capturing:
+                    entry.counts.update(stacks)
+                    entry.samples += 1
+            time.sleep(self.interval)
+
+
+profiler = SamplingProfiler()
+slow_request_monitor = SlowRequestMonitor()
@@ -0,0 +1,102 @@
+# app/monitoring/sql.py: SQLAlchemy 쿼리 계측 모듈
+# - Engine 클래스 전체에 before/after_cursor_execute 이벤트 훅을 등록
+# - 요청 단위 쿼리 수와 DB 소요 시간을 ContextVar에 누적
+#   (동기 엔드포인트는 스레드풀에서 실행되지만 컨텍스트가 복사되므로 같은 객체를 공유)
+# - 전체 쿼리 수/소요 시간은 프로세스 단위 메트릭으로도 기록
+# - 시작 시각은 커넥션(풀 레코드) info에 쌓이므로 실패한 문장은 handle_error에서 꺼냄
+#   (그대로 두면 풀 커넥션에 남아 이후 측정이 어긋나고 목록이 계속 커짐)
+# - 커넥션 풀 체크아웃 수(사용 중 커넥션)와 요청 세션 사용 여부(get_db의 지연 세션)도 기록
+# - 훅은 앱 시작(lifespan) 때 백그라운드 DB 작업보다 먼저 등록 (install_sql_hooks)
+#   등록 전에 시작된 문장 / 체크아웃된 커넥션은 측정하지 않고 건너뜀 (after 훅만 호출되어도 예외 없음)
+
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from app.monitoring.metrics import Counter, Gauge, Histogram
+
+DB_QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+db_queries_total = Counter("db_queries_total", "Total number of SQL statements executed")
+db_query_seconds = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", buckets=DB_QUERY_BUCKETS
+)
+
+db_connections_in_use = Gauge("db_connections_in_use", "Pooled DB connections currently checked out")
+db_sessions_total = Counter(
+    "db_sessions_total", "Request DB session dependencies, by whether the session was actually used",
+    labelnames=("dependency", "used"),
+)
+
+
+class RequestDBStats:
+    """요청 하나에서 실행된 쿼리 수와 DB 소요 시간"""
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+current_db_stats: ContextVar[RequestDBStats | None] = ContextVar("current_db_stats", default=None)
+
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start_time")
+    if not starts:
+        return  # 훅 등록 전에 시작된 문장
+    _, started = starts.pop()
+    elapsed = time.perf_counter() - started
+    db_queries_total.inc()
+    db_query_seconds.observe(elapsed)
+    stats = current_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+def _handle_error(exception_context):
+    # 실패한 문장의 시작 시각만 꺼냄 (커서 실행 전에 실패했으면 쌓인 것이 없음)
+    conn = exception_context.connection
+    if conn is None:
+        return
+    starts = conn.info.get("query_start_time")
+    if starts and starts[-1][0] is exception_context.execution_context:
+        starts.pop()
+
+
+def _checkout(dbapi_connection, record, proxy):
+    record.info["counted_checkout"] = True
+    db_connections_in_use.inc()
+
+
+def _checkin(dbapi_connection, record):
+    if record.info.pop("counted_checkout", False):
+        db_connections_in_use.dec()
+
+
+def install_sql_hooks():
+    """
+    모든 Engine에 쿼리 계측 훅을 등록합니다.
+    - Engine 클래스에 등록하므로 나중에 생성되는 엔진에도 적용됨
+    - 여러 번 호출해도 한 번만 등록
+    - 앱 시작 때 백그라운드 DB 작업(warm-up, 단축 키 필터 등)보다 먼저 호출
+    """
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    event.listen(Pool, "checkout", _checkout)
+    event.listen(Pool, "checkin", _checkin)
+    _installed = True
@@ -1,4 +1,5 @@
 import os
+import secrets
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -7,7 +8,6 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.auth.models.token import Token
 from app.auth.models.user import User
 from app.db.database import get_db
 from app.auth import crud
@@ -44,7 +44,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def create_refresh_token(data: dict):
     """
     JWT 리프레시 토큰을 생성합니다.
+    - 같은 사용자가 같은 초에 여러 번 로그인해도 토큰 값이 겹치지 않도록 jti를 포함합니다.
     """
+    data = {**data, "jti": secrets.token_hex(8)}
     encoded_jwt = create_access_token(data=data, expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
     return encoded_jwt
 
@@ -62,11 +64,13 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = Token(email=email)
     except JWTError:
         raise credentials_exception
 
-    user = crud.get_user_by_email(db, email=token_data.email)
+    # app.auth.crud.user가 이 모듈을 import 하므로 순환 import를 피하기 위해 함수 안에서 import
+    from app.auth.crud.user import get_user_by_email
+
+    user = get_user_by_email(db, email=email)
     if user is None:
         raise credentials_exception
     return user
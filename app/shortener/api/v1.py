@@ -2,20 +2,28 @@
 # - POST /shorten: 단축 URL 생성
 # - GET /{short_code}: 단축 URL 조회(리디렉션용 원본 URL 반환)
 # - DELETE /{short_code}: 단축 URL 비활성화 처리
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+# - GET /urls/{short_code}, /stats/{short_code}: ETag / Last-Modified 조건부 요청(304) 지원
+# - GET /stats/stream?codes=...: 클릭 수 변경 스트림(SSE), /stats/{short_code}보다 먼저 등록
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from starlette.responses import RedirectResponse
+from starlette.responses import StreamingResponse
+from app.utils.http_cache import conditional_response
 from app.utils.url_valid import is_url_valid
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db, mark_user_write
 
 from app.shortener.crud import *
+from app.shortener.events import link_events
 from app.shortener.models import URL
+from app.shortener.queries import stats_last_modified
+from app.shortener.redirects import redirect_response
+from app.shortener.service import record_click, resolve_redirect
+from app.shortener.stream import STATS_STREAM_MAX_CODES, stats_stream
+from app.shortener.tiering import reactivate_link
 from app.shortener.schemas import *
 
-from app.analytics.crud import log_click
 from app.analytics.models import ClickLog
 
-from app.security import get_current_user
+from app.security import get_current_active_superuser, get_current_user
 from app.auth.models.user import User
 
 router = APIRouter(
@@ -44,43 +52,37 @@ def shorten_url(url: URLCreate,db: Session = Depends(get_db)):
 
     # URL이 유효하면 데이터베이스에 저장
     try:
-        db_url = create_url(db, target_url=url.target_url)
+        db_url = create_url(db, target_url=url.target_url, redirect_code=url.redirect_code)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create URL: {str(e)}"
         )
+    mark_user_write(db)
     
     return db_url
 
 # 단축된 URL을 원본 URL로 리디렉션
 @router.get("/{short_code}")
-def redirect_to_target(short_code: str, request: Request ,db: Session = Depends(get_db)):
+def redirect_to_target(short_code: str, request: Request, db: Session = Depends(get_db),
+                       read_db: Session = Depends(get_read_db)):
     """
     단축 URL 조회 엔드포인트
     - 경로: GET /{short_code}
     - 매개변수: short_code (path)
     - 동작: 단축 키로 URL 조회 후 활성 상태인 경우 원본 URL 반환
+      (리디렉션 캐시에 있으면 urls 테이블 조회 생략, 조회는 읽기 복제본 / 클릭 기록은 primary)
+      (단축 키 필터에 확실히 없는 키는 urls 테이블 조회 없이 404)
+      (REDIRECT_SOURCE=edge: 스냅샷만 조회, fallback: DB 장애 시 스냅샷 조회 - 두 경우 모두 클릭 미기록)
+    - 응답: 링크별 / 전역 리디렉션 정책에 따른 301/302/307/308 + Cache-Control (app/shortener/redirects.py)
     - 에러: URL 미존재 또는 비활성 시 HTTP 404 예외
     """
-    url = db.query(URL)\
-            .filter(URL.short_code == short_code, URL.is_active)\
-            .first()
-    if not url:
+    redirect, count_click = resolve_redirect(short_code, read_db)
+    if redirect is None:
         raise HTTPException(status_code=404, detail="URL not found")
-    
-    # 클릭 로그 기록
-    log_click(
-        db=db,
-        code=short_code,
-        client_ip=request.client.host,
-        user_agent=request.headers.get("user-agent")
-    )
-
-    # 클릭 수 증가
-    url.clicks += 1
-    db.commit()
-    return RedirectResponse(url.target_url)
+    if count_click:
+        record_click(db, short_code, request.client.host, request.headers.get("user-agent"))
+    return redirect_response(*redirect)
 
 # URL 비활성화 엔드포인트
 @router.delete("/{short_code}")
@@ -96,37 +98,99 @@ def deactivate_url(short_code: str, db: Session = Depends(get_db)):
     db_url = deactivate_url_from_db(db=db, short_code=short_code)
     if db_url is None:
         raise HTTPException(status_code=404, detail="URL not found")
+    mark_user_write(db)
+    link_events.invalidate([short_code])
     return {"message": "URL successfully deactivated"}
 
+# URL 대량 비활성화 엔드포인트
+@router.post("/deactivate", response_model=BulkDeactivateResponse)
+def bulk_deactivate(request: BulkDeactivateRequest, db: Session = Depends(get_db),
+                    current_user: User = Depends(get_current_active_superuser)):
+    """
+    URL 대량 비활성화 엔드포인트 (신고 / 차단 목록 처리, superuser 전용)
+    - 경로: POST /deactivate
+    - 요청 바디: BulkDeactivateRequest(short_codes, target_url_prefix, host)
+    - 동작: BULK_DEACTIVATE_CHUNK개씩 UPDATE ... RETURNING 한 번으로 비활성화, 청크마다 캐시 무효화
+      (접두사 / 호스트 일치 링크는 요청당 BULK_DEACTIVATE_MAX_MATCHES개까지)
+    - 반환: 비활성화한 키 / 존재하지 않는 키 목록 / 남은 일치 링크가 있는지(truncated)
+    - 에러: 인증 실패 시 401, superuser가 아니면 400
+    """
+    deactivated, not_found, truncated = bulk_deactivate_urls(
+        db, request.short_codes, target_url_prefix=request.target_url_prefix, host=request.host
+    )
+    if deactivated:
+        mark_user_write(db)
+    return BulkDeactivateResponse(deactivated=deactivated, not_found=not_found, truncated=truncated)
+
+# URL 재활성화 엔드포인트
+@router.post("/{short_code}/activate")
+def activate_url(short_code: str, db: Session = Depends(get_db),
+                 current_user: User = Depends(get_current_active_superuser)):
+    """
+    URL 재활성화 엔드포인트 (차단 해제, superuser 전용)
+    - 경로: POST /{short_code}/activate
+    - 동작: URL의 is_active를 1로 변경 (보관된 링크는 urls 테이블로 되돌린 뒤 활성화)
+    - 반환: 성공 메시지 JSON
+    - 에러: 키 미존재 시 HTTP 404 예외 발생, 인증 실패 시 401, superuser가 아니면 400
+    """
+    if reactivate_link(db, short_code) is None:
+        raise HTTPException(status_code=404, detail="URL not found")
+    mark_user_write(db)
+    return {"message": "URL successfully activated"}
+
 # URL 클릭 정보 조회
 @router.get("/urls/{short_code}")
-def get_click_info(short_code: str, db: Session = Depends(get_db)):
+def get_click_info(short_code: str, request: Request, db: Session = Depends(get_read_db)):
     """
     단축 URL 클릭 정보 조회
     - 경로: GET /urls/{short_code}
     - 매개변수: short_code (path)
-    - 반환: target_url, clicks, is_active
+    - 반환: target_url, clicks, is_active (ETag / Last-Modified 포함, 변경 없으면 304)
     """
-    url = db.query(URL).filter(URL.short_code == short_code).first()
+    url = get_url_stats_from_db(db=db, short_code=short_code)
 
     if not url:
         raise HTTPException(status_code=404, detail="URL not found")
 
-    return {
+    return conditional_response(request, {
         "target_url": url.target_url,
         "clicks": url.clicks,
         "is_active": url.is_active
-    }
+    }, last_modified=stats_last_modified(url))
+
+# 클릭 수 스트림 (경로가 /stats/{short_code}와 겹치므로 먼저 등록)
+@router.get("/stats/stream")
+async def stream_url_stats(
+    codes: str = Query(..., description="쉼표로 구분한 단축 키 목록"),
+    limit: int | None = Query(None, ge=1, description="이 수만큼 이벤트를 보낸 뒤 종료 (keepalive 제외)"),
+):
+    """
+    클릭 수 변경 스트림 (Server-Sent Events)
+    - 경로: GET /stats/stream?codes=abc,def
+    - 첫 이벤트(snapshot)는 현재 합계, 이후(clicks)는 tick마다 바뀐 키의 합계와 증가량
+    - 키가 없거나 STATS_STREAM_MAX_CODES개를 넘으면 422, 워커의 구독 수가 한도면 503
+    """
+    short_codes = {code.strip() for code in codes.split(",") if code.strip()}
+    if not short_codes or len(short_codes) > STATS_STREAM_MAX_CODES:
+        raise HTTPException(status_code=422, detail=f"Subscribe to 1-{STATS_STREAM_MAX_CODES} short codes")
+    if stats_stream.full:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers", headers={"Retry-After": "5"})
+    return StreamingResponse(
+        stats_stream.events(short_codes, limit),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 # URL 통계 조회 (클릭 수 등)
 @router.get("/stats/{short_code}", response_model=URLStats)
-def get_url_stats(short_code: str, db: Session = Depends(get_db)):
+def get_url_stats(short_code: str, request: Request, db: Session = Depends(get_read_db)):
     """
     단축 URL 통계 조회
     - 경로: GET /stats/{short_code}
-    - 반환: target_url, clicks, is_active
+    - 반환: target_url, clicks, is_active (ETag / Last-Modified 포함, 변경 없으면 304)
     """
     db_url = get_url_stats_from_db(db=db, short_code=short_code)
     if not db_url:
         raise HTTPException(status_code=404, detail="URL not found")
-    return db_url
\ No newline at end of file
+    stats = URLStats.model_validate(db_url, from_attributes=True)
+    return conditional_response(request, stats.model_dump(), last_modified=stats_last_modified(db_url))
\ No newline at end of file
@@ -0,0 +1,79 @@
+# app/shortener/cache.py: 리디렉션 조회용 프로세스 내 캐시 모듈
+# - 단축 키 -> 원본 URL(+ 리디렉션 정책) 매핑을 크기 제한(LRU)과 TTL을 두고 보관
+# - redirect_to_target이 urls 테이블을 조회하기 전에 먼저 확인
+# - 앱 시작 시 warmup 모듈이 인기 링크를 미리 채움
+#
+# 워커(프로세스)마다 따로 존재하므로, 다른 워커에서 비활성화된 링크는
+# 최대 TTL 동안 캐시에 남을 수 있습니다. (REDIRECT_CACHE_TTL_SECONDS로 조정)
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import NamedTuple
+
+REDIRECT_CACHE_SIZE = int(os.getenv("REDIRECT_CACHE_SIZE", 10000))
+REDIRECT_CACHE_TTL_SECONDS = float(os.getenv("REDIRECT_CACHE_TTL_SECONDS", 60))
+
+
+class CachedRedirect(NamedTuple):
+    """리디렉션 응답을 만드는 데 필요한 URL 정보"""
+    target_url: str
+    redirect_code: int | None = None
+    expires_at: datetime | None = None
+
+
+class RedirectCache:
+    """
+    크기 제한 LRU + TTL 캐시
+    - max_entries: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+    - ttl: 항목 유효 시간(초)
+    """
+
+    def __init__(self, max_entries: int = REDIRECT_CACHE_SIZE, ttl: float = REDIRECT_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[CachedRedirect, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, short_code: str) -> CachedRedirect | None:
+        """캐시된 리디렉션 정보를 반환합니다. 없거나 만료되었으면 None"""
+        with self._lock:
+            entry = self._entries.get(short_code)
+            if entry is None:
+                return None
+            redirect, stale_at = entry
+            if stale_at < time.monotonic():
+                del self._entries[short_code]
+                return None
+            self._entries.move_to_end(short_code)
+            return redirect
+
+    def put(self, short_code: str, target_url: str, redirect_code: int | None = None,
+            expires_at: datetime | None = None):
+        if self.max_entries <= 0:
+            return
+        redirect = CachedRedirect(target_url, redirect_code, expires_at)
+        with self._lock:
+            self._entries[short_code] = (redirect, time.monotonic() + self.ttl)
+            self._entries.move_to_end(short_code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *short_codes: str):
+        """비활성화 등으로 더 이상 유효하지 않은 항목을 제거합니다."""
+        with self._lock:
+            for short_code in short_codes:
+                self._entries.pop(short_code, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 프로세스 전역 리디렉션 캐시
+redirect_cache = RedirectCache()
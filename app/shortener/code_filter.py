@@ -0,0 +1,278 @@
+# app/shortener/code_filter.py: 발급된 단축 키 Bloom 필터 모듈
+# - 앱 시작 시 urls 테이블(또는 스냅샷 파일 + 이후 생성분)로 필터를 만들고, 생성 시 추가
+# - redirect_to_target: 필터에 "확실히 없음"인 키는 DB 조회 없이 404 (스캐너 / 오타 트래픽)
+# - generate_short_code: 필터에 없는 키는 DB 확인 없이 사용 (경합 시 create_url이 재시도)
+# - 다른 워커가 만든 키는 DB가 발급하는 id 기준으로 주기적으로 따라잡음(sync)
+#   필터에 없는 키를 조회하면 마지막 sync가 BLOOM_SYNC_INTERVAL_SECONDS보다 오래됐을 때 먼저 sync
+#   → 다른 워커가 방금 만든 링크는 최대 이 시간 동안 404가 될 수 있음
+#   - created_at은 앱이 객체를 만들 때 각 워커의 시계로 채우므로 워터마크로 쓰지 않음
+#     (시계가 어긋난 워커나 늦게 커밋된 행이 워터마크 뒤에 들어가 영구 404가 됨)
+#   - id도 커밋 순서와 같지는 않으므로, 매번 이 워커의 시계로 BLOOM_SYNC_OVERLAP_SECONDS 전에 본
+#     최대 id 이후부터 다시 읽음 (INSERT 후 이 시간 안에 커밋된 행은 놓치지 않음)
+#   - 샤딩 중에는 샤드마다 id가 따로 발급되므로 샤드별로 따라잡음
+# - BLOOM_SNAPSHOT_PATH가 설정되면 종료 시 / 생성 직후 파일로 저장하고, 다른 워커는 이를 읽어 빠르게 시작
+# - 비활성화된 링크도 발급된 키이므로 필터에 남음 (삭제 불필요)
+#   보관 테이블(archived_urls)로 옮겨진 링크도 처음 만들 때 보관 테이블까지 읽어 포함
+#   (urls에서 옮겨지기 전에 이미 필터에 들어 있으므로 이후 따라잡기(sync)는 urls만 읽음)
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.horizontal_shard import set_shard_id
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal, get_engine, get_shard_engines, is_sharded
+from app.db.sharding import GLOBAL_SHARD
+from app.monitoring.health import readiness
+from app.monitoring.metrics import Counter, Gauge
+from app.shortener.models import URL, ArchivedURL
+from app.utils.bloom import ScalableBloomFilter
+
+logger = logging.getLogger(__name__)
+
+BLOOM_ENABLED = os.getenv("BLOOM_ENABLED", "1").lower() in ("1", "true", "yes")
+BLOOM_INITIAL_CAPACITY = int(os.getenv("BLOOM_INITIAL_CAPACITY", 100_000))
+BLOOM_ERROR_RATE = float(os.getenv("BLOOM_ERROR_RATE", 0.001))
+BLOOM_SNAPSHOT_PATH = os.getenv("BLOOM_SNAPSHOT_PATH", "")
+BLOOM_SYNC_INTERVAL_SECONDS = float(os.getenv("BLOOM_SYNC_INTERVAL_SECONDS", 1))
+# 커밋이 늦게 된 행을 놓치지 않도록 이 시간(이 워커의 시계 기준) 전에 본 최대 id 이후부터 다시 읽음
+BLOOM_SYNC_OVERLAP_SECONDS = float(os.getenv("BLOOM_SYNC_OVERLAP_SECONDS", 5))
+BLOOM_BATCH_SIZE = int(os.getenv("BLOOM_BATCH_SIZE", 10_000))
+
+READINESS_CHECK = "short_code_filter"
+
+filter_checks = Counter(
+    "short_code_filter_checks_total", "Short code Bloom filter lookups", labelnames=("result",)
+)
+filter_false_positives = Counter(
+    "short_code_filter_false_positives_total", "Filter said maybe-present but the code does not exist"
+)
+filter_items = Gauge("short_code_filter_items", "Short codes in the Bloom filter")
+filter_expected_fp_rate = Gauge("short_code_filter_expected_fp_rate", "Expected Bloom filter false-positive rate")
+filter_size_bytes = Gauge("short_code_filter_size_bytes", "Bloom filter bit array size")
+
+
+class ShortCodeFilter:
+    """
+    발급된 단축 키 집합의 Bloom 필터
+    - 필터가 준비되기 전(ready=False)에는 모든 키가 있을 수 있다고 답함 (DB 조회로 처리)
+    """
+
+    def __init__(self, initial_capacity: int = BLOOM_INITIAL_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.bloom: ScalableBloomFilter | None = None
+        # 소스(샤드)별 [(확인 시각(monotonic), 그때까지 본 최대 id), ...] - 오래된 것부터
+        self._checkpoints: dict[str, list[tuple[float, int]]] = {}
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.bloom is not None
+
+    def might_exist(self, short_code: str, record: bool = True) -> bool:
+        """
+        키가 발급되었을 수 있으면 True, 확실히 없으면 False
+        - record: 조회 결과를 메트릭에 기록할지 여부
+        """
+        bloom = self.bloom
+        if bloom is None:
+            return True
+        found = short_code in bloom
+        if record:
+            filter_checks.labels("positive" if found else "negative").inc()
+        return found
+
+    def record_false_positive(self):
+        filter_false_positives.inc()
+
+    def add(self, short_code: str):
+        bloom = self.bloom
+        if bloom is not None:
+            with self._lock:
+                bloom.add(short_code)
+
+    def build(self, db: Session, snapshot_path: str = BLOOM_SNAPSHOT_PATH, batch_size: int = BLOOM_BATCH_SIZE) -> dict:
+        """
+        필터를 만듭니다. 스냅샷이 있으면 읽고 이후 생성분만, 없으면 테이블 전체(보관된 링크 포함)를 읽음
+        - 반환: {"items": 항목 수, "from_snapshot": 스냅샷 사용 여부, "elapsed": 소요 시간}
+        """
+        started = time.monotonic()
+        bloom, marks = load_snapshot(snapshot_path) if snapshot_path else (None, {})
+        from_snapshot = bloom is not None
+        if bloom is None:
+            bloom = ScalableBloomFilter(self.initial_capacity, self.error_rate)
+            self._add_archived(db, bloom, batch_size)
+        marks = self._catch_up(db, bloom, marks, batch_size)
+        with self._lock:
+            # 스냅샷의 id는 언제 본 것인지 모르므로 읽기 시작 시각의 확인 지점으로 기록
+            self.bloom = bloom
+            self._checkpoints = {source: [(started, mark)] for source, mark in marks.items()}
+            self._last_sync = time.monotonic()
+        self._update_gauges()
+        if snapshot_path:
+            self.save_snapshot(snapshot_path)
+        return {"items": len(bloom), "from_snapshot": from_snapshot,
+                "elapsed": round(time.monotonic() - started, 3)}
+
+    def sync(self, db: Session, force: bool = False) -> bool:
+        """
+        다른 워커가 만든 키를 따라잡습니다. (BLOOM_SYNC_INTERVAL_SECONDS 간격으로 제한)
+        - 반환: sync를 실행했으면 True
+        """
+        bloom = self.bloom
+        if bloom is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_sync < BLOOM_SYNC_INTERVAL_SECONDS:
+                return False
+            self._last_sync = now
+            since = {source: self._floor(source, now) for source in self._checkpoints}
+        marks = self._catch_up(db, bloom, since, BLOOM_BATCH_SIZE)
+        with self._lock:
+            for source, mark in marks.items():
+                checkpoints = self._checkpoints.setdefault(source, [])
+                if checkpoints:
+                    mark = max(mark, checkpoints[-1][1])
+                checkpoints.append((now, mark))
+        self._update_gauges()
+        return True
+
+    def _floor(self, source: str, now: float) -> int:
+        """
+        다시 읽기 시작할 id: BLOOM_SYNC_OVERLAP_SECONDS 전까지의 확인 지점 중 가장 최근 것의 id
+        (그보다 오래된 확인 지점은 버림, 아직 없으면 가장 오래된 확인 지점)
+        """
+        checkpoints = self._checkpoints[source]
+        cutoff = now - BLOOM_SYNC_OVERLAP_SECONDS
+        keep = 0
+        for index, (checked_at, _) in enumerate(checkpoints):
+            if checked_at > cutoff:
+                break
+            keep = index
+        del checkpoints[:keep]
+        return checkpoints[0][1]
+
+    def _catch_up(self, db: Session, bloom: ScalableBloomFilter, since: dict[str, int],
+                  batch_size: int) -> dict[str, int]:
+        """
+        소스(샤드)별로 since의 id보다 큰 행(없는 소스는 전체)을 필터에 넣습니다.
+        - 반환: 소스별 지금까지 본 최대 id
+        """
+        marks = {}
+        for source in _sources():
+            mark = since.get(source)
+            statement = select(URL.short_code, URL.id)
+            if mark is not None:
+                statement = statement.where(URL.id > mark)
+            if source != GLOBAL_SHARD:
+                statement = statement.options(set_shard_id(source))
+            result = db.execute(statement.execution_options(yield_per=batch_size))
+            for batch in result.partitions():
+                with self._lock:
+                    for short_code, url_id in batch:
+                        bloom.add(short_code)
+                        if mark is None or url_id > mark:
+                            mark = url_id
+            result.close()
+            marks[source] = mark if mark is not None else 0
+        return marks
+
+    def _add_archived(self, db: Session, bloom: ScalableBloomFilter, batch_size: int):
+        result = db.execute(select(ArchivedURL.short_code).execution_options(yield_per=batch_size))
+        for batch in result.partitions():
+            with self._lock:
+                for (short_code,) in batch:
+                    bloom.add(short_code)
+        result.close()
+
+    def _update_gauges(self):
+        bloom = self.bloom
+        if bloom is not None:
+            filter_items.set(len(bloom))
+            filter_expected_fp_rate.set(bloom.expected_fp_rate())
+            filter_size_bytes.set(bloom.size_bytes)
+
+    def save_snapshot(self, path: str = BLOOM_SNAPSHOT_PATH):
+        """필터를 파일로 저장합니다. (임시 파일에 쓴 뒤 교체해 읽는 쪽이 깨진 파일을 보지 않음)"""
+        if not path or self.bloom is None:
+            return
+        with self._lock:
+            data = self.bloom.to_bytes()
+            marks = {source: checkpoints[-1][1] for source, checkpoints in self._checkpoints.items() if checkpoints}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(marks).encode("ascii") + b"\n" + data)
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self.bloom = None
+            self._checkpoints = {}
+            self._last_sync = 0.0
+
+
+def _sources() -> list[str]:
+    """id를 따로 발급하는 소스: 샤딩 중이면 샤드 ID 목록, 아니면 global 하나"""
+    if is_sharded():
+        return [shard_id for shard_id in get_shard_engines() if shard_id != GLOBAL_SHARD]
+    return [GLOBAL_SHARD]
+
+
+def load_snapshot(path: str) -> tuple[ScalableBloomFilter | None, dict[str, int]]:
+    """
+    스냅샷 파일을 읽습니다. 없거나 손상되었으면 (None, {})
+    - 반환: (필터, 소스별 반영된 최대 id)
+    - 이전 형식(created_at 워터마크) 스냅샷은 손상된 것으로 보고 다시 만듦
+    """
+    try:
+        with open(path, "rb") as f:
+            header, data = f.read().split(b"\n", 1)
+        marks = json.loads(header)
+        if not isinstance(marks, dict) or not all(isinstance(mark, int) for mark in marks.values()):
+            raise ValueError("bad snapshot header")
+        return ScalableBloomFilter.from_bytes(data), marks
+    except FileNotFoundError:
+        return None, {}
+    except (ValueError, OSError):
+        logger.warning("ignoring unreadable short code filter snapshot %s", path)
+        return None, {}
+
+
+# 프로세스 전역 단축 키 필터
+code_filter = ShortCodeFilter()
+
+
+def build_code_filter() -> dict:
+    get_engine()
+    with SessionLocal() as db:
+        return code_filter.build(db)
+
+
+def start_code_filter() -> asyncio.Task | None:
+    """
+    lifespan에서 호출: 필터 생성을 백그라운드 태스크로 시작합니다.
+    - 생성되기 전에는 기존처럼 DB 조회로 동작하므로 readiness를 막지 않음 (상태만 노출)
+    """
+    if not BLOOM_ENABLED:
+        readiness.mark_done(READINESS_CHECK, status="disabled")
+        return None
+    readiness.mark_done(READINESS_CHECK, status="building")
+    return asyncio.create_task(_run_build())
+
+
+async def _run_build():
+    try:
+        summary = await asyncio.to_thread(build_code_filter)
+    except Exception:
+        logger.exception("short code filter build failed")
+        readiness.mark_done(READINESS_CHECK, status="failed")
+    else:
+        readiness.mark_done(READINESS_CHECK, status="ok", **summary)
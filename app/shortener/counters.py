@@ -0,0 +1,157 @@
+# app/shortener/counters.py: 클릭 수 분산 카운터 모듈
+# - 인기 링크는 모든 리디렉션이 urls 행 하나를 UPDATE하므로 행 락에서 직렬화됨
+#   → 링크마다 CLICK_COUNTER_SLOTS개의 url_click_counters 행을 두고 클릭마다 무작위 slot 하나만 증가
+# - 읽기: urls.clicks + SUM(url_click_counters.n) (app/shortener/queries.py)
+# - 접기(fold): 주기적으로 slot 값을 urls.clicks로 옮김 (CLICK_COUNTER_FOLD_SECONDS 간격, 0이면 비활성)
+#   - slot 감소(`n >= 읽은 값` 조건)와 urls.clicks 증가를 같은 트랜잭션에서 수행
+#     → 여러 워커가 동시에 접어도 같은 클릭을 두 번 옮기지 않음
+#   - 합계는 바뀌지 않으므로 updated_at(Last-Modified)은 유지
+# - 봇 클릭(app/analytics/bots.py)은 같은 행의 bots 컬럼에 쌓았다가 urls.bot_clicks로 접음
+# - 카운터 행이 없는 링크(이전에 만든 링크, CLICK_COUNTER_SLOTS=0)는 urls.clicks를 직접 증가
+#
+# 사용 예:
+#   python -m app.shortener.counters fold
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.shortener.models import URL, URLClickCounter
+
+logger = logging.getLogger(__name__)
+
+CLICK_COUNTER_SLOTS = int(os.getenv("CLICK_COUNTER_SLOTS", 8))
+CLICK_COUNTER_FOLD_SECONDS = float(os.getenv("CLICK_COUNTER_FOLD_SECONDS", 60))
+CLICK_COUNTER_FOLD_BATCH = int(os.getenv("CLICK_COUNTER_FOLD_BATCH", 1000))
+
+_NO_SYNC = {"synchronize_session": False}
+
+
+def counter_rows(short_code: str, slots: int | None = None) -> list[URLClickCounter]:
+    """새 링크의 카운터 행 (create_url에서 링크와 함께 저장)"""
+    slots = CLICK_COUNTER_SLOTS if slots is None else slots
+    return [URLClickCounter(short_code=short_code, slot=slot, n=0, bots=0) for slot in range(slots)]
+
+
+def increment(db: Session, short_code: str, slots: int | None = None, bot: bool = False, amount: int = 1) -> bool:
+    """
+    무작위 slot의 카운터를 amount(기본 1)만큼 증가시킵니다. (커밋은 호출자가 수행)
+    - bot: True면 봇 클릭 카운터(bots)를 증가
+    - 반환: 증가했으면 True, 해당 slot 행이 없으면 False (호출자가 urls.clicks를 직접 증가)
+    """
+    slots = CLICK_COUNTER_SLOTS if slots is None else slots
+    if slots <= 0:
+        return False
+    column = "bots" if bot else "n"
+    result = db.execute(
+        update(URLClickCounter)
+        .where(URLClickCounter.short_code == short_code, URLClickCounter.slot == random.randrange(slots))
+        .values({column: getattr(URLClickCounter, column) + amount}),
+        execution_options=_NO_SYNC,
+    )
+    return result.rowcount > 0
+
+
+def _fold_code(db: Session, short_code: str, slots: list[tuple[int, int, int]]) -> tuple[int, int]:
+    """한 링크의 slot 값(slot, n, bots)을 urls로 옮깁니다. 반환: (옮긴 클릭 수, 옮긴 봇 클릭 수)"""
+    taken = taken_bots = 0
+    for slot, n, bots in slots:
+        result = db.execute(
+            update(URLClickCounter)
+            .where(URLClickCounter.short_code == short_code, URLClickCounter.slot == slot,
+                   URLClickCounter.n >= n, URLClickCounter.bots >= bots)
+            .values(n=URLClickCounter.n - n, bots=URLClickCounter.bots - bots,
+                    updated_at=URLClickCounter.updated_at),
+            execution_options=_NO_SYNC,
+        )
+        if result.rowcount:
+            taken += n
+            taken_bots += bots
+    if taken or taken_bots:
+        db.execute(
+            update(URL)
+            .where(URL.short_code == short_code)
+            .values(clicks=func.coalesce(URL.clicks, 0) + taken,
+                    bot_clicks=func.coalesce(URL.bot_clicks, 0) + taken_bots, updated_at=URL.updated_at),
+            execution_options=_NO_SYNC,
+        )
+    return taken, taken_bots
+
+
+def fold_click_counters(db: Session, batch_size: int = CLICK_COUNTER_FOLD_BATCH) -> dict:
+    """
+    카운터 값을 urls.clicks / urls.bot_clicks로 옮깁니다. (배치마다 커밋)
+    - 반환: {"links": 접은 링크 수, "clicks": 옮긴 클릭 수, "bot_clicks": 옮긴 봇 클릭 수}
+    """
+    links: set[str] = set()
+    clicks = bot_clicks = 0
+    while True:
+        rows = db.execute(
+            select(URLClickCounter.short_code, URLClickCounter.slot, URLClickCounter.n, URLClickCounter.bots)
+            .where(or_(URLClickCounter.n > 0, URLClickCounter.bots > 0))
+            .order_by(URLClickCounter.short_code, URLClickCounter.slot)
+            .limit(batch_size)
+        ).all()
+        by_code: dict[str, list[tuple[int, int, int]]] = {}
+        for short_code, slot, n, bots in rows:
+            by_code.setdefault(short_code, []).append((slot, n, bots))
+        folded = 0
+        for short_code, slots in by_code.items():
+            taken, taken_bots = _fold_code(db, short_code, slots)
+            if taken or taken_bots:
+                links.add(short_code)
+                clicks += taken
+                bot_clicks += taken_bots
+                folded += taken + taken_bots
+        db.commit()
+        # 마지막 페이지이거나, 계속 증가 중인 행만 남아 진행이 없으면 다음 주기로 넘김
+        if len(rows) < batch_size or not folded:
+            return {"links": len(links), "clicks": clicks, "bot_clicks": bot_clicks}
+
+
+def run_fold() -> dict:
+    from app.db.database import SessionLocal, get_engine
+
+    get_engine()
+    with SessionLocal() as db:
+        return fold_click_counters(db)
+
+
+def start_counter_fold() -> asyncio.Task | None:
+    """lifespan에서 호출: 카운터 접기 작업을 주기적으로 실행하는 태스크를 시작합니다."""
+    if CLICK_COUNTER_FOLD_SECONDS <= 0:
+        return None
+    return asyncio.create_task(_fold_loop())
+
+
+async def _fold_loop():
+    while True:
+        await asyncio.sleep(CLICK_COUNTER_FOLD_SECONDS)
+        try:
+            summary = await asyncio.to_thread(run_fold)
+        except Exception:
+            logger.exception("click counter fold failed")
+        else:
+            if summary["clicks"]:
+                logger.info("folded %(clicks)d clicks from %(links)d links", summary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fold sharded click counters into urls.clicks")
+    parser.add_argument("command", choices=("fold",))
+    parser.parse_args(argv)
+    started = time.perf_counter()
+    summary = run_fold()
+    summary["elapsed"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,62 @@
 # app/crud.py: 데이터베이스 CRUD 로직 모듈
 # - URL 단축 키 생성, URL 생성/조회/비활성화 함수 정의
+# - 대량 비활성화: 단축 키 목록 / 원본 URL 접두사 / 호스트로 지정, 청크마다 UPDATE ... RETURNING 한 번
+#   (접두사 / 호스트로 찾은 링크는 요청당 BULK_DEACTIVATE_MAX_MATCHES개까지, 나머지는 다시 요청해 처리)
+# - 리디렉션 / 통계 조회는 같은 DB(세션이 연결된 엔진)에 대한 같은 단축 키의 동시 조회를 하나로 병합
+#   (app/utils/singleflight.py, 복제본에서 읽는 요청과 primary에서 읽는 요청은 결과를 공유하지 않음)
 
+import hashlib
+import os
 import random
 import string
 import secrets
+from urllib.parse import urlsplit
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.shortener.models import URL
+from app.shortener.code_filter import code_filter
+from app.shortener.counters import counter_rows, increment
+from app.shortener.events import link_events
+from app.shortener.models import URL, ArchivedURL, URLTarget
+from app.shortener.queries import find_archived_redirect, find_archived_stats, find_redirect, find_url_stats
+from app.utils.singleflight import SingleFlight
+
+# 단축 키 충돌(다른 워커가 같은 키를 먼저 저장) 시 create_url 재시도 횟수
+CREATE_URL_ATTEMPTS = 5
+# 대량 비활성화 시 UPDATE 한 번(한 트랜잭션)에 넣는 단축 키 수
+BULK_DEACTIVATE_CHUNK = int(os.getenv("BULK_DEACTIVATE_CHUNK", 1000))
+# 대량 비활성화 요청 한 번에 원본 URL 접두사 / 호스트로 찾아 비활성화하는 최대 링크 수
+BULK_DEACTIVATE_MAX_MATCHES = int(os.getenv("BULK_DEACTIVATE_MAX_MATCHES", 10_000))
+# 같은 단축 키 조회를 기다리는 최대 시간 (넘으면 직접 조회)
+LOOKUP_SINGLEFLIGHT_TIMEOUT = float(os.getenv("LOOKUP_SINGLEFLIGHT_TIMEOUT", 2))
+
+_redirect_lookups = SingleFlight("redirect_lookup", timeout=LOOKUP_SINGLEFLIGHT_TIMEOUT)
+_stats_lookups = SingleFlight("stats_lookup", timeout=LOOKUP_SINGLEFLIGHT_TIMEOUT)
+
+def target_hash(target_url: str) -> str:
+    """원본 URL의 sha256 해시 (url_targets 기본 키 / 샤드 키)"""
+    return hashlib.sha256(target_url.encode("utf-8")).hexdigest()
 
 def generate_short_code(db: Session, length: int = 6) -> str:
     """
     지정된 길이의 무작위 단축 키를 생성합니다.
     - length: 생성할 키의 길이 (기본값 6)
     - 반환: 영문 대소문자와 숫자로 구성된 문자열
+    단축 키 필터가 준비되어 있으면 DB 대신 필터로 확인합니다.
+    (필터에 있을 수도 있는 키는 새로 생성, 필터에 아직 없는 다른 워커의 키와 겹치면 저장 시 충돌 → 재시도)
+    DB로 확인할 때는 보관된 링크(archived_urls)의 키도 한 쿼리(UNION)로 함께 확인합니다.
     """
     while True:
         key = secrets.token_urlsafe(length)[:length]
-        exists = db.query(URL).filter_by(short_code=key).first()
+        if code_filter.ready:
+            if not code_filter.might_exist(key, record=False):
+                return key
+            continue
+        exists = db.execute(
+            select(URL.short_code).where(URL.short_code == key)
+            .union_all(select(ArchivedURL.short_code).where(ArchivedURL.short_code == key))
+        ).first()
         if not exists:
             return key
 
@@ -25,14 +66,20 @@ def get_url_by_target_url(db: Session, target_url: str) -> URL:
     - db: SQLAlchemy 세션
     - target_url: 조회할 원본 URL 문자열
     - 반환: URL 모델 객체 또는 None
+    url_targets(원본 URL 해시 -> 단축 키)로 단축 키를 찾은 뒤 해당 URL을 조회합니다.
+    (샤딩 시 두 조회 모두 한 샤드로만 라우팅됨)
     """
-    return db.query(URL).filter(URL.target_url == target_url).first()
+    db_target = db.query(URLTarget).filter(URLTarget.target_hash == target_hash(target_url)).first()
+    if db_target is None or db_target.target_url != target_url:
+        return None
+    return get_url(db, db_target.short_code)
 
-def create_url(db: Session, target_url: str) -> URL:
+def create_url(db: Session, target_url: str, redirect_code: int | None = None) -> URL:
     """
     새 URL 레코드를 생성하고 단축 키를 자동으로 할당합니다.
     - db: SQLAlchemy 세션
     - target_url: 단축할 원본 URL 문자열
+    - redirect_code: 링크별 리디렉션 상태 코드 (None이면 서버 기본값, 기존 URL에는 적용하지 않음)
     동작:
       1. 이미 존재하는 URL인지 확인
       2. 존재하면 해당 URL 반환
@@ -43,13 +90,26 @@ def create_url(db: Session, target_url: str) -> URL:
     existing_url = get_url_by_target_url(db, target_url=target_url)
     if existing_url:
         return existing_url
-        
-    short_code = generate_short_code(db=db)
-    db_url = URL(target_url=target_url, short_code=short_code)
-    db.add(db_url)
-    db.commit()
-    db.refresh(db_url)
-    return db_url
+
+    for _ in range(CREATE_URL_ATTEMPTS):
+        short_code = generate_short_code(db=db)
+        db_url = URL(target_url=target_url, short_code=short_code, redirect_code=redirect_code)
+        db.add(db_url)
+        db.add(URLTarget(target_hash=target_hash(target_url), target_url=target_url, short_code=short_code))
+        db.add_all(counter_rows(short_code))
+        try:
+            db.commit()
+        except IntegrityError:
+            # 단축 키 충돌 또는 같은 원본 URL이 동시에 저장된 경우
+            db.rollback()
+            existing_url = get_url_by_target_url(db, target_url=target_url)
+            if existing_url:
+                return existing_url
+            continue
+        code_filter.add(short_code)
+        db.refresh(db_url)
+        return db_url
+    raise RuntimeError("could not allocate a unique short code")
 
 def get_url(db: Session, short_code: str) -> URL:
     """
@@ -60,23 +120,156 @@ def get_url(db: Session, short_code: str) -> URL:
     """
     return db.query(URL).filter(URL.short_code == short_code).first()
 
-def deactivate_url_from_db(db: Session, short_code: str) -> URL:
+def deactivate_url_from_db(db: Session, short_code: str) -> URL | ArchivedURL:
     """
     주어진 단축 키의 URL 레코드를 비활성화 처리합니다.
     - db: SQLAlchemy 세션
     - short_code: 비활성화할 단축 키 문자열
     동작:
-      1. 해당 키로 URL 레코드 조회
+      1. 해당 키로 URL 레코드 조회 (urls에 없으면 보관된 링크 조회)
       2. is_active를 False(비활성)으로 변경
-      3. 커밋 및 새로고침 후 업데이트된 객체 반환
-    - 반환: 업데이트된 URL 모델 객체 또는 None
+      3. 커밋 후 업데이트된 객체 반환 (속성은 접근 시점에 다시 로드됨)
+    - 반환: 업데이트된 URL / ArchivedURL 모델 객체 또는 None
     """
     db_url = db.query(URL).filter(URL.short_code == short_code).first()
+    if db_url is None:
+        db_url = db.query(ArchivedURL).filter(ArchivedURL.short_code == short_code).first()
     if db_url:
         db_url.is_active = False
         db.commit()
-        db.refresh(db_url)
     return db_url
 
+def increment_clicks(db: Session, short_code: str, bot: bool = False, amount: int = 1) -> None:
+    """
+    단축 키의 클릭 수(bot=True면 봇 클릭 수)를 amount(기본 1)만큼 증가시킵니다.
+    - 분산 카운터(url_click_counters)의 무작위 slot을 증가 (인기 링크의 행 락 경합 회피)
+    - 카운터 행이 없는 링크는 UPDATE urls SET clicks = clicks + 1 로 원자적으로 증가
+    - urls에 없으면 보관된 링크의 클릭 수를 증가 (updated_at이 바뀌어 보관 작업이 urls로 되돌림)
+    - 커밋은 호출자가 수행
+    """
+    if increment(db, short_code, bot=bot, amount=amount):
+        return
+    for model in (URL, ArchivedURL):
+        column = model.bot_clicks if bot else model.clicks
+        updated = db.query(model).filter(model.short_code == short_code).update(
+            {column: func.coalesce(column, 0) + amount}, synchronize_session=False
+        )
+        if updated:
+            return
+
+def _find_redirect(db: Session, short_code: str):
+    return find_redirect(db, short_code) or find_archived_redirect(db, short_code)
+
+def _find_url_stats(db: Session, short_code: str):
+    return find_url_stats(db, short_code) or find_archived_stats(db, short_code)
+
+def _shared_lookup(flight: SingleFlight, fn, db: Session, short_code: str):
+    """
+    fn(db, short_code)를 같은 DB의 같은 단축 키 동시 조회와 병합해 실행합니다.
+    - 키: (세션이 연결된 엔진, 단축 키) → 복제본 세션의 결과를 primary 세션(read-your-writes)이 받지 않음
+    - 아직 커밋하지 않은 변경이 있거나 사용자에게 보이는 쓰기를 한 세션은 병합하지 않고 직접 조회
+    """
+    if db.info.get("wrote") or db.new or db.dirty or db.deleted:
+        return fn(db, short_code)
+    bind = db.bind
+    if isinstance(bind, Connection):
+        bind = bind.engine  # 복제본 세션은 연결에 묶여 있음
+    return flight.do((bind, short_code), fn, db, short_code)
+
+def get_redirect_from_db(db: Session, short_code: str):
+    """
+    리디렉션 조회용: 필요한 컬럼만 읽은 Row를 반환합니다. (비활성 링크 포함)
+    - 반환: Row(target_url, redirect_code, expires_at, is_active) 또는 None (urls에 없으면 보관된 링크 조회)
+    - 같은 DB에서 같은 단축 키를 동시에 조회하면 한 번만 실행하고 결과를 공유 (먼저 온 요청의 세션으로 조회)
+    """
+    return _shared_lookup(_redirect_lookups, _find_redirect, db, short_code)
+
 def get_url_stats_from_db(db: Session, short_code: str):
-    return db.query(URL).filter(URL.short_code == short_code).first()
+    """
+    통계 조회용: 필요한 컬럼만 읽은 Row를 반환합니다. (ORM 객체를 만들지 않음)
+    - 반환: Row(short_code, target_url, clicks, bot_clicks, is_active, created_at, expires_at, updated_at,
+      clicked_at) 또는 None (urls에 없으면 보관된 링크 조회)
+    - 같은 DB에서 같은 단축 키를 동시에 조회하면 한 번만 실행하고 결과를 공유
+    """
+    return _shared_lookup(_stats_lookups, _find_url_stats, db, short_code)
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _host_matches(target_url: str, host: str) -> bool:
+    """원본 URL의 호스트가 host와 같은지 확인 (*.example.com은 하위 도메인만 일치)"""
+    try:
+        hostname = urlsplit(target_url).hostname or ""
+    except ValueError:
+        return False
+    if host.startswith("*."):
+        return hostname.endswith(host[1:])
+    return hostname == host
+
+def find_codes_by_target(db: Session, target_url_prefix: str | None = None, host: str | None = None,
+                         limit: int | None = None) -> tuple[list[str], bool]:
+    """
+    원본 URL 접두사 / 호스트가 일치하는 활성 링크의 단축 키를 찾습니다. (보관된 링크 포함)
+    - 호스트는 LIKE로 후보를 좁힌 뒤 URL을 파싱해 정확히 비교 (경로 / 쿼리에 호스트 문자열이 있는 URL 제외)
+    - 조건이 하나도 없으면 빈 목록
+    - 최대 limit개(기본 BULK_DEACTIVATE_MAX_MATCHES)까지만 읽고 멈춤
+    - 반환: (단축 키 목록, limit을 넘는 링크가 더 있는지)
+    """
+    if not target_url_prefix and not host:
+        return [], False
+    limit = BULK_DEACTIVATE_MAX_MATCHES if limit is None else limit
+    host = host.lower() if host else None
+    codes = []
+    for model in (URL, ArchivedURL):
+        statement = select(model.short_code, model.target_url).where(model.is_active.is_not(False))
+        if target_url_prefix:
+            statement = statement.where(model.target_url.like(_like_escape(target_url_prefix) + "%", escape="\\"))
+        if host:
+            name = host[2:] if host.startswith("*.") else host
+            statement = statement.where(func.lower(model.target_url).like(f"%{_like_escape(name)}%", escape="\\"))
+        result = db.execute(statement.execution_options(yield_per=BULK_DEACTIVATE_CHUNK))
+        try:
+            for batch in result.partitions():
+                codes.extend(code for code, target_url in batch if host is None or _host_matches(target_url, host))
+                if len(codes) > limit:
+                    return codes[:limit], True
+        finally:
+            result.close()
+    return codes, False
+
+def _deactivate_chunk(db: Session, model, short_codes: list[str]) -> set[str]:
+    result = db.execute(
+        update(model).where(model.short_code.in_(short_codes)).values(is_active=False).returning(model.short_code),
+        execution_options={"synchronize_session": False},
+    )
+    return set(result.scalars().all())
+
+def bulk_deactivate_urls(db: Session, short_codes: list[str] = (), target_url_prefix: str | None = None,
+                         host: str | None = None, chunk_size: int | None = None) -> tuple[list[str], list[str], bool]:
+    """
+    여러 링크를 한 번에 비활성화합니다.
+    - short_codes: 비활성화할 단축 키 목록
+    - target_url_prefix / host: 원본 URL 접두사 / 호스트가 일치하는 활성 링크도 함께 비활성화
+      (BULK_DEACTIVATE_MAX_MATCHES개까지, 비활성화된 링크는 다시 찾지 않으므로 반복 호출로 나머지 처리)
+    동작:
+      1. 단축 키를 chunk_size개씩 나눠 UPDATE urls ... WHERE short_code IN (...) RETURNING short_code
+      2. urls에 없는 키만 보관 테이블(archived_urls)에서 같은 방식으로 비활성화
+      3. 청크마다 커밋 후 찾은 키로 무효화 이벤트 1개 발행 (리디렉션 캐시 등)
+    - 반환: (찾아서 비활성화한 단축 키 목록, short_codes 중 없는 키 목록, 접두사 / 호스트 일치 링크가 더 남았는지)
+    """
+    chunk_size = BULK_DEACTIVATE_CHUNK if chunk_size is None else chunk_size
+    matched, truncated = find_codes_by_target(db, target_url_prefix, host)
+    codes = list(dict.fromkeys([*short_codes, *matched]))
+    found: list[str] = []
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        hits = _deactivate_chunk(db, URL, chunk)
+        missing = [code for code in chunk if code not in hits]
+        if missing:
+            hits |= _deactivate_chunk(db, ArchivedURL, missing)
+        db.commit()
+        chunk_found = [code for code in chunk if code in hits]
+        link_events.invalidate(chunk_found)
+        found.extend(chunk_found)
+    found_set = set(found)
+    return found, [code for code in dict.fromkeys(short_codes) if code not in found_set], truncated
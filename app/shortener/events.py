@@ -0,0 +1,56 @@
+# app/shortener/events.py: 링크 변경 이벤트 모듈
+# - 비활성화 / 보관 등으로 리디렉션 정보가 바뀐 단축 키를 구독자에게 알림
+# - 이벤트 하나에 단축 키 여러 개를 담아 일괄 처리(대량 비활성화는 배치마다 이벤트 1개)
+# - 기본 구독자: 프로세스 리디렉션 캐시(redirect_cache.invalidate)
+#   다른 워커 / 외부 캐시로 전파하려면 subscribe()로 구독자를 추가
+#
+# 구독자는 요청 처리 스레드에서 동기 호출되므로 오래 걸리는 작업은 큐에 넣고 바로 반환해야 합니다.
+
+import logging
+from typing import Callable, Iterable
+
+from app.monitoring.metrics import Counter
+from app.shortener.cache import redirect_cache
+
+logger = logging.getLogger(__name__)
+
+InvalidationListener = Callable[[tuple[str, ...]], None]
+
+invalidation_events = Counter("link_invalidation_events_total", "Link invalidation events published")
+invalidated_links = Counter("link_invalidations_total", "Short codes carried by link invalidation events")
+
+
+class LinkEvents:
+    """단축 키 무효화 이벤트 발행 / 구독"""
+
+    def __init__(self):
+        self._listeners: list[InvalidationListener] = []
+
+    def subscribe(self, listener: InvalidationListener) -> InvalidationListener:
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener: InvalidationListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def invalidate(self, short_codes: Iterable[str]):
+        """
+        단축 키들의 무효화 이벤트를 한 번 발행합니다. (빈 목록이면 발행하지 않음)
+        - 구독자 하나가 실패해도 나머지 구독자에게는 전달
+        """
+        codes = tuple(short_codes)
+        if not codes:
+            return
+        invalidation_events.inc()
+        invalidated_links.inc(len(codes))
+        for listener in list(self._listeners):
+            try:
+                listener(codes)
+            except Exception:
+                logger.exception("link invalidation listener failed")
+
+
+# 프로세스 전역 링크 이벤트
+link_events = LinkEvents()
+link_events.subscribe(lambda codes: redirect_cache.invalidate(*codes))
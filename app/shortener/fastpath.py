@@ -0,0 +1,98 @@
+# app/shortener/fastpath.py: 리디렉션 전용 ASGI fast path 미들웨어
+# - GET /shortener/v1/{short_code} 요청을 FastAPI 라우팅 / 의존성 주입 / 응답 클래스 없이 직접 처리
+#   (경로 매칭 → app/shortener/service.py로 조회 및 클릭 기록 → 최소한의 ASGI 응답 메시지 전송)
+# - 그 외 요청은 그대로 앱으로 전달
+# - 응답(상태 코드, Location, Cache-Control, 404 본문)과 클릭 기록은 redirect_to_target과 동일
+# - REDIRECT_FAST_PATH=1 일 때 app/main.py에서 MetricsMiddleware 안쪽에 등록
+#   (scope["route"]를 리디렉션 라우트로 설정해 메트릭 라벨도 동일하게 기록)
+
+import os
+from urllib.parse import quote
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.db.database import get_db, get_read_db
+from app.shortener.redirects import cache_control_for, redirect_status
+from app.shortener.service import record_click, resolve_redirect
+
+REDIRECT_FAST_PATH = os.getenv("REDIRECT_FAST_PATH", "").lower() in ("1", "true", "yes")
+
+PREFIX = "/shortener/v1/"
+ROUTE_PATH = PREFIX + "{short_code}"
+
+# redirect_to_target이 HTTPException(404)으로 만드는 응답과 같은 본문
+_NOT_FOUND_BODY = b'{"detail":"URL not found"}'
+_NOT_FOUND_START = {
+    "type": "http.response.start",
+    "status": 404,
+    "headers": [(b"content-length", str(len(_NOT_FOUND_BODY)).encode()), (b"content-type", b"application/json")],
+}
+_EMPTY_BODY = {"type": "http.response.body", "body": b""}
+
+
+class RedirectFastPathMiddleware:
+    """리디렉션 경로만 가로채 직접 처리하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+        self._route = None
+
+    def _redirect_route(self, app):
+        if self._route is None:
+            for route in app.routes:
+                if isinstance(route, APIRoute) and route.path == ROUTE_PATH and "GET" in route.methods:
+                    self._route = route
+                    break
+        return self._route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        short_code = path[len(PREFIX):] if path.startswith(PREFIX) else ""
+        if not short_code or "/" in short_code:
+            await self.app(scope, receive, send)
+            return
+
+        route = self._redirect_route(scope.get("app", self.app))
+        if route is not None:
+            scope["route"] = route
+        scope["path_params"] = {"short_code": short_code}
+        redirect = await run_in_threadpool(_handle, short_code, Request(scope))
+
+        if redirect is None:
+            await send(_NOT_FOUND_START)
+            await send({"type": "http.response.body", "body": _NOT_FOUND_BODY})
+            return
+        status_code = redirect_status(redirect.redirect_code)
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-length", b"0"),
+                # RedirectResponse와 같은 방식으로 인코딩
+                (b"location", quote(redirect.target_url, safe=":/%#?=@[]!$&'()*+,;").encode("latin-1")),
+                (b"cache-control", cache_control_for(status_code, redirect.expires_at).encode("latin-1")),
+            ],
+        })
+        await send(_EMPTY_BODY)
+
+
+def _handle(short_code: str, request: Request):
+    """스레드풀에서 실행: get_db / get_read_db 의존성과 같은 세션 수명으로 조회 및 클릭 기록"""
+    db_dependency = get_db(request)
+    db = next(db_dependency)
+    read_dependency = get_read_db(request, db)
+    read_db = next(read_dependency)
+    try:
+        redirect, count_click = resolve_redirect(short_code, read_db)
+        if redirect is not None and count_click:
+            record_click(db, short_code, request.client.host if request.client else None,
+                         request.headers.get("user-agent"))
+        return redirect
+    finally:
+        read_dependency.close()
+        db_dependency.close()
@@ -9,6 +9,10 @@ class URL(Base):
     - target_url: 저장할 원본 URL
     - short_code: 생성된 단축 키 (Unique)
     - is_active: 활성 상태 표시 (True=활성, False=비활성)
+    - clicks: 접은(fold) 클릭 수. 최신 값은 clicks + url_click_counters 합계 (app/shortener/counters.py)
+    - bot_clicks: 봇 / 크롤러 클릭 수 (clicks에는 포함하지 않음, 집계 방식은 clicks와 같음)
+    - redirect_code: 링크별 리디렉션 상태 코드 (None이면 REDIRECT_STATUS_CODE 사용)
+    - updated_at: 마지막 변경 시각 (클릭 수 증가 포함, Last-Modified / ETag 계산용)
     """
     __tablename__ = "urls"
 
@@ -17,5 +21,63 @@ class URL(Base):
     short_code = Column(String, unique=True, index=True)  # 단축된 키
     is_active = Column(Boolean, default=True)  # URL 활성 상태 (True: 활성, False: 비활성)
     clicks = Column(Integer, default=0)  # 클릭 수 필드 추가
+    bot_clicks = Column(Integer, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    expires_at = Column(DateTime, nullable=True)
+    redirect_code = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class URLTarget(Base):
+    """
+    원본 URL -> 단축 키 조회 테이블 (url_targets)
+    - target_hash: 원본 URL의 sha256 (Primary Key, 샤드 키)
+    - target_url: 원본 URL (해시 충돌 확인용)
+    - short_code: 해당 원본 URL의 단축 키
+    urls는 short_code로 샤딩되므로, 원본 URL로 기존 단축 키를 찾을 때
+    모든 샤드를 조회하지 않도록 원본 URL 해시로 샤딩한 별도 테이블을 둡니다.
+    """
+    __tablename__ = "url_targets"
+
+    target_hash = Column(String(64), primary_key=True)
+    target_url = Column(String, nullable=False)
+    short_code = Column(String, nullable=False)
+
+class URLClickCounter(Base):
+    """
+    클릭 수 분산 카운터 (url_click_counters)
+    - 링크마다 slot 0..K-1 행을 두고, 클릭은 무작위 slot 하나만 증가시켜
+      인기 링크의 urls 행 하나에 UPDATE가 몰려 행 락을 기다리는 것을 피함
+    - n: 아직 urls.clicks로 접지 않은 클릭 수
+    - bots: 아직 urls.bot_clicks로 접지 않은 봇 클릭 수
+    - updated_at: 마지막 증가 시각 (통계 Last-Modified 계산용, 클릭 전에는 None)
+    기본 키가 (short_code, slot)이므로 링크 생성 시 K개 행을 INSERT 한 번(executemany)으로 저장
+    """
+    __tablename__ = "url_click_counters"
+
+    short_code = Column(String, primary_key=True)  # 샤드 키 (urls와 같은 샤드)
+    slot = Column(Integer, primary_key=True, autoincrement=False)
+    n = Column(Integer, nullable=False, default=0)
+    bots = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
+
+class ArchivedURL(Base):
+    """
+    보관(cold storage) 링크 테이블 (archived_urls)
+    - 비활성화 / 만료 / 오래 클릭되지 않은 링크를 urls에서 옮겨 urls와 short_code 인덱스를 활성 링크 크기로 유지
+      (app/shortener/tiering.py)
+    - 리디렉션 / 통계는 urls에 없을 때만 이 테이블을 조회
+    - clicks / bot_clicks: 보관 시점의 합계 (분산 카운터 포함), 보관 후 클릭은 이 행을 직접 증가
+    - archived_at: 보관 시각 (updated_at이 이보다 늦으면 보관 후 클릭된 링크 → 다시 urls로 옮김)
+    """
+    __tablename__ = "archived_urls"
+
+    short_code = Column(String, primary_key=True)  # 샤드 키
+    target_url = Column(String, nullable=False)
+    is_active = Column(Boolean, default=True)
+    clicks = Column(Integer, default=0)
+    bot_clicks = Column(Integer, default=0)
+    created_at = Column(DateTime)
+    expires_at = Column(DateTime, nullable=True)
+    redirect_code = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    archived_at = Column(DateTime, default=datetime.utcnow)
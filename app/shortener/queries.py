@@ -0,0 +1,138 @@
+# app/shortener/queries.py: 리디렉션 / 통계 조회용 경량 데이터 접근 모듈
+# - ORM Query + URL 객체(identity map 등록, 전체 컬럼 로드) 대신
+#   필요한 컬럼만 select()하고 결과를 Row(이름 있는 튜플)로 반환
+# - 문장은 모듈 로드 시 한 번 만들고 값은 bindparam으로 전달
+#   → SQLAlchemy 컴파일 캐시에서 매번 같은 키로 조회되어 SQL 문자열을 다시 만들지 않음
+#   (DB 서버 측 prepared statement는 드라이버 기능: psycopg2는 미지원, psycopg 3 / asyncpg는 지원)
+# - 세션(db.execute)으로 실행하므로 샤드 라우팅 / 쓰기 추적 등 세션 이벤트는 그대로 적용됨
+# - 클릭 수는 urls.clicks + 아직 접지 않은 분산 카운터 합계 (app/shortener/counters.py, bot_clicks도 같음)
+# - urls에 없으면 보관 테이블(archived_urls, app/shortener/tiering.py)을 같은 모양의 Row로 조회
+# - 수정이 필요한 경우(비활성화 등)는 기존 crud의 ORM 객체 조회를 사용
+
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, null, select, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.shortener.models import URL, ArchivedURL, URLClickCounter
+
+# 리디렉션에 필요한 컬럼
+_REDIRECT_LOOKUP = (
+    select(URL.target_url, URL.redirect_code, URL.expires_at, URL.is_active)
+    .where(URL.short_code == bindparam("short_code"))
+    .limit(1)
+)
+
+# 같은 short_code의 카운터 행 (urls와 같은 샤드에 있으므로 한 쿼리로 조회)
+_pending_clicks = (
+    select(func.coalesce(func.sum(URLClickCounter.n), 0))
+    .where(URLClickCounter.short_code == URL.short_code)
+    .scalar_subquery()
+)
+_pending_bot_clicks = (
+    select(func.coalesce(func.sum(URLClickCounter.bots), 0))
+    .where(URLClickCounter.short_code == URL.short_code)
+    .scalar_subquery()
+)
+_last_clicked_at = (
+    select(func.max(URLClickCounter.updated_at))
+    .where(URLClickCounter.short_code == URL.short_code)
+    .scalar_subquery()
+)
+
+# 통계 / 클릭 정보 응답과 조건부 요청(Last-Modified)에 필요한 컬럼
+_STATS_COLUMNS = (
+    URL.short_code, URL.target_url, (func.coalesce(URL.clicks, 0) + _pending_clicks).label("clicks"),
+    (func.coalesce(URL.bot_clicks, 0) + _pending_bot_clicks).label("bot_clicks"), URL.is_active, URL.created_at,
+    URL.expires_at, URL.updated_at, _last_clicked_at.label("clicked_at"),
+)
+_STATS_LOOKUP = select(*_STATS_COLUMNS).where(URL.short_code == bindparam("short_code")).limit(1)
+
+# 보관 링크: 카운터 행이 없으므로 archived_urls 컬럼만 사용
+_ARCHIVED_REDIRECT_LOOKUP = (
+    select(ArchivedURL.target_url, ArchivedURL.redirect_code, ArchivedURL.expires_at, ArchivedURL.is_active)
+    .where(ArchivedURL.short_code == bindparam("short_code"))
+    .limit(1)
+)
+_ARCHIVED_STATS_COLUMNS = (
+    ArchivedURL.short_code, ArchivedURL.target_url, func.coalesce(ArchivedURL.clicks, 0).label("clicks"),
+    func.coalesce(ArchivedURL.bot_clicks, 0).label("bot_clicks"), ArchivedURL.is_active, ArchivedURL.created_at,
+    ArchivedURL.expires_at, ArchivedURL.updated_at, null().label("clicked_at"),
+)
+_ARCHIVED_STATS_LOOKUP = (
+    select(*_ARCHIVED_STATS_COLUMNS).where(ArchivedURL.short_code == bindparam("short_code")).limit(1)
+)
+
+# 여러 단축 키의 통계 (보관 링크 포함, 배치 분석 API)
+_STATS_MANY_LOOKUP = union_all(
+    select(*_STATS_COLUMNS).where(URL.short_code.in_(bindparam("short_codes", expanding=True))),
+    select(*_ARCHIVED_STATS_COLUMNS).where(ArchivedURL.short_code.in_(bindparam("short_codes", expanding=True))),
+)
+
+# 여러 단축 키의 클릭 수 (실시간 클릭 스트림, app/shortener/stream.py)
+_CLICK_COUNTS_LOOKUP = union_all(
+    select(URL.short_code, (func.coalesce(URL.clicks, 0) + _pending_clicks).label("clicks"),
+           (func.coalesce(URL.bot_clicks, 0) + _pending_bot_clicks).label("bot_clicks"))
+    .where(URL.short_code.in_(bindparam("short_codes", expanding=True))),
+    select(ArchivedURL.short_code, func.coalesce(ArchivedURL.clicks, 0), func.coalesce(ArchivedURL.bot_clicks, 0))
+    .where(ArchivedURL.short_code.in_(bindparam("short_codes", expanding=True))),
+)
+
+
+def find_redirect(db: Session, short_code: str) -> Row | None:
+    """
+    리디렉션 정보를 조회합니다. (비활성 링크 포함)
+    - 반환: Row(target_url, redirect_code, expires_at, is_active) 또는 None
+    """
+    return db.execute(_REDIRECT_LOOKUP, {"short_code": short_code}).first()
+
+
+def find_url_stats(db: Session, short_code: str) -> Row | None:
+    """
+    통계 정보를 조회합니다.
+    - 반환: Row(short_code, target_url, clicks, bot_clicks, is_active, created_at, expires_at, updated_at,
+      clicked_at) 또는 None (clicks / bot_clicks는 분산 카운터 포함)
+    """
+    return db.execute(_STATS_LOOKUP, {"short_code": short_code}).first()
+
+
+def find_archived_redirect(db: Session, short_code: str) -> Row | None:
+    """보관 링크의 리디렉션 정보를 조회합니다. (find_redirect와 같은 모양의 Row 또는 None)"""
+    return db.execute(_ARCHIVED_REDIRECT_LOOKUP, {"short_code": short_code}).first()
+
+
+def find_archived_stats(db: Session, short_code: str) -> Row | None:
+    """보관 링크의 통계 정보를 조회합니다. (find_url_stats와 같은 모양의 Row 또는 None)"""
+    return db.execute(_ARCHIVED_STATS_LOOKUP, {"short_code": short_code}).first()
+
+
+def find_url_stats_many(db: Session, short_codes: list[str]) -> dict[str, Row]:
+    """
+    여러 단축 키의 통계 정보를 한 쿼리로 조회합니다. (urls + 보관 테이블)
+    - 반환: {short_code: find_url_stats와 같은 모양의 Row}, 없는 키는 빠짐
+    """
+    if not short_codes:
+        return {}
+    rows = {}
+    for row in db.execute(_STATS_MANY_LOOKUP, {"short_codes": list(short_codes)}):
+        rows.setdefault(row.short_code, row)
+    return rows
+
+
+def find_click_counts(db: Session, short_codes: list[str]) -> dict[str, tuple[int, int]]:
+    """
+    여러 단축 키의 클릭 수를 한 쿼리로 조회합니다. (보관 링크 포함)
+    - 반환: {short_code: (clicks, bot_clicks)}, 없는 키는 빠짐
+    """
+    if not short_codes:
+        return {}
+    return {
+        short_code: (clicks, bot_clicks)
+        for short_code, clicks, bot_clicks in db.execute(_CLICK_COUNTS_LOOKUP, {"short_codes": list(short_codes)})
+    }
+
+
+def stats_last_modified(row: Row) -> datetime | None:
+    """통계 Row의 마지막 변경 시각 (링크 수정 / 마지막 클릭 중 늦은 쪽)"""
+    return max((t for t in (row.updated_at, row.clicked_at) if t is not None), default=row.created_at)
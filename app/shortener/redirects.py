@@ -0,0 +1,54 @@
+# app/shortener/redirects.py: 리디렉션 응답 정책 모듈
+# - 상태 코드: 링크별 redirect_code, 없으면 REDIRECT_STATUS_CODE (기본 307)
+#   - 301 / 308 (영구): 브라우저 / CDN이 캐시하도록 Cache-Control: public, max-age 부여
+#     max-age는 REDIRECT_MAX_AGE_SECONDS와 만료 시각(expires_at)까지 남은 시간 중 작은 값
+#     (캐시된 동안의 클릭은 서버에 오지 않으므로 클릭 수 / 로그에 집계되지 않음)
+#   - 302 / 307 (임시): 모든 클릭을 집계해야 하는 링크용, Cache-Control: no-store
+#
+# 영구 리디렉션은 비활성화해도 max-age 동안 브라우저 / CDN 캐시에 남습니다.
+# 비활성화가 빨리 반영되어야 하면 REDIRECT_MAX_AGE_SECONDS를 작게 두세요.
+
+import os
+from datetime import datetime
+
+from starlette.responses import RedirectResponse
+
+PERMANENT_CODES = (301, 308)
+TEMPORARY_CODES = (302, 307)
+REDIRECT_CODES = PERMANENT_CODES + TEMPORARY_CODES
+
+REDIRECT_STATUS_CODE = int(os.getenv("REDIRECT_STATUS_CODE", 307))
+REDIRECT_MAX_AGE_SECONDS = int(os.getenv("REDIRECT_MAX_AGE_SECONDS", 86400))
+
+if REDIRECT_STATUS_CODE not in REDIRECT_CODES:
+    raise RuntimeError(f"REDIRECT_STATUS_CODE must be one of {REDIRECT_CODES}")
+
+
+def cache_control_for(status_code: int, expires_at: datetime | None, now: datetime | None = None) -> str:
+    """리디렉션 상태 코드와 링크 만료 시각으로 Cache-Control 값을 만듭니다."""
+    if status_code not in PERMANENT_CODES:
+        return "no-store"
+    max_age = REDIRECT_MAX_AGE_SECONDS
+    if expires_at is not None:
+        remaining = (expires_at - (now or datetime.utcnow())).total_seconds()
+        max_age = max(0, min(max_age, int(remaining)))
+    return f"public, max-age={max_age}"
+
+
+def redirect_status(redirect_code: int | None) -> int:
+    return redirect_code or REDIRECT_STATUS_CODE
+
+
+def redirect_response(target_url: str, redirect_code: int | None = None,
+                      expires_at: datetime | None = None) -> RedirectResponse:
+    """
+    리디렉션 정책에 맞는 응답을 만듭니다.
+    - redirect_code: 링크별 상태 코드 (None이면 REDIRECT_STATUS_CODE)
+    - expires_at: 링크 만료 시각 (영구 리디렉션의 max-age 상한)
+    """
+    status_code = redirect_status(redirect_code)
+    return RedirectResponse(
+        target_url,
+        status_code=status_code,
+        headers={"Cache-Control": cache_control_for(status_code, expires_at)},
+    )
@@ -1,17 +1,26 @@
 # app/schemas.py: 요청/응답 데이터 모델(Pydantic 스키마) 정의 모듈
 # - URLCreate: 단축 URL 생성 요청 스키마
 # - URLResponse: 단축 URL 생성/조회 응답 스키마
+# - BulkDeactivateRequest / BulkDeactivateResponse: 대량 비활성화 요청/응답 스키마
 
-from pydantic import BaseModel
+import os
+
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
+
+# 대량 비활성화 요청 한 번에 받을 최대 단축 키 수
+BULK_DEACTIVATE_MAX_CODES = int(os.getenv("BULK_DEACTIVATE_MAX_CODES", 50_000))
 
 class URLCreate(BaseModel):
     """
     단축 URL 생성 요청 스키마
     - target_url: 단축하려는 원본 URL 문자열
+    - redirect_code: 리디렉션 상태 코드 (생략 시 서버 기본값 REDIRECT_STATUS_CODE)
+      301/308은 브라우저/CDN에 캐시되어 클릭이 집계되지 않으므로, 모든 클릭을 세려면 302/307
     """
     target_url: str
+    redirect_code: Optional[Literal[301, 302, 307, 308]] = None
 
     class Config:
         orm_mode = True  # ORM 모델(SQLAlchemy) 객체 직렬화 허용
@@ -23,11 +32,13 @@ class URLResponse(BaseModel):
     - target_url: 원본 URL
     - short_code: 생성된 단축 키
     - is_active: 활성 상태 (1=활성, 0=비활성)
+    - redirect_code: 링크별 리디렉션 상태 코드 (None이면 서버 기본값)
     """
     id: int
     target_url: str
     short_code: str
     is_active: bool  # URL 활성 상태
+    redirect_code: Optional[int] = None
 
     class Config:
         orm_mode = True  # ORM 모델을 JSON으로 자동 변환 허용
@@ -36,6 +47,36 @@ class URLStats(BaseModel):
     short_code: str
     target_url: str
     clicks: int
+    bot_clicks: int = 0
     is_active: bool
     created_at: datetime
-    expires_at: Optional[datetime]
\ No newline at end of file
+    expires_at: Optional[datetime]
+
+class BulkDeactivateRequest(BaseModel):
+    """
+    대량 비활성화 요청 스키마 (최소 하나는 지정)
+    - short_codes: 비활성화할 단축 키 목록
+    - target_url_prefix: 이 문자열로 시작하는 원본 URL의 링크
+    - host: 원본 URL 호스트가 일치하는 링크 (*.example.com은 하위 도메인)
+    """
+    short_codes: list[str] = Field(default_factory=list, max_length=BULK_DEACTIVATE_MAX_CODES)
+    target_url_prefix: Optional[str] = Field(default=None, min_length=1)
+    host: Optional[str] = Field(default=None, min_length=1)
+
+    @model_validator(mode="after")
+    def require_selector(self):
+        if not (self.short_codes or self.target_url_prefix or self.host):
+            raise ValueError("short_codes, target_url_prefix or host is required")
+        return self
+
+class BulkDeactivateResponse(BaseModel):
+    """
+    대량 비활성화 응답 스키마
+    - deactivated: 찾아서 비활성화한 단축 키 (이미 비활성이던 키 포함)
+    - not_found: short_codes 중 존재하지 않는 키
+    - truncated: 원본 URL 접두사 / 호스트 일치 링크가 BULK_DEACTIVATE_MAX_MATCHES개를 넘어 일부만 비활성화함
+      (같은 요청을 다시 보내면 나머지를 처리)
+    """
+    deactivated: list[str]
+    not_found: list[str]
+    truncated: bool = False
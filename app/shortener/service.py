@@ -0,0 +1,103 @@
+# app/shortener/service.py: 리디렉션 처리 로직 모듈
+# - redirect_to_target 엔드포인트와 ASGI fast path(app/shortener/fastpath.py)가 함께 사용
+#   (두 경로의 동작이 같도록 조회 / 클릭 기록을 한곳에서 처리)
+# - REDIRECT_SOURCE=fallback: DB 장애 중에는 단축 키 필터 sync / 조회 실패 시 스냅샷으로 응답하고,
+#   캐시에서 찾은 리디렉션의 클릭 기록이 실패하면 롤백 후 클릭을 건너뜀 (리디렉션은 그대로 응답)
+
+import logging
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.analytics.crud import log_click
+from app.analytics.bots import BOT_CLICKS_PERSIST, is_bot_user_agent
+from app.analytics.dedup import forget_click, is_duplicate_click
+from app.analytics.spool import click_spool
+from app.monitoring.metrics import Counter
+from app.shortener.cache import CachedRedirect, redirect_cache
+from app.shortener.code_filter import code_filter
+from app.shortener.crud import get_redirect_from_db, increment_clicks
+from app.shortener.snapshot import REDIRECT_SOURCE, redirect_snapshot
+
+logger = logging.getLogger(__name__)
+
+clicks_skipped = Counter(
+    "redirect_clicks_skipped_total", "Clicks not recorded because the database was unavailable (REDIRECT_SOURCE=fallback)"
+)
+
+
+def resolve_redirect(short_code: str, read_db: Session | None) -> tuple[CachedRedirect | None, bool]:
+    """
+    단축 키의 리디렉션 대상을 찾습니다.
+    - 순서: (edge 모드) 스냅샷 → 리디렉션 캐시 → 단축 키 필터 → urls 조회 → (urls에 없을 때만) 보관 테이블
+      (fallback 모드는 DB 장애 시 스냅샷)
+    - 반환: (리디렉션 정보 또는 None(404), 클릭을 기록해야 하는지 여부)
+      스냅샷에서 찾은 경우 DB를 쓸 수 없으므로 클릭을 기록하지 않음
+    """
+    if REDIRECT_SOURCE == "edge":
+        return redirect_snapshot.lookup(short_code), False
+
+    cached = redirect_cache.get(short_code)
+    if cached is not None:
+        return cached, True
+
+    try:
+        # 필터에 없으면 다른 워커가 방금 만든 키일 수 있으므로 (간격 제한된) sync 후 한 번 더 확인
+        if not code_filter.might_exist(short_code):
+            if not (code_filter.sync(read_db) and code_filter.might_exist(short_code, record=False)):
+                return None, False
+        url = get_redirect_from_db(read_db, short_code)
+    except DBAPIError:
+        if REDIRECT_SOURCE != "fallback":
+            raise
+        return redirect_snapshot.lookup(short_code), False
+    if url is None and code_filter.ready:
+        code_filter.record_false_positive()
+    if not url or not url.is_active:
+        return None, False
+    cached = CachedRedirect(url.target_url, url.redirect_code, url.expires_at)
+    redirect_cache.put(short_code, *cached)
+    return cached, True
+
+
+def record_click(db: Session, short_code: str, client_ip: str | None, user_agent: str | None) -> bool:
+    """
+    클릭 로그 기록과 클릭 수 증가를 한 트랜잭션으로 커밋합니다.
+    - 중복 억제 윈도 안의 같은 (short_code, client_ip, user_agent) 클릭은 DB에 쓰지 않음
+    - 봇 / 크롤러 클릭은 bot_clicks로 따로 집계 (BOT_CLICKS_PERSIST=0이면 클릭 로그는 저장하지 않음)
+    - 클릭 스풀(CLICK_SPOOL_DIR)이 열려 있으면 로컬 세그먼트 파일에 덧붙이기만 하고 DB는 쓰지 않음
+      (드레이너가 모아서 기록, 스풀이 가득 찬 경우에만 DB에 바로 기록)
+    - REDIRECT_SOURCE=fallback에서 DB 쓰기가 실패하면 롤백하고 클릭을 건너뜀 (리디렉션은 계속 응답)
+    - 기록하지 못한 클릭은 중복 억제 윈도에서 지움 (윈도 안의 재시도가 중복으로 억제되어 클릭을 잃지 않도록)
+    - 반환: 기록했으면 True, 중복으로 억제했거나 DB 장애로 건너뛰었으면 False
+    """
+    if is_duplicate_click(short_code, client_ip, user_agent):
+        return False
+    try:
+        recorded = _write_click(db, short_code, client_ip, user_agent)
+    except BaseException:
+        forget_click(short_code, client_ip, user_agent)
+        raise
+    if not recorded:
+        forget_click(short_code, client_ip, user_agent)
+    return recorded
+
+
+def _write_click(db: Session, short_code: str, client_ip: str | None, user_agent: str | None) -> bool:
+    bot = is_bot_user_agent(user_agent)
+    if click_spool.opened and click_spool.append(short_code, client_ip, user_agent, bot):
+        return True
+    try:
+        if BOT_CLICKS_PERSIST or not bot:
+            log_click(db=db, code=short_code, client_ip=client_ip, user_agent=user_agent, commit=False, is_bot=bot)
+        # 클릭 수 증가: 객체를 다시 읽지 않고 DB에서 원자적으로 증가
+        increment_clicks(db, short_code=short_code, bot=bot)
+        db.commit()
+    except DBAPIError as exc:
+        if REDIRECT_SOURCE != "fallback":
+            raise
+        db.rollback()
+        clicks_skipped.inc()
+        logger.debug("click on %s not recorded: %s", short_code, exc)
+        return False
+    return True
@@ -0,0 +1,394 @@
+# app/shortener/snapshot.py: 읽기 전용 리디렉션 스냅샷 모듈 (mmap)
+# - 활성 링크(urls + 보관 테이블 archived_urls의 활성 행)를 정렬된 바이너리 파일로 내보내고,
+#   파일을 mmap으로 열어 DB 없이 리디렉션 조회
+#   (오래 클릭되지 않은 활성 링크도 보관 테이블로 옮겨지므로 urls만 읽으면 스냅샷에서 빠져 404가 됨)
+# - 파일 형식 (리틀 엔디언)
+#   - 헤더: magic, version, 링크 수, 생성 시각, 각 구역 위치
+#   - keys: 단축 키를 64비트 정수로 인코딩해 정렬한 배열 (u64 * N)
+#     (키 문자를 7비트 순위로 앞에서부터 채움 → 정수 순서 = 문자열 순서, 최대 9자)
+#   - meta: 키와 같은 순서의 (blob 위치 u64, 길이 u32, 리디렉션 코드 u16, 예약 u16, 만료 epoch i64)
+#   - blob: 원본 URL(UTF-8)을 이어 붙인 문자열 영역
+# - 조회: keys 구역 memoryview에 bisect (키 슬라이스/디코딩 없이 정수 비교만 수행)
+# - 증분 반영: `<스냅샷>.delta.<epoch ms>` 파일(NDJSON)을 주기적으로 읽어 메모리 오버레이에 적용
+#   (두 테이블 모두에서 변경된 행, 보관 테이블은 보관 시각(archived_at)도 변경으로 봄)
+#
+# 실행 모드 (REDIRECT_SOURCE)
+#   - db: 기존대로 DB 조회 (기본값)
+#   - fallback: DB 조회가 실패(DB 장애)하면 스냅샷으로 응답 (클릭은 기록되지 않음)
+#   - edge: 스냅샷만 사용, DB에 접근하지 않음 (클릭 기록 / warm-up / 단축 키 필터 비활성화)
+#     DATABASE_URL은 여전히 필요하지만 연결하지 않으므로 도달할 수 없는 주소여도 됨
+#
+# 사용 예:
+#   python -m app.shortener.snapshot build --output /var/lib/shortener/redirects.snap
+#   python -m app.shortener.snapshot delta --output /var/lib/shortener/redirects.snap   (주기 실행)
+
+import argparse
+import asyncio
+import bisect
+import glob
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, select
+
+from app.monitoring.health import readiness
+from app.shortener.cache import CachedRedirect
+from app.shortener.models import URL, ArchivedURL
+
+logger = logging.getLogger(__name__)
+
+REDIRECT_SOURCE = os.getenv("REDIRECT_SOURCE", "db")  # db | fallback | edge
+REDIRECT_SNAPSHOT_PATH = os.getenv("REDIRECT_SNAPSHOT_PATH", "")
+REDIRECT_SNAPSHOT_POLL_SECONDS = float(os.getenv("REDIRECT_SNAPSHOT_POLL_SECONDS", 10))
+# 델타 생성 시 이전 델타 시각보다 이만큼 앞에서부터 다시 읽음 (늦게 커밋된 행 대비, 중복 적용은 무해)
+DELTA_OVERLAP_SECONDS = 5
+
+if REDIRECT_SOURCE not in ("db", "fallback", "edge"):
+    raise RuntimeError("REDIRECT_SOURCE must be one of db, fallback, edge")
+
+READINESS_CHECK = "redirect_snapshot"
+
+MAGIC = b"URLSNAP1"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQdQQQQ")  # magic, version, reserved, count, built_at, keys/meta/blob offset, blob size
+_META = struct.Struct("<QIHHq")         # blob offset, length, redirect code, reserved, expires_at (epoch, 0=없음)
+
+ALPHABET = "".join(sorted("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"))
+_RANK = {char: rank + 1 for rank, char in enumerate(ALPHABET)}  # 0은 "문자 없음"
+MAX_CODE_LENGTH = 9  # 7비트 * 9 = 63비트
+
+
+def encode_code(short_code: str) -> int | None:
+    """단축 키를 정렬 순서를 보존하는 64비트 정수로 변환합니다. 표현할 수 없으면 None"""
+    if len(short_code) > MAX_CODE_LENGTH:
+        return None
+    value = 0
+    for char in short_code:
+        rank = _RANK.get(char)
+        if rank is None:
+            return None
+        value = (value << 7) | rank
+    return value << (7 * (MAX_CODE_LENGTH - len(short_code)))
+
+
+def _to_epoch(value: datetime | None) -> int:
+    if value is None:
+        return 0
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _from_epoch(value: float) -> datetime | None:
+    if not value:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+def write_snapshot(path: str, rows, built_at: datetime | None = None) -> dict:
+    """
+    (short_code, target_url, redirect_code, expires_at) 행들로 스냅샷 파일을 만듭니다.
+    - 행은 정렬되어 있지 않아도 됨 (키 배열 기준으로 정렬)
+    - 임시 파일에 쓴 뒤 교체하므로 읽는 프로세스는 항상 완전한 파일을 봄
+    - 반환: {"links": 링크 수, "skipped": 인코딩할 수 없어 제외한 키 수, "bytes": 파일 크기}
+    """
+    built_at = built_at or datetime.utcnow()
+    keys, offsets, lengths, codes, expires = array("Q"), array("Q"), array("I"), array("H"), array("q")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    blob_path = f"{tmp_path}.blob"
+    skipped = 0
+    blob_size = 0
+    with open(blob_path, "wb") as blob:
+        for short_code, target_url, redirect_code, expires_at in rows:
+            key = encode_code(short_code)
+            if key is None:
+                skipped += 1
+                continue
+            data = target_url.encode("utf-8")
+            blob.write(data)
+            keys.append(key)
+            offsets.append(blob_size)
+            lengths.append(len(data))
+            codes.append(redirect_code or 0)
+            expires.append(_to_epoch(expires_at))
+            blob_size += len(data)
+
+    count = len(keys)
+    order = sorted(range(count), key=keys.__getitem__)
+    keys_offset = _HEADER.size + (-_HEADER.size % 8)
+    meta_offset = keys_offset + 8 * count
+    blob_offset = meta_offset + _META.size * count
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, count, built_at.replace(tzinfo=timezone.utc).timestamp(),
+                                 keys_offset, meta_offset, blob_offset, blob_size))
+            f.write(b"\0" * (keys_offset - _HEADER.size))
+            sorted_keys = array("Q", (keys[i] for i in order))
+            if sys.byteorder != "little":
+                sorted_keys.byteswap()
+            sorted_keys.tofile(f)
+            f.write(b"".join(_META.pack(offsets[i], lengths[i], codes[i], 0, expires[i]) for i in order))
+            with open(blob_path, "rb") as blob:
+                while chunk := blob.read(1 << 20):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        os.remove(blob_path)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return {"links": count, "skipped": skipped, "bytes": os.path.getsize(path)}
+
+
+def build_snapshot(db, path: str, batch_size: int = 10_000) -> dict:
+    """활성 링크(urls + archived_urls)로 스냅샷을 만들고, 스냅샷보다 오래된 델타 파일을 지웁니다."""
+    built_at = datetime.utcnow()
+    statement = (
+        select(URL.short_code, URL.target_url, URL.redirect_code, URL.expires_at)
+        .where(URL.is_active)
+        .union_all(
+            select(ArchivedURL.short_code, ArchivedURL.target_url, ArchivedURL.redirect_code, ArchivedURL.expires_at)
+            .where(ArchivedURL.is_active)
+        )
+        .execution_options(yield_per=batch_size)
+    )
+    summary = write_snapshot(path, db.execute(statement), built_at=built_at)
+    for delta_path, delta_time in list_deltas(path):
+        if delta_time <= built_at - timedelta(seconds=DELTA_OVERLAP_SECONDS):
+            os.remove(delta_path)
+    return summary
+
+
+def list_deltas(path: str) -> list[tuple[str, datetime]]:
+    """스냅샷의 델타 파일 목록 (시간순)"""
+    deltas = []
+    for delta_path in glob.glob(f"{glob.escape(path)}.delta.*"):
+        suffix = delta_path.rsplit(".", 1)[-1]
+        if suffix.isdigit():
+            deltas.append((delta_path, _from_epoch(int(suffix) / 1000)))
+    return sorted(deltas, key=lambda item: item[1])
+
+
+def write_delta(db, path: str, since: datetime | None = None) -> dict:
+    """
+    since 이후 변경된 urls / archived_urls 행을 델타 파일로 씁니다.
+    - since 생략 시 마지막 델타(없으면 스냅샷 생성) 시각
+    - 보관 테이블은 since 이후 보관된 행도 포함 (테이블을 옮겨도 updated_at은 그대로이므로)
+    - 활성 행은 put, 비활성 행은 del
+    - 반환: {"path": 델타 파일 경로(변경이 없으면 None), "changes": 변경 수}
+    """
+    upto = datetime.utcnow()
+    if since is None:
+        deltas = list_deltas(path)
+        since = deltas[-1][1] if deltas else read_header(path)["built_at"]
+    since -= timedelta(seconds=DELTA_OVERLAP_SECONDS)
+    statement = (
+        select(URL.short_code, URL.target_url, URL.redirect_code, URL.expires_at, URL.is_active)
+        .where(URL.updated_at >= since)
+        .union_all(
+            select(ArchivedURL.short_code, ArchivedURL.target_url, ArchivedURL.redirect_code,
+                   ArchivedURL.expires_at, ArchivedURL.is_active)
+            .where(or_(ArchivedURL.updated_at >= since, ArchivedURL.archived_at >= since))
+        )
+        .execution_options(yield_per=10_000)
+    )
+    delta_path = f"{path}.delta.{int(upto.replace(tzinfo=timezone.utc).timestamp() * 1000)}"
+    tmp_path = f"{delta_path}.tmp"
+    changes = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for short_code, target_url, redirect_code, expires_at, is_active in db.execute(statement):
+            if is_active:
+                entry = {"op": "put", "code": short_code, "target": target_url,
+                         "redirect_code": redirect_code, "expires_at": _to_epoch(expires_at)}
+            else:
+                entry = {"op": "del", "code": short_code}
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            changes += 1
+    if not changes:
+        os.remove(tmp_path)
+        return {"path": None, "changes": 0}
+    os.replace(tmp_path, delta_path)
+    return {"path": delta_path, "changes": changes}
+
+
+def read_header(path: str) -> dict:
+    with open(path, "rb") as f:
+        data = f.read(_HEADER.size)
+    magic, version, _, count, built_at, keys_offset, meta_offset, blob_offset, blob_size = _HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a redirect snapshot")
+    return {"count": count, "built_at": _from_epoch(built_at), "keys_offset": keys_offset,
+            "meta_offset": meta_offset, "blob_offset": blob_offset, "blob_size": blob_size}
+
+
+_MISSING = object()
+
+
+class RedirectSnapshot:
+    """
+    mmap으로 연 스냅샷 + 델타 오버레이
+    - lookup(): 단축 키 → CachedRedirect 또는 None
+    - refresh(): 스냅샷 파일이 교체되었으면 다시 열고, 새 델타 파일을 적용
+    """
+
+    def __init__(self, path: str = REDIRECT_SNAPSHOT_PATH):
+        self.path = path
+        self._file = None
+        self._mmap = None
+        self._keys = None
+        self._header = None
+        self._stat = None
+        self._overlay: dict[str, CachedRedirect | None] = {}
+        self._applied: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._mmap is not None
+
+    def __len__(self) -> int:
+        return self._header["count"] if self._header else 0
+
+    def open(self):
+        """스냅샷 파일을 (다시) 엽니다. 델타 오버레이는 비우고 refresh()에서 다시 적용"""
+        if sys.byteorder != "little":
+            raise RuntimeError("redirect snapshots are little-endian only")
+        header = read_header(self.path)
+        stat = os.stat(self.path)
+        f = open(self.path, "rb")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        keys = memoryview(mm)[header["keys_offset"]:header["meta_offset"]].cast("Q")
+        # 다른 스레드가 아직 이전 mmap을 읽고 있을 수 있으므로 mmap은 닫지 않고 참조만 놓음 (GC가 정리)
+        with self._lock:
+            previous, self._file = self._file, f
+            self._mmap, self._keys, self._header, self._stat = mm, keys, header, stat
+            self._overlay = {}
+            self._applied = set()
+        if previous is not None:
+            previous.close()
+
+    def close(self):
+        with self._lock:
+            previous, self._file = self._file, None
+            self._mmap = self._keys = self._header = self._stat = None
+        if previous is not None:
+            previous.close()
+
+    def lookup(self, short_code: str) -> CachedRedirect | None:
+        overlay = self._overlay.get(short_code, _MISSING)
+        if overlay is not _MISSING:
+            return overlay
+        keys, mm, header = self._keys, self._mmap, self._header
+        if keys is None:
+            return None
+        key = encode_code(short_code)
+        if key is None:
+            return None
+        index = bisect.bisect_left(keys, key)
+        if index == len(keys) or keys[index] != key:
+            return None
+        offset, length, redirect_code, _, expires_at = _META.unpack_from(mm, header["meta_offset"] + _META.size * index)
+        start = header["blob_offset"] + offset
+        target_url = mm[start:start + length].decode("utf-8")
+        return CachedRedirect(target_url, redirect_code or None, _from_epoch(expires_at))
+
+    def refresh(self) -> int:
+        """
+        스냅샷 교체를 감지해 다시 열고, 아직 적용하지 않은 델타 파일을 적용합니다.
+        - 반환: 이번에 적용한 델타 파일 수
+        """
+        stat = os.stat(self.path)
+        if self._stat is None or (stat.st_ino, stat.st_mtime_ns) != (self._stat.st_ino, self._stat.st_mtime_ns):
+            self.open()
+        applied = 0
+        for delta_path, delta_time in list_deltas(self.path):
+            # 스냅샷 생성 전에 만든 델타는 스냅샷보다 오래된 상태이므로 적용하지 않음
+            if delta_path in self._applied or delta_time <= self._header["built_at"]:
+                continue
+            try:
+                updates = self._read_delta(delta_path)
+            except FileNotFoundError:  # 새 스냅샷 생성 중 삭제된 델타
+                continue
+            with self._lock:
+                self._overlay.update(updates)
+                self._applied.add(delta_path)
+            applied += 1
+        return applied
+
+    @staticmethod
+    def _read_delta(delta_path: str) -> dict:
+        updates = {}
+        with open(delta_path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["op"] == "put":
+                    updates[entry["code"]] = CachedRedirect(
+                        entry["target"], entry["redirect_code"], _from_epoch(entry["expires_at"])
+                    )
+                else:
+                    updates[entry["code"]] = None
+        return updates
+
+
+# 프로세스 전역 스냅샷 (REDIRECT_SOURCE가 fallback / edge 일 때 사용)
+redirect_snapshot = RedirectSnapshot()
+
+
+def start_snapshot_refresh() -> asyncio.Task | None:
+    """
+    lifespan에서 호출: 스냅샷을 열고 주기적으로 refresh하는 태스크를 시작합니다.
+    - edge 모드에서는 스냅샷이 없으면 응답할 수 없으므로 시작 실패
+    """
+    if REDIRECT_SOURCE == "db":
+        return None
+    if not REDIRECT_SNAPSHOT_PATH:
+        raise RuntimeError("REDIRECT_SNAPSHOT_PATH is required when REDIRECT_SOURCE is fallback or edge")
+    try:
+        redirect_snapshot.refresh()
+    except (OSError, ValueError):
+        if REDIRECT_SOURCE == "edge":
+            raise
+        logger.exception("redirect snapshot %s could not be opened", REDIRECT_SNAPSHOT_PATH)
+    readiness.mark_done(READINESS_CHECK, status="ok" if redirect_snapshot.loaded else "missing",
+                        links=len(redirect_snapshot))
+    return asyncio.create_task(_refresh_loop())
+
+
+async def _refresh_loop():
+    while True:
+        await asyncio.sleep(REDIRECT_SNAPSHOT_POLL_SECONDS)
+        try:
+            await asyncio.to_thread(redirect_snapshot.refresh)
+        except Exception:
+            logger.exception("redirect snapshot refresh failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build redirect snapshots and delta files")
+    parser.add_argument("command", choices=("build", "delta"))
+    parser.add_argument("--output", default=REDIRECT_SNAPSHOT_PATH, help="snapshot path")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+    if not args.output:
+        parser.error("--output or REDIRECT_SNAPSHOT_PATH is required")
+
+    from app.db.database import SessionLocal, get_engine
+
+    get_engine()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        if args.command == "build":
+            summary = build_snapshot(db, args.output, batch_size=args.batch_size)
+        else:
+            summary = write_delta(db, args.output)
+    summary["elapsed"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# app/shortener/stream.py: 실시간 클릭 수 스트림(SSE) 모듈
+# - 대시보드가 링크마다 매초 GET /stats/{short_code}를 폴링하면 같은 조회가 (링크 수 x 대시보드 수)만큼 실행됨
+#   → GET /shortener/v1/stats/stream?codes=a,b,c 로 구독하고, 변경된 클릭 수만 주기(tick)마다 받음
+# - 워커당 생산자(producer) 하나: STATS_STREAM_TICK_SECONDS마다 모든 구독의 단축 키 합집합을 한 쿼리로 조회
+#   (구독자 수와 무관하게 tick당 DB 조회 1번, 구독자가 없으면 생산자 태스크도 멈춤)
+# - 이벤트 (text/event-stream)
+#   - snapshot: 구독 후 첫 이벤트, 구독한 모든 키의 현재 합계 (없는 키는 null)
+#   - clicks: 이전 tick 이후 바뀐 키만 {"clicks", "bot_clicks", "delta", "bot_delta"}
+#   - STATS_STREAM_KEEPALIVE_SECONDS 동안 보낼 이벤트가 없으면 주석 줄(": keepalive")로 연결 유지
+# - 느린 구독자: 보내지 못한 변경은 키별로 합쳐 둠(합계는 최신 값, delta는 누적)
+#   → 구독자별 대기 데이터는 구독한 키 수를 넘지 않음 (이벤트가 쌓이지 않음)
+# - 제한: 구독당 최대 STATS_STREAM_MAX_CODES개 키, 워커당 최대 STATS_STREAM_MAX_SUBSCRIBERS개 구독 (넘으면 503)
+# - 응답이 계속 열려 있으므로 요청 수락 제어 / 느린 요청 캡처 대상에서 제외 (app/monitoring/admission.py, profiler.py)
+
+import asyncio
+import json
+import logging
+import os
+
+from app.monitoring.metrics import Counter, Gauge
+from app.shortener.queries import find_click_counts
+
+logger = logging.getLogger(__name__)
+
+STATS_STREAM_TICK_SECONDS = float(os.getenv("STATS_STREAM_TICK_SECONDS", 1.0))
+STATS_STREAM_KEEPALIVE_SECONDS = float(os.getenv("STATS_STREAM_KEEPALIVE_SECONDS", 15))
+STATS_STREAM_MAX_CODES = int(os.getenv("STATS_STREAM_MAX_CODES", 100))
+STATS_STREAM_MAX_SUBSCRIBERS = int(os.getenv("STATS_STREAM_MAX_SUBSCRIBERS", 1000))
+
+stats_stream_subscribers = Gauge("stats_stream_subscribers", "Open click stream subscriptions")
+stats_stream_reads = Counter("stats_stream_reads_total", "Click stream producer reads", labelnames=("result",))
+stats_stream_events = Counter("stats_stream_events_total", "Click stream events sent", labelnames=("event",))
+
+_MISSING = object()
+
+
+def _read_counts(short_codes: list[str]) -> dict[str, tuple[int, int]]:
+    from app.db.database import SessionLocal
+
+    with SessionLocal() as db:
+        return find_click_counts(db, short_codes)
+
+
+class _Subscriber:
+    """구독 하나: 보내지 못한 변경을 키별로 합쳐 둠"""
+    __slots__ = ("codes", "kind", "pending", "ready")
+
+    def __init__(self, codes: frozenset[str]):
+        self.codes = codes
+        self.kind = "snapshot"  # 첫 이벤트는 전체 합계
+        self.pending: dict[str, dict | None] = {}
+        self.ready = asyncio.Event()
+
+    def push_snapshot(self, counts: dict[str, tuple[int, int]]):
+        self.pending = {
+            code: {"clicks": counts[code][0], "bot_clicks": counts[code][1]} if code in counts else None
+            for code in self.codes
+        }
+        self.ready.set()
+
+    def push_changes(self, changes: dict[str, tuple[tuple[int, int], tuple[int, int] | None]]):
+        for code, ((clicks, bots), previous) in changes.items():
+            if self.kind == "snapshot":
+                # 아직 보내지 못한 snapshot은 합계만 최신으로
+                self.pending[code] = {"clicks": clicks, "bot_clicks": bots}
+                continue
+            old_clicks, old_bots = previous or (0, 0)
+            entry = self.pending.get(code)
+            if entry is None:
+                entry = self.pending[code] = {"delta": 0, "bot_delta": 0}
+            entry["clicks"], entry["bot_clicks"] = clicks, bots
+            entry["delta"] += clicks - old_clicks
+            entry["bot_delta"] += bots - old_bots
+        self.ready.set()
+
+    def take(self) -> tuple[str, dict]:
+        kind, payload = self.kind, self.pending
+        self.kind, self.pending = "clicks", {}
+        self.ready.clear()
+        return kind, payload
+
+
+class ClickStreamHub:
+    """
+    워커(이벤트 루프)당 하나인 클릭 수 생산자 + 구독 목록
+    - read: 단축 키 목록 -> {short_code: (clicks, bot_clicks)} (테스트에서 교체)
+    """
+
+    def __init__(self, tick: float = STATS_STREAM_TICK_SECONDS, max_subscribers: int = STATS_STREAM_MAX_SUBSCRIBERS,
+                 keepalive: float = STATS_STREAM_KEEPALIVE_SECONDS, read=_read_counts):
+        self.tick = tick
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive
+        self.read = read
+        self._subscribers: set[_Subscriber] = set()
+        self._last: dict[str, tuple[int, int] | None] = {}
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self, short_codes) -> _Subscriber:
+        subscriber = _Subscriber(frozenset(short_codes))
+        self._subscribers.add(subscriber)
+        stats_stream_subscribers.set(len(self._subscribers))
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._last = {}
+            self._task = loop.create_task(self._produce())
+        return subscriber
+
+    def unsubscribe(self, subscriber: _Subscriber):
+        self._subscribers.discard(subscriber)
+        stats_stream_subscribers.set(len(self._subscribers))
+
+    async def events(self, short_codes, limit: int | None = None):
+        """구독하고 SSE 형식 문자열을 yield합니다. (연결이 끊기면 구독 해제)"""
+        subscriber = self.subscribe(short_codes)
+        sent = 0
+        try:
+            while limit is None or sent < limit:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                kind, payload = subscriber.take()
+                stats_stream_events.labels(kind).inc()
+                yield f"event: {kind}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+                sent += 1
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def _produce(self):
+        while self._subscribers:
+            codes = sorted(frozenset().union(*(subscriber.codes for subscriber in self._subscribers)))
+            try:
+                counts = await asyncio.to_thread(self.read, codes)
+            except Exception as exc:
+                # DB 장애 중에는 이벤트 없이 keepalive만 나감, 다음 tick에 다시 시도
+                stats_stream_reads.labels("error").inc()
+                logger.warning("click stream read failed: %s", exc)
+            else:
+                stats_stream_reads.labels("ok").inc()
+                self._publish(codes, counts)
+            await asyncio.sleep(self.tick)
+
+    def _publish(self, codes: list[str], counts: dict[str, tuple[int, int]]):
+        changes = {}
+        last = {}
+        for code in codes:
+            current = counts.get(code)
+            previous = self._last.get(code, _MISSING)
+            last[code] = current
+            if previous is not _MISSING and current is not None and current != previous:
+                changes[code] = (current, previous)
+        self._last = last
+        for subscriber in list(self._subscribers):
+            if subscriber.kind == "snapshot" and not subscriber.pending:
+                subscriber.push_snapshot(counts)
+                continue
+            mine = {code: change for code, change in changes.items() if code in subscriber.codes}
+            if mine:
+                subscriber.push_changes(mine)
+
+
+stats_stream = ClickStreamHub()
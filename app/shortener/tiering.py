@@ -0,0 +1,246 @@
+# app/shortener/tiering.py: 링크 보관(cold storage) 계층 모듈
+# - 비활성화 / 만료 / 오래 클릭되지 않은(ARCHIVE_IDLE_DAYS) 링크를 urls에서 archived_urls로 옮김
+#   → urls 테이블과 short_code 인덱스 크기(깊이)가 활성 링크 수에 비례하도록 유지
+# - 배치(ARCHIVE_BATCH_SIZE)마다 한 트랜잭션: 분산 카운터 합계를 clicks에 더해 보관 행 저장,
+#   카운터 / url_targets / urls 행 삭제 (샤딩 시 각 문장은 short_code / target_hash 소유 샤드로 라우팅)
+#   - 카운터는 DELETE ... RETURNING으로 지우면서 합산 (합산과 삭제 사이에 커밋된 클릭이 사라지지 않음)
+#   - urls 행은 SELECT ... FOR UPDATE로 잠금 → 그동안의 클릭은 커밋 후 보관 행(archived_urls)에 더해짐
+#   한 번 실행에 최대 ARCHIVE_MAX_BATCHES 배치까지만 옮기고 나머지는 다음 주기로 넘김
+# - 조회: 리디렉션 / 통계는 urls에 없을 때만 보관 테이블을 조회 (app/shortener/queries.py)
+# - 복원: 재활성화(POST /shortener/v1/{short_code}/activate) 또는 보관 후 다시 클릭된 활성 링크는 urls로 되돌림
+#   (복원된 링크는 새 id를 받음, 원본 URL 중복 확인용 url_targets는 다른 링크가 쓰고 있지 않을 때만 다시 등록)
+# - 보관된 링크의 단축 키도 발급된 키이므로 새 키와 겹치지 않도록 확인 (generate_short_code / 단축 키 필터)
+#
+# 사용 예:
+#   python -m app.shortener.tiering archive
+#   python -m app.shortener.tiering restore <short_code>
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.monitoring.metrics import Counter
+from app.shortener.counters import counter_rows
+from app.shortener.crud import target_hash
+from app.shortener.events import link_events
+from app.shortener.models import URL, ArchivedURL, URLClickCounter, URLTarget
+
+logger = logging.getLogger(__name__)
+
+# 마지막 변경 / 클릭 후 이 기간이 지난 링크를 보관 (0이면 비활성 / 만료 링크만 보관)
+ARCHIVE_IDLE_DAYS = float(os.getenv("ARCHIVE_IDLE_DAYS", 180))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+ARCHIVE_MAX_BATCHES = int(os.getenv("ARCHIVE_MAX_BATCHES", 20))
+# 보관 작업 실행 간격 (0이면 비활성)
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", 3600))
+
+_NO_SYNC = {"synchronize_session": False}
+
+tiering_links = Counter("link_tiering_total", "Links moved between urls and archived_urls", labelnames=("direction",))
+
+
+def _archive_condition(now: datetime, idle_days: float):
+    """보관 대상 조건: 비활성 / 만료 / (idle_days > 0이면) 마지막 변경과 마지막 클릭이 모두 기준 시각 이전"""
+    conditions = [URL.is_active.is_(False), URL.expires_at < now]
+    if idle_days > 0:
+        cutoff = now - timedelta(days=idle_days)
+        last_clicked = (
+            select(func.max(URLClickCounter.updated_at))
+            .where(URLClickCounter.short_code == URL.short_code)
+            .scalar_subquery()
+        )
+        conditions.append(and_(
+            func.coalesce(URL.updated_at, URL.created_at) < cutoff,
+            or_(last_clicked.is_(None), last_clicked < cutoff),
+        ))
+    return or_(*conditions)
+
+
+def _archive_batch(db: Session, urls: list[URL], now: datetime) -> None:
+    """urls 행들을 보관 테이블로 옮깁니다. (커밋은 호출자가 수행)"""
+    codes = [url.short_code for url in urls]
+    # 지운 행을 그대로 합산: 따로 SELECT 후 DELETE하면 그 사이에 커밋된 증가분이 합산되지 않고 삭제됨
+    pending: dict[str, list[int]] = {}
+    for short_code, n, bots in db.execute(
+        delete(URLClickCounter).where(URLClickCounter.short_code.in_(codes))
+        .returning(URLClickCounter.short_code, URLClickCounter.n, URLClickCounter.bots),
+        execution_options=_NO_SYNC,
+    ):
+        total = pending.setdefault(short_code, [0, 0])
+        total[0] += n or 0
+        total[1] += bots or 0
+    for url in urls:
+        n, bots = pending.get(url.short_code, (0, 0))
+        db.add(ArchivedURL(
+            short_code=url.short_code, target_url=url.target_url, is_active=url.is_active,
+            clicks=(url.clicks or 0) + n, bot_clicks=(url.bot_clicks or 0) + bots,
+            created_at=url.created_at, expires_at=url.expires_at, redirect_code=url.redirect_code,
+            updated_at=url.updated_at, archived_at=now,
+        ))
+    db.execute(
+        delete(URLTarget).where(URLTarget.target_hash.in_({target_hash(url.target_url) for url in urls}),
+                                URLTarget.short_code.in_(codes)),
+        execution_options=_NO_SYNC,
+    )
+    for url in urls:
+        db.delete(url)
+
+
+def archive_links(db: Session, idle_days: float = ARCHIVE_IDLE_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE,
+                  max_batches: int = ARCHIVE_MAX_BATCHES, now: datetime | None = None) -> dict:
+    """
+    보관 대상 링크를 배치 단위로 archived_urls로 옮깁니다. (배치마다 커밋)
+    - 샤딩 시 batch_size는 샤드별 상한 (각 샤드에 LIMIT이 적용됨)
+    - 반환: {"archived": 옮긴 링크 수, "batches": 실행한 배치 수}
+    """
+    now = now or datetime.utcnow()
+    condition = _archive_condition(now, idle_days)
+    archived = batches = 0
+    while batches < max_batches:
+        # 잠금: 카운터가 없는 링크의 클릭(UPDATE urls)이 보관 중에 반영되고 사라지지 않도록
+        urls = db.query(URL).filter(condition).order_by(URL.id).limit(batch_size).with_for_update().all()
+        if not urls:
+            break
+        codes = [url.short_code for url in urls]
+        _archive_batch(db, urls, now)
+        try:
+            db.commit()
+        except IntegrityError:
+            # 다른 워커가 같은 링크를 먼저 옮긴 경우: 이번 주기는 중단
+            db.rollback()
+            logger.info("link archive batch conflicted with another worker, retrying next cycle")
+            break
+        link_events.invalidate(codes)
+        archived += len(urls)
+        batches += 1
+        if len(urls) < batch_size:
+            break
+    tiering_links.labels("archive").inc(archived)
+    return {"archived": archived, "batches": batches}
+
+
+def restore_link(db: Session, short_code: str, activate: bool = False) -> URL | None:
+    """
+    보관 링크를 urls로 되돌립니다. (분산 카운터 행과 url_targets 등록 포함, 커밋까지 수행)
+    - activate: True면 비활성 링크도 활성화
+    - 반환: 복원된 URL 객체 또는 None (보관 테이블에 없음)
+    """
+    archived = db.query(ArchivedURL).filter(ArchivedURL.short_code == short_code).first()
+    if archived is None:
+        return None
+    url = URL(
+        short_code=archived.short_code, target_url=archived.target_url,
+        is_active=True if activate else archived.is_active, clicks=archived.clicks or 0,
+        bot_clicks=archived.bot_clicks or 0, created_at=archived.created_at, expires_at=archived.expires_at,
+        redirect_code=archived.redirect_code,
+    )
+    db.add(url)
+    db.add_all(counter_rows(short_code))
+    hashed = target_hash(archived.target_url)
+    if db.query(URLTarget).filter(URLTarget.target_hash == hashed).first() is None:
+        db.add(URLTarget(target_hash=hashed, target_url=archived.target_url, short_code=short_code))
+    db.delete(archived)
+    db.commit()
+    link_events.invalidate([short_code])
+    tiering_links.labels("restore").inc()
+    db.refresh(url)
+    return url
+
+
+def restore_revived(db: Session, batch_size: int = ARCHIVE_BATCH_SIZE, now: datetime | None = None) -> int:
+    """
+    보관 후 다시 클릭된 활성 링크(updated_at > archived_at)를 urls로 되돌립니다.
+    - 반환: 복원한 링크 수 (한 번에 최대 batch_size개)
+    """
+    now = now or datetime.utcnow()
+    codes = db.scalars(
+        select(ArchivedURL.short_code)
+        .where(ArchivedURL.is_active.is_(True), ArchivedURL.updated_at > ArchivedURL.archived_at,
+               or_(ArchivedURL.expires_at.is_(None), ArchivedURL.expires_at >= now))
+        .limit(batch_size)
+    ).all()
+    restored = 0
+    for short_code in codes:
+        try:
+            if restore_link(db, short_code) is not None:
+                restored += 1
+        except IntegrityError:
+            # 다른 워커가 먼저 복원한 경우
+            db.rollback()
+    return restored
+
+
+def reactivate_link(db: Session, short_code: str) -> URL | None:
+    """
+    링크를 다시 활성화합니다. 보관된 링크는 urls로 되돌린 뒤 활성화
+    - 반환: 활성화된 URL 객체 또는 None (어느 테이블에도 없음)
+    """
+    url = db.query(URL).filter(URL.short_code == short_code).first()
+    if url is None:
+        return restore_link(db, short_code, activate=True)
+    if not url.is_active:
+        url.is_active = True
+        db.commit()
+        link_events.invalidate([short_code])
+    return url
+
+
+def run_tiering() -> dict:
+    from app.db.database import SessionLocal, get_engine
+
+    get_engine()
+    with SessionLocal() as db:
+        summary = archive_links(db)
+        summary["restored"] = restore_revived(db)
+        return summary
+
+
+def start_tiering() -> asyncio.Task | None:
+    """lifespan에서 호출: 보관 작업을 주기적으로 실행하는 태스크를 시작합니다."""
+    if ARCHIVE_INTERVAL_SECONDS <= 0:
+        return None
+    return asyncio.create_task(_tiering_loop())
+
+
+async def _tiering_loop():
+    while True:
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+        try:
+            summary = await asyncio.to_thread(run_tiering)
+        except Exception:
+            logger.exception("link tiering failed")
+        else:
+            if summary["archived"] or summary["restored"]:
+                logger.info("archived %(archived)d links, restored %(restored)d links", summary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move idle or deactivated links between urls and archived_urls")
+    parser.add_argument("command", choices=("archive", "restore"))
+    parser.add_argument("short_code", nargs="?", help="short code to restore (restore command)")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    if args.command == "restore":
+        if not args.short_code:
+            parser.error("restore requires a short code")
+        from app.db.database import SessionLocal, get_engine
+
+        get_engine()
+        with SessionLocal() as db:
+            summary = {"restored": int(restore_link(db, args.short_code) is not None)}
+    else:
+        summary = run_tiering()
+    summary["elapsed"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
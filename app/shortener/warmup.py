@@ -0,0 +1,134 @@
+# app/shortener/warmup.py: 앱 시작 시 리디렉션 캐시 warm-up 모듈
+# - 인기 링크 상위 K개를 리디렉션 캐시에 미리 적재
+#   - clicks: urls.clicks 기준 (기본값)
+#   - recent: 최근 N시간 click_logs 클릭 수 기준
+# - 필요한 컬럼(short_code, target_url, redirect_code, expires_at)만 스트리밍(yield_per)으로 배치 단위 조회
+# - 시간 예산(time budget)을 넘기면 적재를 중단해 앱 준비(readiness)를 지연시키지 않음
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.analytics.models import ClickLog
+from app.db.database import SessionLocal, get_engine
+from app.monitoring.health import readiness
+from app.shortener.cache import RedirectCache, redirect_cache
+from app.shortener.models import URL
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TOP_K = int(os.getenv("WARMUP_TOP_K", 1000))  # 0이면 warm-up 비활성화
+WARMUP_BATCH_SIZE = int(os.getenv("WARMUP_BATCH_SIZE", 500))
+WARMUP_TIME_BUDGET_SECONDS = float(os.getenv("WARMUP_TIME_BUDGET_SECONDS", 5))
+WARMUP_RANKING = os.getenv("WARMUP_RANKING", "clicks")  # "clicks" 또는 "recent"
+WARMUP_RECENT_HOURS = int(os.getenv("WARMUP_RECENT_HOURS", 24))
+
+READINESS_CHECK = "redirect_cache_warmup"
+
+
+def top_urls_query(top_k: int, ranking: str = WARMUP_RANKING, recent_hours: int = WARMUP_RECENT_HOURS):
+    """
+    warm-up 대상 (short_code, target_url, redirect_code, expires_at) 조회 쿼리를 만듭니다.
+    - ranking="clicks": 활성 URL을 urls.clicks 내림차순
+    - ranking="recent": 최근 recent_hours 시간 동안의 클릭 로그 수 내림차순
+    """
+    if ranking == "recent":
+        since = datetime.utcnow() - timedelta(hours=recent_hours)
+        recent = (
+            select(ClickLog.short_code, func.count().label("recent_clicks"))
+            .where(ClickLog.timestamp >= since)
+            .group_by(ClickLog.short_code)
+            .subquery()
+        )
+        return (
+            select(URL.short_code, URL.target_url, URL.redirect_code, URL.expires_at)
+            .join(recent, recent.c.short_code == URL.short_code)
+            .where(URL.is_active)
+            .order_by(recent.c.recent_clicks.desc())
+            .limit(top_k)
+        )
+    if ranking != "clicks":
+        raise ValueError(f"unknown warm-up ranking: {ranking}")
+    return (
+        select(URL.short_code, URL.target_url, URL.redirect_code, URL.expires_at)
+        .where(URL.is_active)
+        .order_by(URL.clicks.desc())
+        .limit(top_k)
+    )
+
+
+def warm_up_redirect_cache(
+    cache: RedirectCache = redirect_cache,
+    top_k: int = WARMUP_TOP_K,
+    batch_size: int = WARMUP_BATCH_SIZE,
+    time_budget: float = WARMUP_TIME_BUDGET_SECONDS,
+    ranking: str = WARMUP_RANKING,
+) -> dict:
+    """
+    인기 링크를 리디렉션 캐시에 적재합니다.
+    - 배치(batch_size) 단위로 스트리밍하며, 시간 예산을 넘기면 중단
+    - 캐시 크기보다 많이 적재하지 않음
+    - 반환: {"loaded": 적재 수, "timed_out": 시간 초과 여부, "elapsed": 소요 시간}
+    """
+    started = time.monotonic()
+    deadline = started + time_budget
+    limit = min(top_k, cache.max_entries)
+    loaded = 0
+    timed_out = False
+
+    get_engine()
+    db = SessionLocal()
+    try:
+        statement = top_urls_query(limit, ranking).execution_options(yield_per=batch_size)
+        result = db.execute(statement)
+        for batch in result.partitions():
+            # 인기 순으로 적재하므로 시간 예산 안에서 가장 인기 있는 링크부터 캐시에 올라감
+            for short_code, target_url, redirect_code, expires_at in batch:
+                cache.put(short_code, target_url, redirect_code, expires_at)
+            loaded += len(batch)
+            if time.monotonic() > deadline:
+                timed_out = True
+                break
+        result.close()
+    finally:
+        db.close()
+
+    return {"loaded": loaded, "timed_out": timed_out, "elapsed": round(time.monotonic() - started, 3)}
+
+
+def start_warmup(time_budget: float = WARMUP_TIME_BUDGET_SECONDS) -> asyncio.Task | None:
+    """
+    lifespan에서 호출: warm-up을 백그라운드 태스크로 시작합니다.
+    - 요청을 받기 시작하기 전에 readiness에 pending으로 등록
+    - 반환: 실행 중인 태스크 (비활성화된 경우 None)
+    """
+    if WARMUP_TOP_K <= 0:
+        readiness.mark_done(READINESS_CHECK, status="disabled")
+        return None
+    readiness.add_pending(READINESS_CHECK)
+    return asyncio.create_task(_run_warmup(time_budget))
+
+
+async def _run_warmup(time_budget: float):
+    """
+    DB 작업은 스레드에서 실행하고, 시간 예산이 지나면 결과를 기다리지 않고 ready 처리
+    - 실패해도 앱은 계속 동작 (캐시 없이 DB 조회)
+    """
+    try:
+        summary = await asyncio.wait_for(
+            asyncio.to_thread(warm_up_redirect_cache, time_budget=time_budget),
+            timeout=time_budget,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("redirect cache warm-up exceeded %.1fs budget", time_budget)
+        readiness.mark_done(READINESS_CHECK, status="timeout", loaded=len(redirect_cache))
+    except Exception:
+        logger.exception("redirect cache warm-up failed")
+        readiness.mark_done(READINESS_CHECK, status="failed")
+    else:
+        status = "timeout" if summary["timed_out"] else "ok"
+        readiness.mark_done(READINESS_CHECK, status=status, **summary)
@@ -0,0 +1,159 @@
+# app/utils/bloom.py: Bloom 필터 모듈
+# - BloomFilter: 고정 크기 비트 배열 + k개 해시 (double hashing)
+# - ScalableBloomFilter: 용량이 차면 더 큰 필터를 추가해 오탐률 상한을 유지 (Almeida et al., 2007)
+#   - 새 필터는 용량 growth배, 오탐률 tightening배 → 전체 오탐률 ≤ error_rate / (1 - tightening)
+# - to_bytes() / from_bytes()로 직렬화해 파일 스냅샷으로 공유 가능
+#
+# Bloom 필터는 "확실히 없음"만 보장합니다. 포함된다고 답해도 실제로는 없을 수 있음(오탐).
+# 삭제는 지원하지 않습니다.
+
+import hashlib
+import math
+import struct
+
+_HEADER = struct.Struct(">QQdI")  # capacity, count, error_rate, hash_count
+_MAGIC = b"SBF1"
+
+
+def _hashes(item: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """
+    고정 용량 Bloom 필터
+    - capacity: 예상 최대 항목 수
+    - error_rate: capacity개를 넣었을 때 목표 오탐률
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and 0 < error_rate < 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bit_count = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        self.bit_count = bit_count
+        self.bits = bytearray((bit_count + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        h1, h2 = _hashes(item)
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def add(self, item: str) -> bool:
+        """항목을 추가합니다. 새로 추가된 경우(기존에 없던 비트가 있었던 경우) True"""
+        added = False
+        bits = self.bits
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def expected_fp_rate(self) -> float:
+        """현재 항목 수 기준 예상 오탐률: (1 - e^(-kn/m))^k"""
+        return (1 - math.exp(-self.hash_count * self.count / self.bit_count)) ** self.hash_count
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(self.capacity, self.count, self.error_rate, self.hash_count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        capacity, count, error_rate, hash_count = _HEADER.unpack_from(data)
+        bloom = cls(capacity, error_rate)
+        if hash_count != bloom.hash_count or len(data) - _HEADER.size != len(bloom.bits):
+            raise ValueError("corrupt bloom filter data")
+        bloom.bits[:] = data[_HEADER.size:]
+        bloom.count = count
+        return bloom
+
+
+class ScalableBloomFilter:
+    """
+    항목 수가 늘어나면 자동으로 확장되는 Bloom 필터
+    - initial_capacity: 첫 필터의 용량
+    - error_rate: 목표 전체 오탐률
+    - growth: 새 필터 용량 배수
+    - tightening: 새 필터 오탐률 배수 (0 < tightening < 1)
+    """
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.5):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: list[BloomFilter] = []
+
+    def _new_filter(self) -> BloomFilter:
+        index = len(self.filters)
+        capacity = self.initial_capacity * self.growth ** index
+        # 전체 오탐률 합이 error_rate를 넘지 않도록 첫 필터는 error_rate * (1 - tightening)
+        error_rate = self.error_rate * (1 - self.tightening) * self.tightening ** index
+        bloom = BloomFilter(capacity, error_rate)
+        self.filters.append(bloom)
+        return bloom
+
+    def add(self, item: str) -> bool:
+        if item in self:
+            return False
+        current = self.filters[-1] if self.filters else None
+        if current is None or current.is_full:
+            current = self._new_filter()
+        return current.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        # 최근 필터에 새 항목이 많으므로 뒤에서부터 확인
+        return any(item in bloom for bloom in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+    def expected_fp_rate(self) -> float:
+        """필터들 중 하나라도 오탐할 확률"""
+        miss = 1.0
+        for bloom in self.filters:
+            miss *= 1 - bloom.expected_fp_rate()
+        return 1 - miss
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+    def to_bytes(self) -> bytes:
+        parts = [_MAGIC, struct.pack(">QdIdI", self.initial_capacity, self.error_rate, self.growth,
+                                     self.tightening, len(self.filters))]
+        for bloom in self.filters:
+            data = bloom.to_bytes()
+            parts.append(struct.pack(">Q", len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ScalableBloomFilter":
+        if data[:4] != _MAGIC:
+            raise ValueError("not a scalable bloom filter snapshot")
+        offset = 4
+        initial_capacity, error_rate, growth, tightening, filter_count = struct.unpack_from(">QdIdI", data, offset)
+        offset += struct.calcsize(">QdIdI")
+        scalable = cls(initial_capacity, error_rate, growth, tightening)
+        for _ in range(filter_count):
+            (length,) = struct.unpack_from(">Q", data, offset)
+            offset += 8
+            scalable.filters.append(BloomFilter.from_bytes(data[offset:offset + length]))
+            offset += length
+        return scalable
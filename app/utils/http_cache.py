@@ -0,0 +1,72 @@
+# app/utils/http_cache.py: HTTP 조건부 요청(conditional GET) 유틸리티
+# - 응답 본문으로 ETag 계산, 변경 시각으로 Last-Modified 설정
+# - If-None-Match / If-Modified-Since가 일치하면 본문 없이 304 Not Modified 반환
+#   (대시보드처럼 같은 리소스를 주기적으로 조회하는 클라이언트의 전송량 절감)
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+# 클라이언트가 캐시해 두되, 사용할 때마다 서버에 재검증하도록 함
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def http_date(value: datetime) -> str:
+    """naive datetime은 UTC로 간주해 HTTP 날짜 형식으로 변환합니다."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # 약한 비교: W/ 접두사는 무시
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP 날짜는 초 단위이므로 초 미만은 버리고 비교
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(request: Request, content, last_modified: datetime | None = None,
+                         cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    """
+    JSON 응답에 ETag / Last-Modified를 붙이고, 조건부 요청이면 304를 반환합니다.
+    - content: JSON으로 직렬화할 응답 데이터
+    - last_modified: 리소스의 마지막 변경 시각 (None이면 Last-Modified 생략)
+    - If-None-Match가 있으면 If-Modified-Since보다 우선 (RFC 9110)
+    """
+    body = json.dumps(jsonable_encoder(content), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    etag = compute_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,50 @@
+# app/utils/ipaddr.py: IP 주소 변환 유틸리티 모듈
+# - parse_ip: 문자열 -> (버전, 정수) (socket.inet_pton 사용, ipaddress 모듈보다 빠름)
+# - pack_ip / unpack_ip: 16바이트 고정 길이 표현 (IPv4는 IPv4-mapped IPv6 ::ffff:a.b.c.d)
+#   → 바이트 순서 = 주소 순서이므로 DB에서 범위 / 접두사 비교 가능
+# - IP가 아닌 값(예: 테스트 클라이언트의 "testclient", 유닉스 소켓)은 None
+
+import socket
+
+_V4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+
+
+def parse_ip(value: str | None) -> tuple[int, int] | None:
+    """IP 문자열을 (4 또는 6, 정수)로 변환합니다. IPv4-mapped IPv6는 IPv4로 취급"""
+    if not value:
+        return None
+    try:
+        if ":" not in value:
+            return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, value), "big")
+        packed = socket.inet_pton(socket.AF_INET6, value.split("%", 1)[0])
+    except (OSError, ValueError):
+        return None
+    if packed[:12] == _V4_MAPPED_PREFIX:
+        return 4, int.from_bytes(packed[12:], "big")
+    return 6, int.from_bytes(packed, "big")
+
+
+def pack_ip(value: str | None) -> bytes | None:
+    """IP 문자열을 16바이트로 변환합니다. IP가 아니면 None"""
+    parsed = parse_ip(value)
+    if parsed is None:
+        return None
+    version, number = parsed
+    if version == 4:
+        return _V4_MAPPED_PREFIX + number.to_bytes(4, "big")
+    return number.to_bytes(16, "big")
+
+
+def unpack_ip(packed: bytes | None) -> str | None:
+    """pack_ip()의 역변환"""
+    if packed is None:
+        return None
+    packed = bytes(packed)
+    if packed[:12] == _V4_MAPPED_PREFIX:
+        return socket.inet_ntop(socket.AF_INET, packed[12:])
+    return socket.inet_ntop(socket.AF_INET6, packed)
+
+
+def normalize_ip(value: str | None) -> str | None:
+    """정규화된 IP 문자열 (IP가 아니면 None)"""
+    return unpack_ip(pack_ip(value))
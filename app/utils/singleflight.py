@@ -0,0 +1,120 @@
+# app/utils/singleflight.py: 동시 요청 병합(single-flight) 모듈
+# - 같은 키로 동시에 들어온 호출 중 첫 호출(leader)만 함수를 실행하고, 나머지(follower)는 그 결과를 함께 받음
+#   (인기 링크 / 재시작 직후 같은 단축 키에 대한 같은 조회가 수백 번 동시에 실행되는 것을 방지)
+# - 결과는 캐시하지 않음: 실행이 끝나면 키를 바로 제거하므로 이후 호출은 다시 실행 (메모리가 쌓이지 않음)
+# - 예외도 결과처럼 공유: leader의 예외를 follower도 그대로 받음
+# - 대기 시간 초과(timeout): follower는 기다리지 않고 직접 실행 (leader가 멈춰도 요청이 같이 멈추지 않음)
+# - SingleFlight: 스레드용 (동기 엔드포인트는 스레드풀에서 실행됨)
+# - AsyncSingleFlight: 이벤트 루프용 (공유 실행은 별도 태스크라 leader가 취소되어도 follower는 결과를 받음)
+#
+# 주의: follower는 leader가 조회를 시작한 시점의 결과를 받습니다. 호출 직전에 자신이 쓴 데이터를 읽어야 하는
+#       조회(쓰기 직후 확인 등)에는 사용하지 않습니다. 결과가 어느 DB에서 왔는지도 구분하지 않으므로
+#       여러 DB(primary / 복제본)를 읽는 호출은 DB를 키에 포함합니다. (app/shortener/crud.py)
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.monitoring.metrics import Counter
+
+singleflight_calls = Counter(
+    "singleflight_calls_total", "Single-flight calls by role", labelnames=("name", "result")
+)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    스레드 간 동시 호출 병합
+    - name: 메트릭 라벨
+    - timeout: follower가 leader를 기다리는 최대 시간(초), 넘으면 직접 실행
+    """
+
+    def __init__(self, name: str, timeout: float = 2.0):
+        self.timeout = timeout
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._metrics = {result: singleflight_calls.labels(name, result) for result in ("leader", "shared", "timeout")}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """key로 진행 중인 실행이 있으면 그 결과를, 없으면 fn(*args, **kwargs)를 실행한 결과를 반환합니다."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                self._metrics["timeout"].inc()
+                return fn(*args, **kwargs)
+            self._metrics["shared"].inc()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        self._metrics["leader"].inc()
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    이벤트 루프 안의 동시 호출 병합 (한 이벤트 루프에서만 사용)
+    - name: 메트릭 라벨
+    - timeout: follower가 공유 실행을 기다리는 최대 시간(초), 넘으면 직접 실행
+    """
+
+    def __init__(self, name: str, timeout: float = 2.0):
+        self.timeout = timeout
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._metrics = {result: singleflight_calls.labels(name, result) for result in ("leader", "shared", "timeout")}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """key로 진행 중인 실행이 있으면 그 결과를, 없으면 await fn(*args, **kwargs) 결과를 반환합니다."""
+        task = self._tasks.get(key)
+        if task is None:
+            self._metrics["leader"].inc()
+            task = self._tasks[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda done: self._forget(key, done))
+            # leader가 취소되어도 공유 실행은 계속됨 (follower가 결과를 받음)
+            return await asyncio.shield(task)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            if task.done():
+                # shield 안의 실행 자체가 TimeoutError를 낸 경우
+                raise
+            self._metrics["timeout"].inc()
+            return await fn(*args, **kwargs)
+        self._metrics["shared"].inc()
+        return result
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # 아무도 기다리지 않은 예외의 "never retrieved" 경고 방지
@@ -0,0 +1,93 @@
+# benchmarks/batch.py: 배치 분석 API 벤치마크 모듈
+# - 링크 N개(링크마다 클릭 로그 --clicks개)의 리포트를 두 방식으로 만들어 비교
+#   - per_link: 링크마다 GET /shortener/v1/stats/{code} + GET /analytics/v1/{code} (기존 리포트 작업)
+#   - batch: POST /analytics/v1/batch 한 번 (청크마다 쿼리 2번, NDJSON 스트림)
+# - 지연시간은 링크 하나(per_link) / 요청 하나(batch) 단위, throughput_rps는 초당 처리한 링크 수
+# - queries: 실행된 SQL 문장 수
+#
+# 사용 예:
+#   python -m benchmarks.batch --links 5000 --output bench-results/batch.json
+
+import argparse
+import time
+
+from benchmarks.common import percentiles, prepare_environment, print_table, reset_schema, save_results
+
+
+def seed_links(count: int, clicks: int) -> list[str]:
+    from app.analytics.models import ClickLog
+    from app.db.database import SessionLocal
+    from app.shortener.models import URL
+
+    codes = [f"r{i:07d}" for i in range(count)]
+    with SessionLocal() as db:
+        for start in range(0, count, 5000):
+            batch = codes[start:start + 5000]
+            db.add_all(URL(short_code=code, target_url=f"https://example.com/{code}", clicks=clicks) for code in batch)
+            db.add_all(ClickLog(short_code=code, client_ip="10.0.0.1", user_agent="bench")
+                       for code in batch for _ in range(clicks))
+            db.commit()
+    return codes
+
+
+def per_link(client, codes: list[str]) -> dict:
+    from app.db.query_counter import count_queries
+
+    samples = []
+    started = time.perf_counter()
+    with count_queries() as counter:
+        for code in codes:
+            t0 = time.perf_counter()
+            client.get(f"/shortener/v1/stats/{code}")
+            client.get(f"/analytics/v1/{code}")
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    row = percentiles(samples)
+    row["throughput_rps"] = len(codes) / elapsed if elapsed else 0.0
+    row["queries"] = counter.count
+    return row
+
+
+def batch(client, codes: list[str]) -> dict:
+    from app.db.query_counter import count_queries
+
+    started = time.perf_counter()
+    with count_queries() as counter:
+        res = client.post("/analytics/v1/batch", json={"short_codes": codes})
+    elapsed = time.perf_counter() - started
+    assert res.text.count("\n") == len(codes)
+    row = percentiles([elapsed])
+    row["throughput_rps"] = len(codes) / elapsed if elapsed else 0.0
+    row["queries"] = counter.count
+    return row
+
+
+def run(links: int, clicks: int) -> dict:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    reset_schema()
+    codes = seed_links(links, clicks)
+    client = TestClient(app)
+    return {"batch.per_link": per_link(client, codes), "batch.batch": batch(client, codes)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the batch analytics endpoint against per-link requests")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--links", type=int, default=5000)
+    parser.add_argument("--clicks", type=int, default=3, help="링크마다 저장할 클릭 로그 수")
+    parser.add_argument("--output", default="bench-results/batch.json")
+    args = parser.parse_args(argv)
+
+    database_url = prepare_environment(args.database_url)
+    results = run(args.links, args.clicks)
+    print_table(results)
+    for name, row in sorted(results.items()):
+        print(f"  {name}: {row['queries']} queries")
+    save_results(args.output, "batch", database_url, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bulk.py: 대량 비활성화 벤치마크 모듈
+# - 링크 N개를 만든 뒤 같은 수의 단축 키를 두 방식으로 비활성화해 비교
+#   - per_code: 키마다 deactivate_url_from_db (SELECT + UPDATE + 커밋, DELETE /{short_code}와 같은 경로)
+#   - bulk_c<K>: bulk_deactivate_urls (K개씩 UPDATE ... RETURNING + 커밋 한 번)
+# - 지연시간은 키 하나(per_code) / 청크 하나(bulk) 단위, throughput_rps는 초당 비활성화한 링크 수
+#
+# 사용 예:
+#   python -m benchmarks.bulk --links 20000 --chunk-sizes 100 1000 --output bench-results/bulk.json
+
+import argparse
+import time
+
+from benchmarks.common import percentiles, prepare_environment, print_table, reset_schema, save_results
+
+
+def seed_links(count: int, prefix: str) -> list[str]:
+    """비활성화 대상 링크를 한 번에 저장합니다. (create_url의 키 생성 / 중복 확인은 측정 대상이 아님)"""
+    from app.db.database import SessionLocal
+    from app.shortener.crud import target_hash
+    from app.shortener.models import URL, URLTarget
+
+    codes = [f"{prefix}{i:07d}" for i in range(count)]
+    with SessionLocal() as db:
+        for start in range(0, count, 5000):
+            batch = codes[start:start + 5000]
+            db.add_all(URL(short_code=code, target_url=f"https://example.com/{code}") for code in batch)
+            db.add_all(URLTarget(target_hash=target_hash(f"https://example.com/{code}"),
+                                 target_url=f"https://example.com/{code}", short_code=code) for code in batch)
+            db.commit()
+    return codes
+
+
+def per_code(codes: list[str]) -> dict:
+    from app.db.database import SessionLocal
+    from app.shortener.crud import deactivate_url_from_db
+
+    samples = []
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for code in codes:
+            t0 = time.perf_counter()
+            deactivate_url_from_db(db, code)
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    row = percentiles(samples)
+    row["throughput_rps"] = len(codes) / elapsed if elapsed else 0.0
+    return row
+
+
+def bulk(codes: list[str], chunk_size: int) -> dict:
+    from app.db.database import SessionLocal
+    from app.shortener.crud import bulk_deactivate_urls
+
+    samples = []
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for start in range(0, len(codes), chunk_size):
+            t0 = time.perf_counter()
+            bulk_deactivate_urls(db, codes[start:start + chunk_size], chunk_size=chunk_size)
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    row = percentiles(samples)
+    row["throughput_rps"] = len(codes) / elapsed if elapsed else 0.0
+    return row
+
+
+def run(links: int, chunk_sizes: list[int]) -> dict:
+    reset_schema()
+    results = {"bulk.per_code": per_code(seed_links(links, "p"))}
+    for chunk_size in chunk_sizes:
+        results[f"bulk.bulk_c{chunk_size}"] = bulk(seed_links(links, f"b{chunk_size}_"), chunk_size)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bulk deactivation against the per-code loop")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--links", type=int, default=20_000, help="방식마다 비활성화할 링크 수")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--output", default="bench-results/bulk.json")
+    args = parser.parse_args(argv)
+
+    database_url = prepare_environment(args.database_url)
+    results = run(args.links, args.chunk_sizes)
+    print_table(results)
+    baseline = results["bulk.per_code"]["throughput_rps"]
+    for name, row in sorted(results.items()):
+        if name != "bulk.per_code" and baseline:
+            print(f"  {name}: {row['throughput_rps'] / baseline:.1f}x links/s vs per_code")
+    save_results(args.output, "bulk", database_url, results)
+
+
+if __name__ == "__main__":
+    main()
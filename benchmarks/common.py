@@ -0,0 +1,116 @@
+# benchmarks/common.py: 벤치마크 공통 유틸리티 모듈
+# - 벤치마크용 DB 환경 준비 (기본: 임시 SQLite 파일, 옵션: 로컬 Postgres)
+# - 지연시간 샘플의 백분위수(p50/p95/p99) 계산
+# - 결과를 JSON으로 저장/로드하여 실행 간 비교 가능하게 함
+#
+# app 모듈은 import 시점에 DATABASE_URL을 읽으므로,
+# 반드시 prepare_environment()를 먼저 호출한 뒤 app 모듈을 import 해야 합니다.
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+DEFAULT_CONCURRENCY = [1, 8, 32]
+
+
+def prepare_environment(database_url: str | None = None) -> str:
+    """
+    벤치마크용 DATABASE_URL을 설정합니다.
+    - database_url: 사용할 DB URL (없으면 임시 디렉터리의 SQLite 파일)
+    - 반환: 실제로 사용된 DB URL
+    """
+    if database_url is None:
+        workdir = tempfile.mkdtemp(prefix="shortener-bench-")
+        database_url = f"sqlite:///{workdir}/bench.db"
+    os.environ["DATABASE_URL"] = database_url
+    return database_url
+
+
+def reset_schema():
+    """벤치마크마다 빈 스키마로 시작하도록 테이블을 다시 생성합니다."""
+    from app.db.database import create_all_tables, drop_all_tables
+    import app.main  # noqa: F401  (모든 모델을 메타데이터에 등록)
+
+    drop_all_tables()
+    create_all_tables()
+
+
+def percentiles(samples: list[float]) -> dict:
+    """
+    초 단위 지연시간 샘플을 밀리초 단위 요약 통계로 변환합니다.
+    - 반환: count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms
+    """
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def environment_info(database_url: str) -> dict:
+    """결과 비교 시 참고할 실행 환경 정보를 수집합니다."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=False,
+        ).stdout.strip() or None
+    except OSError:
+        revision = None
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "git_revision": revision,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": database_url.split(":", 1)[0],
+    }
+
+
+def save_results(path: str, suite: str, database_url: str, results: dict):
+    """
+    벤치마크 결과를 JSON 파일로 저장합니다.
+    - results: {"<시나리오 이름>": {지표 이름: 값}} 형태
+    """
+    payload = {
+        "suite": suite,
+        "meta": environment_info(database_url),
+        "results": results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    print(f"[bench] results saved to {path}")
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_table(results: dict):
+    """결과를 사람이 읽기 쉬운 표 형태로 출력합니다."""
+    header = f"{'scenario':<40} {'count':>7} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, row in sorted(results.items()):
+        print(
+            f"{name:<40} {row.get('count', 0):>7} {row.get('throughput_rps', 0):>9.1f} "
+            f"{row.get('p50_ms', 0):>8.3f} {row.get('p95_ms', 0):>8.3f} {row.get('p99_ms', 0):>8.3f}"
+        )
@@ -0,0 +1,74 @@
+# benchmarks/compare.py: 벤치마크 결과 비교 및 회귀 탐지 모듈
+# - 기준(baseline) JSON과 새 결과 JSON을 시나리오별로 비교
+# - 지연시간(p50/p95/p99)은 증가, 처리량(rps)은 감소를 회귀로 판단
+# - 허용 비율(--threshold)을 넘는 회귀가 있으면 종료 코드 1 반환 (CI에서 사용)
+#
+# 사용 예:
+#   python -m benchmarks.compare bench-results/base.json bench-results/load.json --threshold 0.15
+
+import argparse
+import sys
+
+from benchmarks.common import load_results
+
+# 지표 이름 -> 값이 클수록 좋은지 여부
+METRICS = {
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "throughput_rps": True,
+}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """
+    두 결과의 공통 시나리오를 비교합니다.
+    - threshold: 허용 변화율 (0.1 = 10%)
+    - 반환: 지표별 비교 행 목록 (regression 필드로 회귀 여부 표시)
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    for name in sorted(set(base_results) & set(current_results)):
+        for metric, higher_is_better in METRICS.items():
+            before = base_results[name].get(metric)
+            after = current_results[name].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            rows.append({
+                "scenario": name,
+                "metric": metric,
+                "before": before,
+                "after": after,
+                "change": change,
+                "regression": worse > threshold,
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="허용 변화율 (기본 10%%)")
+    args = parser.parse_args(argv)
+
+    rows = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    regressions = [row for row in rows if row["regression"]]
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['scenario']:<40} {row['metric']:<15} "
+            f"{row['before']:>10.3f} -> {row['after']:>10.3f} ({row['change']:+.1%}) {flag}"
+        )
+    if regressions:
+        print(f"[bench] {len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print("[bench] no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
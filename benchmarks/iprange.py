@@ -0,0 +1,98 @@
+# benchmarks/iprange.py: IP 대역 인덱스 벤치마크 모듈
+# - 합성 IPv4 대역 N개(기본 1백만)로 CSV를 만들고
+#   - CSV 최초 로드 시간 / 바이너리 캐시(<csv>.idx) 로드 시간
+#   - 조회 지연시간: 캐시 없이(_lookup) / LRU 캐시 적중(반복 방문 IP)
+#
+# 사용 예:
+#   python -m benchmarks.iprange --ranges 1000000 --lookups 200000 --output bench-results/iprange.json
+
+import argparse
+import csv
+import os
+import random
+import socket
+import tempfile
+import time
+
+from benchmarks.common import percentiles, print_table, save_results
+
+
+def write_ranges(path: str, count: int):
+    step = (1 << 32) // count
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["start_ip", "end_ip", "network", "country"])
+        for i in range(count):
+            start = i * step
+            writer.writerow([
+                socket.inet_ntoa(start.to_bytes(4, "big")),
+                socket.inet_ntoa((start + step - 2).to_bytes(4, "big")),  # 대역 사이에 빈 주소를 둠
+                f"AS{64512 + i % 1000}",
+                ("KR", "US", "JP", "DE", "BR")[i % 5],
+            ])
+
+
+def measure_lookups(lookup, ips: list[str]) -> dict:
+    samples = []
+    started = time.perf_counter()
+    for ip in ips:
+        t0 = time.perf_counter()
+        lookup(ip)
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    row = percentiles(samples)
+    row["throughput_rps"] = len(ips) / elapsed if elapsed else 0.0
+    return row
+
+
+def run(ranges: int, lookups: int, workdir: str) -> dict:
+    from app.analytics.iprange import IPRangeIndex
+
+    path = os.path.join(workdir, "ranges.csv")
+    write_ranges(path, ranges)
+
+    index = IPRangeIndex()
+    started = time.perf_counter()
+    index.load_csv(path)
+    csv_seconds = time.perf_counter() - started
+    index = IPRangeIndex()
+    started = time.perf_counter()
+    index.load_csv(path)
+    cache_seconds = time.perf_counter() - started
+
+    rng = random.Random(5)
+    ips = [socket.inet_ntoa(rng.getrandbits(32).to_bytes(4, "big")) for _ in range(lookups)]
+    visitors = ips[:1000]
+    results = {
+        "iprange.lookup_uncached": measure_lookups(index._lookup, ips),
+        "iprange.lookup_repeat_visitor": measure_lookups(index.lookup, [rng.choice(visitors) for _ in range(lookups)]),
+        "iprange.load": {
+            "count": len(index),
+            "csv_seconds": csv_seconds,
+            "cache_seconds": cache_seconds,
+            "throughput_rps": len(index) / csv_seconds if csv_seconds else 0.0,
+        },
+    }
+    for name in (path, f"{path}.idx"):
+        os.remove(name)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the in-memory IP range index")
+    parser.add_argument("--ranges", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--workdir", default=None, help="directory for the CSV (default: temp dir)")
+    parser.add_argument("--output", default="bench-results/iprange.json")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="shortener-iprange-bench-")
+    results = run(args.ranges, args.lookups, workdir)
+    print_table(results)
+    load = results["iprange.load"]
+    print(f"  load: csv {load['csv_seconds']:.2f}s, cache {load['cache_seconds']:.2f}s for {load['count']} ranges")
+    save_results(args.output, "iprange", "iprange", results)
+
+
+if __name__ == "__main__":
+    main()
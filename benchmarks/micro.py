@@ -0,0 +1,109 @@
+# benchmarks/micro.py: 핫패스 함수 마이크로 벤치마크 모듈
+# - generate_short_code: 키 생성 + 중복 확인 쿼리
+# - create_url: 중복 확인 + 키 생성 + INSERT
+# - log_click: 클릭 로그 INSERT
+# - lookup_orm / lookup_core: 리디렉션 조회를 ORM 객체 로드와 필요한 컬럼만 select()하는 방식으로 비교
+#   (요청마다 새 세션을 쓰는 것과 같도록 매번 identity map을 비움)
+# - classify_ua_cached / classify_ua_uncached: 클릭당 봇 분류 비용 (같은 UA 반복 / 매번 다른 UA)
+#
+# 사용 예:
+#   python -m benchmarks.micro --iterations 2000 --output bench-results/micro.json
+
+import argparse
+import time
+
+from benchmarks.common import (
+    percentiles,
+    prepare_environment,
+    print_table,
+    reset_schema,
+    save_results,
+)
+
+
+def measure(fn, iterations: int, warmup: int = 20) -> dict:
+    """
+    fn(i)를 iterations 번 호출하며 호출별 지연시간을 측정합니다.
+    - 반환: 백분위수 요약 + 초당 호출 수(throughput_rps)
+    """
+    for i in range(warmup):
+        fn(-1 - i)
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    row = percentiles(samples)
+    row["throughput_rps"] = iterations / elapsed if elapsed else 0.0
+    return row
+
+
+def run(iterations: int) -> dict:
+    from app.db.database import SessionLocal
+    from app.analytics.crud import log_click
+    from app.shortener.crud import create_url, generate_short_code
+    from app.shortener.models import URL
+    from app.shortener.queries import find_redirect
+
+    reset_schema()
+    db = SessionLocal()
+    try:
+        # 중복 확인 쿼리가 빈 테이블을 조회하지 않도록 미리 일부 데이터를 채워 둠
+        seeded = create_url(db, target_url="https://example.com/micro/seed").short_code
+        results = {
+            "micro.generate_short_code": measure(lambda i: generate_short_code(db), iterations),
+            "micro.create_url": measure(
+                lambda i: create_url(db, target_url=f"https://example.com/micro/{i}"), iterations
+            ),
+            "micro.log_click": measure(
+                lambda i: log_click(db, code=seeded, client_ip="127.0.0.1", user_agent="bench"),
+                iterations,
+            ),
+        }
+        db.commit()
+
+        def lookup_orm(i):
+            db.expunge_all()
+            return db.query(URL).filter(URL.short_code == seeded).first()
+
+        def lookup_core(i):
+            db.expunge_all()
+            return find_redirect(db, seeded)
+
+        results["micro.lookup_orm"] = measure(lookup_orm, iterations)
+        results["micro.lookup_core"] = measure(lookup_core, iterations)
+
+        from app.analytics.bots import BotClassifier
+
+        classifier = BotClassifier()
+        agents = [
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)",
+        ]
+        results["micro.classify_ua_cached"] = measure(lambda i: classifier.is_bot(agents[i % 2]), iterations)
+        # 캐시를 쓰지 않는 경로 (처음 보는 UA마다 드는 비용)
+        results["micro.classify_ua_uncached"] = measure(
+            lambda i: classifier._classify(f"{agents[0]} build/{i}"), iterations
+        )
+    finally:
+        db.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="URL shortener micro benchmarks")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--output", default="bench-results/micro.json")
+    args = parser.parse_args(argv)
+
+    database_url = prepare_environment(args.database_url)
+    results = run(args.iterations)
+    print_table(results)
+    save_results(args.output, "micro", database_url, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/overload.py: 과부하 시 요청 수락 제어(admission control) 벤치마크 모듈
+# - DB가 느려진 상황을 흉내 낸 ASGI 앱에 리디렉션 / 분석 요청을 분류별 고정 도착률로 보냄(열린 부하)
+#   - 모든 요청은 크기가 제한된 스레드풀(--threads, get_db 뒤 스레드풀 역할)에서 처리
+#   - 리디렉션: 캐시 적중처럼 --redirect-ms만 걸림, 분석: --slow-ms (느려진 DB 쿼리)
+# - 비교 대상
+#   - no_admission: 제한 없이 모두 스레드풀 대기열로 (리디렉션도 느린 요청 뒤에서 대기)
+#   - admission: AdmissionMiddleware 적용 (분석 요청은 한도 / 과부하 판정으로 빠르게 503)
+# - 분류별 지연시간(p50/p95/p99)과 503 비율을 기록
+#
+# 사용 예:
+#   python -m benchmarks.overload --redirect-rps 500 --analytics-rps 300 --output bench-results/overload.json
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import percentiles, print_table, save_results
+
+
+def make_app(threads: int, redirect_ms: float, slow_ms: float):
+    executor = ThreadPoolExecutor(max_workers=threads)
+
+    async def app(scope, receive, send):
+        seconds = (redirect_ms if scope["path"].startswith("/shortener/") else slow_ms) / 1000
+        await asyncio.get_running_loop().run_in_executor(executor, time.sleep, seconds)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app, executor
+
+
+async def drive(app, duration: float, redirect_rps: float, analytics_rps: float) -> dict:
+    """열린 부하(open loop): 응답을 기다리지 않고 분류별 고정 도착률로 요청을 보냄"""
+    import httpx
+
+    samples = {"redirect": [], "analytics": []}
+    shed = {"redirect": 0, "analytics": 0}
+    transport = httpx.ASGITransport(app=app)
+
+    async def one(client, kind: str, path: str):
+        t0 = time.perf_counter()
+        res = await client.get(path)
+        if res.status_code == 503:
+            shed[kind] += 1
+        else:
+            samples[kind].append(time.perf_counter() - t0)
+
+    async def arrivals(client, kind: str, path: str, rps: float, tasks: list):
+        interval = 1 / rps
+        started = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - started < duration:
+            tasks.append(asyncio.create_task(one(client, kind, path)))
+            sent += 1
+            # 밀린 만큼 몰아서 보내지 않도록 목표 시각 기준으로 대기
+            await asyncio.sleep(max(0.0, started + sent * interval - time.perf_counter()))
+
+    tasks: list[asyncio.Task] = []
+    started = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.gather(
+            arrivals(client, "redirect", "/shortener/v1/abc123", redirect_rps, tasks),
+            arrivals(client, "analytics", "/analytics/v1/abc123", analytics_rps, tasks),
+        )
+        await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for kind, values in samples.items():
+        row = percentiles(values)
+        row["throughput_rps"] = len(values) / elapsed if elapsed else 0.0
+        row["shed"] = shed[kind]
+        row["shed_ratio"] = shed[kind] / max(1, shed[kind] + len(values))
+        results[kind] = row
+    return results
+
+
+def run(duration: float, redirect_rps: float, analytics_rps: float, threads: int, redirect_ms: float,
+        slow_ms: float, max_in_flight: int) -> dict:
+    from app.monitoring.admission import AdmissionController, AdmissionMiddleware
+
+    results = {}
+    for mode in ("no_admission", "admission"):
+        app, executor = make_app(threads, redirect_ms, slow_ms)
+        if mode == "admission":
+            app = AdmissionMiddleware(app, controller=AdmissionController(max_in_flight=max_in_flight))
+        try:
+            for kind, row in asyncio.run(drive(app, duration, redirect_rps, analytics_rps)).items():
+                results[f"overload.{mode}.{kind}"] = row
+        finally:
+            executor.shutdown(wait=False)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Redirect latency under overload with and without admission control")
+    parser.add_argument("--duration", type=float, default=10.0, help="모드마다 부하를 보내는 시간(초)")
+    parser.add_argument("--redirect-rps", type=float, default=500.0)
+    parser.add_argument("--analytics-rps", type=float, default=300.0,
+                        help="기본값은 스레드풀이 감당할 수 있는 양(threads / slow-ms)보다 많음")
+    parser.add_argument("--threads", type=int, default=40, help="스레드풀 크기 (Starlette 기본값 40)")
+    parser.add_argument("--redirect-ms", type=float, default=1.0)
+    parser.add_argument("--slow-ms", type=float, default=200.0, help="느려진 DB에서 분석 요청 처리 시간")
+    parser.add_argument("--max-in-flight", type=int, default=32)
+    parser.add_argument("--output", default="bench-results/overload.json")
+    args = parser.parse_args(argv)
+
+    results = run(args.duration, args.redirect_rps, args.analytics_rps, args.threads, args.redirect_ms,
+                  args.slow_ms, args.max_in_flight)
+    print_table(results)
+    for name, row in sorted(results.items()):
+        print(f"  {name}: shed {row['shed']} ({row['shed_ratio']:.1%})")
+    save_results(args.output, "overload", "none", results)
+
+
+if __name__ == "__main__":
+    main()
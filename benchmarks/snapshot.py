@@ -0,0 +1,104 @@
+# benchmarks/snapshot.py: 리디렉션 스냅샷(mmap) 벤치마크 모듈
+# - 합성 링크 N개(기본 1천만)로 스냅샷 파일을 만들고 (DB 없이 write_snapshot 직접 호출)
+#   - 파일 크기 / 링크당 바이트
+#   - 스냅샷을 연 뒤 조회하며 늘어난 RSS(상주 메모리)
+#   - 존재하는 키 / 없는 키 조회 지연시간
+#
+# 사용 예:
+#   python -m benchmarks.snapshot --links 10000000 --lookups 200000 --output bench-results/snapshot.json
+
+import argparse
+import os
+import random
+import secrets
+import tempfile
+import time
+
+from benchmarks.common import percentiles, print_table, save_results
+
+
+def _rss_bytes() -> int:
+    """현재 RSS (Linux /proc 기준, 그 외 플랫폼은 0)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def synthetic_rows(links: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(links):
+        code = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_") for _ in range(6))
+        yield code, f"https://example.com/articles/{i}/{secrets.token_hex(6)}", None, None
+
+
+def measure_lookups(snapshot, codes: list[str]) -> dict:
+    lookup = snapshot.lookup
+    samples = []
+    started = time.perf_counter()
+    for code in codes:
+        t0 = time.perf_counter()
+        lookup(code)
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    row = percentiles(samples)
+    row["throughput_rps"] = len(codes) / elapsed if elapsed else 0.0
+    return row
+
+
+def run(links: int, lookups: int, workdir: str) -> dict:
+    from app.shortener.snapshot import RedirectSnapshot, write_snapshot
+
+    path = os.path.join(workdir, "bench.snap")
+    started = time.perf_counter()
+    summary = write_snapshot(path, synthetic_rows(links))
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(11)
+    sample_rows = synthetic_rows(min(links, lookups))  # 같은 시드 → 실제로 들어 있는 키
+    hits = [code for code, _, _, _ in sample_rows]
+    misses = ["".join(rng.choice("abcdefghij") for _ in range(7)) for _ in range(lookups)]
+
+    rss_before = _rss_bytes()
+    snapshot = RedirectSnapshot(path)
+    snapshot.open()
+    results = {
+        "snapshot.lookup_hit": measure_lookups(snapshot, hits),
+        "snapshot.lookup_miss": measure_lookups(snapshot, misses),
+    }
+    rss_after = _rss_bytes()
+
+    results["snapshot.build"] = {
+        "count": summary["links"],
+        "throughput_rps": summary["links"] / build_seconds if build_seconds else 0.0,
+        "build_seconds": build_seconds,
+        "file_bytes": summary["bytes"],
+        "bytes_per_link": summary["bytes"] / max(1, summary["links"]),
+        # 조회한 페이지만 상주하므로 무작위 조회 수에 따라 증가 (최대 파일 크기)
+        "rss_growth_bytes": rss_after - rss_before,
+    }
+    snapshot.close()
+    os.remove(path)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the mmap redirect snapshot")
+    parser.add_argument("--links", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--workdir", default=None, help="directory for the snapshot file (default: temp dir)")
+    parser.add_argument("--output", default="bench-results/snapshot.json")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="shortener-snap-bench-")
+    results = run(args.links, args.lookups, workdir)
+    print_table(results)
+    build = results["snapshot.build"]
+    print(f"  file: {build['file_bytes'] / 1e6:.1f} MB, {build['bytes_per_link']:.1f} B/link, "
+          f"rss +{build['rss_growth_bytes'] / 1e6:.1f} MB, build {build['build_seconds']:.1f}s")
+    save_results(args.output, "snapshot", "snapshot", results)
+
+
+if __name__ == "__main__":
+    main()
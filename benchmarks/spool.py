@@ -0,0 +1,87 @@
+# benchmarks/spool.py: 클릭 기록 경로 벤치마크 모듈
+# - 리디렉션 한 번이 클릭 기록에 쓰는 시간을 두 방식으로 비교 (record_click, 중복 억제는 끔)
+#   - database: 요청 안에서 click_logs INSERT + 카운터 UPDATE + 커밋 (CLICK_SPOOL_DIR 미설정)
+#   - spool: 로컬 세그먼트 파일 append (fsync는 백그라운드 스레드가 --fsync-ms마다)
+# - spool은 이어서 드레이너가 같은 클릭을 DB로 옮기는 처리량(drain_clicks_per_s)도 기록
+#
+# 사용 예:
+#   python -m benchmarks.spool --clicks 20000 --output bench-results/spool.json
+
+import argparse
+import tempfile
+import time
+
+from benchmarks.common import percentiles, prepare_environment, print_table, reset_schema, save_results
+
+
+def seed_link() -> str:
+    from app.db.database import SessionLocal
+    from app.shortener.models import URL
+
+    with SessionLocal() as db:
+        db.add(URL(short_code="bench01", target_url="https://example.com/bench"))
+        db.commit()
+    return "bench01"
+
+
+def record(clicks: int, short_code: str) -> dict:
+    from app.db.database import SessionLocal
+    from app.shortener.service import record_click
+
+    samples = []
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for i in range(clicks):
+            t0 = time.perf_counter()
+            record_click(db, short_code, f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", "bench")
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    row = percentiles(samples)
+    row["throughput_rps"] = clicks / elapsed if elapsed else 0.0
+    return row
+
+
+def run(clicks: int, fsync_ms: float) -> dict:
+    from app.analytics import dedup
+    from app.analytics.spool import ClickSpool
+    from app.db.database import SessionLocal
+    from app.shortener import service
+
+    dedup.click_dedup.window_seconds = 0
+    reset_schema()
+    short_code = seed_link()
+    results = {"spool.database": record(clicks, short_code)}
+
+    spool = ClickSpool(root=tempfile.mkdtemp(prefix="shortener-spool-"), fsync_ms=fsync_ms)
+    spool.open()
+    service.click_spool = spool
+    try:
+        results["spool.spool"] = record(clicks, short_code)
+        spool.sync()
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            drained = spool.drain(db)
+        elapsed = time.perf_counter() - started
+        results["spool.spool"]["drain_clicks_per_s"] = drained / elapsed if elapsed else 0.0
+    finally:
+        spool.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark click recording through the database and the local spool")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--clicks", type=int, default=20_000, help="방식마다 기록할 클릭 수")
+    parser.add_argument("--fsync-ms", type=float, default=50.0)
+    parser.add_argument("--output", default="bench-results/spool.json")
+    args = parser.parse_args(argv)
+
+    database_url = prepare_environment(args.database_url)
+    results = run(args.clicks, args.fsync_ms)
+    print_table(results)
+    print(f"  spool.spool: drained {results['spool.spool']['drain_clicks_per_s']:.0f} clicks/s")
+    save_results(args.output, "spool", database_url, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# tests/conftest.py: 테스트 공통 설정 모듈
+# - app 모듈을 import 하기 전에 임시 SQLite DB를 DATABASE_URL로 지정
+# - 테스트마다 테이블을 새로 만들고, 외부 요청을 하는 URL 검증기를 스텁으로 교체
+
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="shortener-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/test.db")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.analytics.dedup import click_dedup
+from app.db.database import create_all_tables, drop_all_tables, read_your_writes
+from app.db.query_counter import count_queries
+from app.monitoring.health import readiness
+from app.shortener.cache import redirect_cache
+from app.shortener.code_filter import code_filter
+
+
+@pytest.fixture(autouse=True)
+def reset_db():
+    """테스트마다 빈 스키마와 빈 프로세스 내 캐시로 시작합니다."""
+    drop_all_tables()
+    create_all_tables()
+    redirect_cache.clear()
+    code_filter.reset()
+    readiness.reset()
+    read_your_writes.clear()
+    click_dedup.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def stub_url_validator(monkeypatch):
+    """is_url_valid는 실제 HTTP 요청을 보내므로 항상 True를 반환하도록 교체합니다."""
+    monkeypatch.setattr("app.shortener.api.v1.is_url_valid", lambda url: True)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def query_counter():
+    """`with query_counter() as counter:` 형태로 블록 안에서 실행된 SQL을 기록합니다."""
+    return count_queries
@@ -0,0 +1,122 @@
+# 요청 수락 제어(admission control) 테스트
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.monitoring.admission import AdmissionController, AdmissionMiddleware, admission_decisions, classify
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_routes_are_classified_by_path():
+    assert classify("GET", "/shortener/v1/abc123") == "redirect"
+    assert classify("GET", "/shortener/v1/stats/abc123") == "analytics"
+    assert classify("GET", "/analytics/v1/abc123/countries") == "analytics"
+    assert classify("POST", "/shortener/v1/shorten") == "write"
+    assert classify("DELETE", "/shortener/v1/abc123") == "write"
+    assert classify("POST", "/user/v1/login/") == "auth"
+    assert classify("GET", "/internal/metrics") is None
+    assert classify("GET", "/shortener/v1/stats/stream") is None  # 오래 열려 있는 SSE 스트림
+
+
+def test_admission_control_is_off_unless_enabled():
+    # 기존 배포의 동시 처리 수를 조용히 제한하지 않도록 ADMISSION_CONTROL=1일 때만 등록 (테스트 환경은 미설정)
+    from app.main import app
+
+    assert not any(middleware.cls is AdmissionMiddleware for middleware in app.user_middleware)
+
+
+def test_low_priority_classes_hit_their_share_first():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=10, max_queue=0.05)
+        admitted = [await controller.acquire("analytics") for _ in range(6)]
+        assert all(admitted)
+        # analytics는 한도의 60%까지만: 대기 후 시간 초과로 거절
+        assert await controller.acquire("analytics") is False
+        # 리디렉션은 남은 자리를 그대로 사용
+        assert all([await controller.acquire("redirect") for _ in range(4)])
+        assert controller.in_flight == 10
+
+    asyncio.run(scenario())
+
+
+def test_waiters_are_admitted_in_priority_order():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=5, max_queue=1)  # write 한도: 4
+        assert all([await controller.acquire("redirect") for _ in range(5)])
+        order = []
+
+        async def wait(route_class):
+            if await controller.acquire(route_class):
+                order.append(route_class)
+
+        tasks = [asyncio.create_task(wait("write")), asyncio.create_task(wait("redirect"))]
+        await asyncio.sleep(0.01)
+        controller.release("redirect")
+        await asyncio.sleep(0.01)
+        assert order == ["redirect"]
+        controller.release("redirect")
+        controller.release("redirect")
+        await asyncio.gather(*tasks)
+        assert order == ["redirect", "write"]
+
+    asyncio.run(scenario())
+
+
+def test_standing_queue_switches_class_to_fast_shedding():
+    clock = FakeClock()
+
+    async def scenario():
+        controller = AdmissionController(max_in_flight=5, target=0.05, interval=0.5, max_queue=5, clock=clock)
+        state = controller.classes["write"]
+        assert await controller.acquire("write")  # 구간 시작
+        assert all([await controller.acquire("redirect") for _ in range(3)])  # write 한도(4)가 참
+        waiter = asyncio.create_task(controller.acquire("write"))
+        await asyncio.sleep(0.01)
+
+        # 구간이 끝날 때까지 대기 없이 수락된 write가 없고, 최소 대기 시간이 목표보다 김 → 과부하
+        clock.now += 1.0
+        controller.release("redirect")
+        assert await waiter is True
+        assert state.overloaded
+
+        shed_before = admission_decisions.labels("write", "shed_overloaded").value
+        controller.target = 0.01  # 과부하 중 대기 한도 (실제 시간)
+        assert await controller.acquire("write") is False  # max_queue(5초)가 아니라 target만 대기 후 거절
+        assert admission_decisions.labels("write", "shed_overloaded").value == shed_before + 1
+        # 리디렉션은 영향 없음
+        assert controller.classes["redirect"].overloaded is False
+
+        # 자리가 나서 대기 없이 수락되는 구간이 오면 회복
+        controller.release("write")
+        clock.now += 1.0
+        assert await controller.acquire("write")
+        assert not state.overloaded
+
+    asyncio.run(scenario())
+
+
+def test_middleware_returns_fast_503_with_retry_after():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    controller = AdmissionController(max_in_flight=10)
+    middleware = AdmissionMiddleware(app, controller=controller, retry_after=3)
+    client = TestClient(middleware)
+    assert client.get("/analytics/v1/abc").status_code == 200
+    assert controller.in_flight == 0
+
+    controller.in_flight = 6  # analytics 한도(60%)가 찬 상태
+    controller.classes["analytics"].overloaded = True
+    res = client.get("/analytics/v1/abc")
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "3"
+    assert client.get("/shortener/v1/abc123", follow_redirects=False).status_code == 200
+    assert client.get("/internal/metrics").status_code == 200
@@ -0,0 +1,71 @@
+# 배치 분석 API(POST /analytics/v1/batch) 테스트
+import json
+from datetime import datetime, timedelta
+
+from app.analytics.models import ClickLog
+from app.db.database import SessionLocal
+
+
+def shorten(client, target_url):
+    return client.post("/shortener/v1/shorten", json={"target_url": target_url}).json()["short_code"]
+
+
+def batch(client, **body):
+    res = client.post("/analytics/v1/batch", json=body)
+    assert res.status_code == 200, res.text
+    assert res.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def test_batch_returns_stats_and_click_counts_in_request_order(client):
+    first = shorten(client, "https://example.com/report/1")
+    second = shorten(client, "https://example.com/report/2")
+    client.get(f"/shortener/v1/{first}", follow_redirects=False)
+    client.get(f"/shortener/v1/{first}", headers={"user-agent": "Googlebot/2.1"}, follow_redirects=False)
+
+    lines = batch(client, short_codes=[second, "missing", first, second])
+    assert [line["short_code"] for line in lines] == [second, "missing", first]
+    assert lines[1] == {"short_code": "missing", "found": False}
+    assert lines[0]["clicks"] == 0 and lines[0]["logged_clicks"] == 0
+    assert lines[2]["target_url"] == "https://example.com/report/1"
+    assert (lines[2]["clicks"], lines[2]["bot_clicks"]) == (1, 1)
+    assert (lines[2]["logged_clicks"], lines[2]["logged_bot_clicks"]) == (2, 1)
+    assert lines[2]["is_active"] is True
+    assert datetime.fromisoformat(lines[2]["created_at"])
+
+
+def test_batch_time_range_applies_to_click_logs(client):
+    code = shorten(client, "https://example.com/report/range")
+    client.get(f"/shortener/v1/{code}", follow_redirects=False)
+    with SessionLocal() as db:
+        old = datetime.utcnow() - timedelta(days=30)
+        db.add(ClickLog(short_code=code, timestamp=old, client_ip="10.0.0.1", user_agent="old"))
+        db.commit()
+
+    since = (datetime.utcnow() - timedelta(days=1)).isoformat() + "+00:00"
+    [line] = batch(client, short_codes=[code], since=since)
+    assert line["logged_clicks"] == 1
+    [line] = batch(client, short_codes=[code], until=since)
+    assert line["logged_clicks"] == 1
+    [line] = batch(client, short_codes=[code])
+    assert line["logged_clicks"] == 2
+
+
+def test_batch_runs_two_queries_per_chunk(client, query_counter, monkeypatch):
+    codes = [shorten(client, f"https://example.com/report/chunk{i}") for i in range(5)]
+    for code in codes:
+        client.get(f"/shortener/v1/{code}", follow_redirects=False)
+    monkeypatch.setattr("app.analytics.crud.ANALYTICS_BATCH_CHUNK", 2)
+
+    with query_counter() as counter:
+        lines = batch(client, short_codes=codes)
+    assert [line["logged_clicks"] for line in lines] == [1] * 5
+    assert counter.count == 6, counter.report()  # 청크 3개 x (통계 조회 + GROUP BY)
+
+
+def test_batch_validates_request(client):
+    assert client.post("/analytics/v1/batch", json={"short_codes": []}).status_code == 422
+    res = client.post("/analytics/v1/batch", json={
+        "short_codes": ["abc"], "since": "2026-01-02T00:00:00", "until": "2026-01-01T00:00:00",
+    })
+    assert res.status_code == 422
@@ -0,0 +1,88 @@
+# 봇 / 크롤러 분류 테스트
+import pytest
+
+from app.analytics.bots import BotClassifier, bot_classifier
+
+BOT_AGENTS = [
+    "facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)",
+    "Slackbot-LinkExpanding 1.0 (+https://api.slack.com/robots)",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+    "WhatsApp/2.23.20.0",
+    "curl/8.4.0",
+    "python-requests/2.31.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) HeadlessChrome/120.0.0.0 Safari/537.36",
+    "Pingdom.com_bot_version_1.4_(http://www.pingdom.com/)",
+    "Pinterestbot/1.0 (+http://www.pinterest.com/bot.html)",
+    "Pinterest/0.2 (+https://www.pinterest.com/bot.html)",
+    "Mozilla/5.0 (compatible; YandexBot/3.0; +http://yandex.com/bots)",
+    "Mozilla/5.0 (compatible; YandexImages/3.0; +http://yandex.com/bots)",
+    "http.rb/5.1.1 (Mastodon/4.2.1; +https://mastodon.social/)",
+    "Mozilla/5.0 (compatible; Discordbot/2.0; +https://discordapp.com)",
+    "",
+    None,
+]
+HUMAN_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+    "Version/17.1 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0",
+]
+# 크롤러와 이름이 겹치는 실제 사용자 (앱 내 브라우저 / 앱 / 휴대폰 모델명)
+IN_APP_AGENTS = [
+    "Mozilla/5.0 (Linux; Android 13; Pixel 7 Build/TQ3A.230805.001; wv) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Version/4.0 Chrome/116.0.0.0 Mobile Safari/537.36 [Pinterest/Android]",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+    "Mobile/15E148 [Pinterest/iOS]",
+    "Mozilla/5.0 (Linux; Android 12) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 "
+    "YandexSearch/23.71 Mobile Safari/537.36",
+    "Mastodon/1356 CFNetwork/1410.0.3 Darwin/22.6.0",
+    "Mozilla/5.0 (Linux; Android 11; CUBOT X50) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 "
+    "Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 10; CUBOT_NOTE_20_PRO) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/119.0.0.0 Mobile Safari/537.36",
+]
+
+
+@pytest.mark.parametrize("user_agent", BOT_AGENTS)
+def test_bots_are_detected(user_agent):
+    assert bot_classifier.is_bot(user_agent)
+
+
+@pytest.mark.parametrize("user_agent", HUMAN_AGENTS)
+def test_browsers_are_human(user_agent):
+    assert not bot_classifier.is_bot(user_agent)
+
+
+@pytest.mark.parametrize("user_agent", IN_APP_AGENTS)
+def test_in_app_browsers_are_human(user_agent):
+    assert not bot_classifier.is_bot(user_agent)
+
+
+def test_results_are_cached_per_user_agent():
+    classifier = BotClassifier(["examplebot"], cache_size=2)
+    assert classifier.is_bot("ExampleBot/1.0")
+    assert classifier.is_bot("ExampleBot/1.0")
+    assert not classifier.is_bot("Mozilla/5.0")
+    info = classifier.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+
+def test_bot_clicks_are_tagged_and_counted_separately(client):
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/unfurl"}).json()["short_code"]
+    client.get(f"/shortener/v1/{short_code}", headers={"user-agent": HUMAN_AGENTS[0]}, follow_redirects=False)
+    client.get(f"/shortener/v1/{short_code}", headers={"user-agent": BOT_AGENTS[0]}, follow_redirects=False)
+
+    stats = client.get(f"/shortener/v1/stats/{short_code}").json()
+    assert (stats["clicks"], stats["bot_clicks"]) == (1, 1)
+    analytics = client.get(f"/analytics/v1/{short_code}").json()
+    assert (analytics["total_clicks"], analytics["bot_clicks"]) == (2, 1)
+    assert [log["is_bot"] for log in analytics["logs"]] == [False, True]
+
+
+def test_bot_rows_can_be_skipped_but_still_counted(client, monkeypatch):
+    monkeypatch.setattr("app.shortener.service.BOT_CLICKS_PERSIST", False)
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/skip"}).json()["short_code"]
+    client.get(f"/shortener/v1/{short_code}", headers={"user-agent": BOT_AGENTS[1]}, follow_redirects=False)
+
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["bot_clicks"] == 1
+    assert client.get(f"/analytics/v1/{short_code}").json()["total_clicks"] == 0
@@ -0,0 +1,104 @@
+# 단축 키 Bloom 필터 테스트
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from app.db.database import SessionLocal
+from app.monitoring.metrics import REGISTRY
+from app.shortener import crud
+from app.shortener.code_filter import ShortCodeFilter, code_filter
+from app.shortener.models import URL
+from app.utils.bloom import ScalableBloomFilter
+
+
+def test_scalable_bloom_has_no_false_negatives_and_bounded_fp_rate():
+    bloom = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+    items = [f"code{i}" for i in range(5000)]
+    for item in items:
+        bloom.add(item)
+
+    assert len(bloom.filters) > 1
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+
+    restored = ScalableBloomFilter.from_bytes(bloom.to_bytes())
+    assert all(item in restored for item in items)
+    assert len(restored) == len(bloom)
+
+
+def seed(codes):
+    with SessionLocal() as db:
+        db.add_all(URL(short_code=code, target_url=f"https://example.com/{code}", clicks=0) for code in codes)
+        db.commit()
+
+
+def test_definite_miss_skips_url_lookup(client, query_counter):
+    seed(["known1"])
+    with SessionLocal() as db:
+        code_filter.build(db, snapshot_path="")
+
+    with query_counter() as counter:
+        assert client.get("/shortener/v1/nosuch", follow_redirects=False).status_code == 404
+    assert counter.count == 0
+
+    assert client.get("/shortener/v1/known1", follow_redirects=False).status_code == 307
+
+
+def test_created_codes_are_added_and_allocation_skips_db(client, query_counter):
+    with SessionLocal() as db:
+        code_filter.build(db, snapshot_path="")
+    with query_counter() as counter:
+        short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/a"}).json()["short_code"]
+    # 중복 확인 + INSERT 3개(urls, url_click_counters, url_targets) + refresh (단축 키 존재 확인 쿼리 없음)
+    assert counter.count == 5, counter.report()
+    assert code_filter.might_exist(short_code, record=False)
+
+
+def test_code_from_other_worker_is_found_after_sync(client, monkeypatch):
+    monkeypatch.setattr("app.shortener.code_filter.BLOOM_SYNC_INTERVAL_SECONDS", 0)
+    with SessionLocal() as db:
+        code_filter.build(db, snapshot_path="")
+    seed(["elsewhere"])  # 다른 워커가 만든 링크 (이 프로세스 필터에는 없음)
+
+    assert client.get("/shortener/v1/elsewhere", follow_redirects=False).status_code == 307
+
+
+def test_row_with_skewed_created_at_is_found_after_sync(client, monkeypatch):
+    monkeypatch.setattr("app.shortener.code_filter.BLOOM_SYNC_INTERVAL_SECONDS", 0)
+    with SessionLocal() as db:
+        code_filter.build(db, snapshot_path="")
+    seed(["fresh"])
+    assert client.get("/shortener/v1/fresh", follow_redirects=False).status_code == 307
+
+    # 시계가 한 시간 늦은 워커가 만든 링크 (created_at이 이미 따라잡은 행보다 과거)
+    with SessionLocal() as db:
+        db.add(URL(short_code="skewed", target_url="https://example.com/skewed", clicks=0,
+                   created_at=datetime.utcnow() - timedelta(hours=1)))
+        db.commit()
+    assert client.get("/shortener/v1/skewed", follow_redirects=False).status_code == 307
+
+
+def test_snapshot_roundtrip_catches_up_new_rows():
+    path = os.path.join(tempfile.mkdtemp(prefix="shortener-bloom-"), "codes.bloom")
+    seed(["old1", "old2"])
+    with SessionLocal() as db:
+        first = ShortCodeFilter().build(db, snapshot_path=path)
+        assert first == {**first, "items": 2, "from_snapshot": False}
+
+        seed(["new1"])
+        second_filter = ShortCodeFilter()
+        second = second_filter.build(db, snapshot_path=path)
+    assert second["from_snapshot"]
+    assert all(second_filter.might_exist(code, record=False) for code in ("old1", "old2", "new1"))
+
+
+def test_false_positive_metric(client, monkeypatch):
+    with SessionLocal() as db:
+        code_filter.build(db, snapshot_path="")
+    monkeypatch.setattr(code_filter, "might_exist", lambda short_code, record=True: True)
+
+    assert client.get("/shortener/v1/ghost", follow_redirects=False).status_code == 404
+    assert "short_code_filter_false_positives_total" in REGISTRY.render()
+    with SessionLocal() as db:
+        assert crud.get_url(db, "ghost") is None
@@ -0,0 +1,69 @@
+# 클릭 분산 카운터 테스트
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.shortener import crud
+from app.shortener.counters import CLICK_COUNTER_SLOTS, fold_click_counters, increment
+from app.shortener.models import URL, URLClickCounter
+
+
+def counter_values(db, short_code):
+    return db.execute(
+        select(URLClickCounter.n).where(URLClickCounter.short_code == short_code).order_by(URLClickCounter.slot)
+    ).scalars().all()
+
+
+def test_clicks_spread_over_slots_and_fold_into_urls(client):
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/hot"}).json()["short_code"]
+    for i in range(40):
+        res = client.get(f"/shortener/v1/{short_code}", headers={"user-agent": f"client-{i}"}, follow_redirects=False)
+        assert res.status_code == 307
+
+    with SessionLocal() as db:
+        values = counter_values(db, short_code)
+        assert len(values) == CLICK_COUNTER_SLOTS and sum(values) == 40
+        assert sum(1 for n in values if n) > 1, "increments should not all hit one row"
+        assert db.query(URL).filter(URL.short_code == short_code).one().clicks == 0
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 40
+
+    with SessionLocal() as db:
+        assert fold_click_counters(db, batch_size=3) == {"links": 1, "clicks": 40, "bot_clicks": 0}
+        assert sum(counter_values(db, short_code)) == 0
+        assert db.query(URL).filter(URL.short_code == short_code).one().clicks == 40
+        assert fold_click_counters(db) == {"links": 0, "clicks": 0, "bot_clicks": 0}
+
+    client.get(f"/shortener/v1/{short_code}", headers={"user-agent": "client-40"}, follow_redirects=False)
+    assert client.get(f"/shortener/v1/urls/{short_code}").json()["clicks"] == 41
+
+
+def test_fold_does_not_move_the_same_clicks_twice():
+    with SessionLocal() as db:
+        short_code = crud.create_url(db, target_url="https://example.com/twice").short_code
+        for _ in range(5):
+            increment(db, short_code)
+        db.commit()
+        rows = db.execute(
+            select(URLClickCounter.slot, URLClickCounter.n, URLClickCounter.bots)
+            .where(URLClickCounter.short_code == short_code, URLClickCounter.n > 0)
+        ).all()
+
+    # 두 워커가 같은 값을 읽은 뒤 차례로 접는 경우: 두 번째 워커는 조건(n >= 읽은 값)에 걸려 옮기지 않음
+    from app.shortener.counters import _fold_code
+
+    with SessionLocal() as first, SessionLocal() as second:
+        assert _fold_code(first, short_code, rows) == (5, 0)
+        first.commit()
+        assert _fold_code(second, short_code, rows) == (0, 0)
+        second.commit()
+    with SessionLocal() as db:
+        assert crud.get_url_stats_from_db(db, short_code).clicks == 5
+
+
+def test_links_without_counter_rows_update_urls_directly():
+    with SessionLocal() as db:
+        db.add(URL(short_code="legacy", target_url="https://example.com/legacy", clicks=3))
+        db.commit()
+        crud.increment_clicks(db, "legacy")
+        db.commit()
+        assert db.query(URL).filter(URL.short_code == "legacy").one().clicks == 4
+        assert crud.get_url_stats_from_db(db, "legacy").clicks == 4
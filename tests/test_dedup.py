@@ -0,0 +1,79 @@
+# 중복 클릭 억제 윈도 테스트
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.analytics.dedup import DedupWindow, click_dedup_events
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_repeats_inside_window_are_suppressed_until_expiry():
+    clock = FakeClock()
+    window = DedupWindow(window_seconds=2, max_entries=100, clock=clock)
+    assert not window.seen("abc", "1.2.3.4", "bot")
+    assert window.seen("abc", "1.2.3.4", "bot")
+    assert not window.seen("abc", "1.2.3.4", "browser")  # 다른 클라이언트는 별개
+    assert not window.seen("abd", "1.2.3.4", "bot")
+
+    clock.now = 1.9
+    assert window.seen("abc", "1.2.3.4", "bot")  # 반복해도 만료 시각은 늘어나지 않음
+    clock.now = 2.0
+    assert not window.seen("abc", "1.2.3.4", "bot")
+    assert len(window) == 1  # 만료된 항목은 제거됨
+
+
+def test_memory_bound_evicts_oldest_and_fails_open():
+    window = DedupWindow(window_seconds=60, max_entries=3, clock=FakeClock())
+    for i in range(5):
+        assert not window.seen(str(i), None, None)
+    assert len(window) == 3
+    assert not window.seen("0", None, None)  # 밀려난 항목은 다시 기록
+    assert window.seen("4", None, None)
+
+
+def test_forgotten_events_are_recorded_again():
+    window = DedupWindow(window_seconds=60, max_entries=100, clock=FakeClock())
+    assert not window.seen("abc", "1.2.3.4", "browser")
+    window.forget("abc", "1.2.3.4", "browser")
+    assert not window.seen("abc", "1.2.3.4", "browser")
+    assert window.seen("abc", "1.2.3.4", "browser")
+    window.forget("missing", None, None)  # 없는 이벤트는 무시
+
+
+def test_duplicate_redirects_skip_db_writes(client, query_counter):
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/dup"}).json()["short_code"]
+    suppressed = click_dedup_events.labels("suppressed").value
+
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 307
+    with query_counter() as counter:
+        for _ in range(3):
+            assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 307
+    assert counter.count == 0, counter.report()  # 캐시 적중 + 중복 억제 → DB 접근 없음
+    assert click_dedup_events.labels("suppressed").value == suppressed + 3
+
+    client.get(f"/shortener/v1/{short_code}", headers={"user-agent": "another"}, follow_redirects=False)
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 2
+    assert client.get(f"/analytics/v1/{short_code}").json()["total_clicks"] == 2
+
+
+def test_retry_after_failed_click_write_is_recorded(client, monkeypatch):
+    # 기록에 실패한 클릭은 윈도에 남지 않음: 윈도 안의 재시도가 중복으로 억제되면 클릭을 잃음
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/retry"}).json()["short_code"]
+
+    def database_down(*args, **kwargs):
+        raise OperationalError("UPDATE", {}, Exception("database is down"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr("app.shortener.service.increment_clicks", database_down)
+        with pytest.raises(OperationalError):
+            client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 307
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 1
+    assert client.get(f"/analytics/v1/{short_code}").json()["total_clicks"] == 1
@@ -0,0 +1,69 @@
+# 리디렉션 ASGI fast path 테스트: 일반 경로(redirect_to_target)와 응답 / 부수 효과가 같아야 함
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.monitoring.metrics import REGISTRY
+from app.shortener.fastpath import RedirectFastPathMiddleware
+
+
+@pytest.fixture
+def fast_client():
+    return TestClient(RedirectFastPathMiddleware(app))
+
+
+def shorten(client, target_url, **extra):
+    return client.post("/shortener/v1/shorten", json={"target_url": target_url, **extra}).json()["short_code"]
+
+
+def comparable(res):
+    headers = {k: v for k, v in res.headers.items() if k in ("location", "cache-control", "content-type")}
+    return res.status_code, headers, res.content
+
+
+@pytest.mark.parametrize("extra", [{}, {"redirect_code": 308}])
+def test_redirect_matches_normal_path(client, fast_client, extra):
+    short_code = shorten(client, "https://example.com/a path?q=1&x=é", **extra)
+
+    # 서로 다른 클라이언트 (같은 클라이언트의 연속 클릭은 중복 억제 윈도에 걸림)
+    normal = client.get(f"/shortener/v1/{short_code}", headers={"user-agent": "normal"}, follow_redirects=False)
+    fast = fast_client.get(f"/shortener/v1/{short_code}", headers={"user-agent": "fast"}, follow_redirects=False)
+
+    assert comparable(fast) == comparable(normal)
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 2
+    assert client.get(f"/analytics/v1/{short_code}").json()["total_clicks"] == 2
+
+
+def test_not_found_matches_normal_path(client, fast_client):
+    short_code = shorten(client, "https://example.com/gone")
+    client.delete(f"/shortener/v1/{short_code}")
+
+    for code in ("missing", short_code):
+        normal = client.get(f"/shortener/v1/{code}", follow_redirects=False)
+        fast = fast_client.get(f"/shortener/v1/{code}", follow_redirects=False)
+        assert fast.status_code == 404
+        assert comparable(fast) == comparable(normal)
+
+
+def test_other_requests_fall_through(fast_client):
+    short_code = shorten(fast_client, "https://example.com/b")
+    assert fast_client.get(f"/shortener/v1/stats/{short_code}").status_code == 200
+    assert fast_client.head(f"/shortener/v1/{short_code}").status_code == 405
+
+
+def test_fast_path_keeps_route_metrics():
+    # 실제 배치와 같이 메트릭 미들웨어 안쪽에서 동작
+    from app.monitoring.middleware import MetricsMiddleware
+
+    series = 'http_requests_total{method="GET",route="/shortener/v1/{short_code}",status="404"}'
+
+    def value():
+        for line in REGISTRY.render().splitlines():
+            if line.startswith(series + " "):
+                return float(line.split()[-1])
+        return 0.0
+
+    client = TestClient(MetricsMiddleware(RedirectFastPathMiddleware(app)))
+    before = value()
+    client.get("/shortener/v1/nosuch", follow_redirects=False)
+    assert value() == before + 1
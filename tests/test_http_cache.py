@@ -0,0 +1,68 @@
+# 리디렉션 캐시 정책 / 조건부 요청(ETag, Last-Modified) 테스트
+from datetime import datetime, timedelta
+
+from app.db.database import SessionLocal
+from app.shortener.models import URL
+from app.shortener.redirects import cache_control_for
+
+
+def shorten(client, target_url="https://example.com/page", **extra):
+    res = client.post("/shortener/v1/shorten", json={"target_url": target_url, **extra})
+    assert res.status_code == 200
+    return res.json()["short_code"]
+
+
+def test_default_redirect_is_not_cacheable(client):
+    short_code = shorten(client)
+    res = client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+    assert res.status_code == 307
+    assert res.headers["cache-control"] == "no-store"
+
+
+def test_permanent_redirect_is_cacheable_until_expiry(client):
+    short_code = shorten(client, redirect_code=301)
+    res = client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+    assert res.status_code == 301
+    assert res.headers["cache-control"].startswith("public, max-age=")
+
+    now = datetime(2026, 1, 1)
+    assert cache_control_for(308, now + timedelta(seconds=90), now=now) == "public, max-age=90"
+    assert cache_control_for(308, now - timedelta(seconds=90), now=now) == "public, max-age=0"
+    assert cache_control_for(302, None) == "no-store"
+
+
+def test_invalid_redirect_code_is_rejected(client):
+    res = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/x", "redirect_code": 200})
+    assert res.status_code == 422
+
+
+def test_stats_conditional_get(client):
+    short_code = shorten(client)
+    first = client.get(f"/shortener/v1/stats/{short_code}")
+    assert first.status_code == 200
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+    assert client.get(f"/shortener/v1/stats/{short_code}", headers={"If-None-Match": etag}).status_code == 304
+    res = client.get(f"/shortener/v1/stats/{short_code}", headers={"If-Modified-Since": last_modified})
+    assert res.status_code == 304
+    assert res.content == b""
+
+    # 클릭하면 통계가 바뀌므로 ETag가 달라지고 다시 200
+    client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+    res = client.get(f"/shortener/v1/stats/{short_code}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["clicks"] == 1
+    assert res.headers["etag"] != etag
+
+
+def test_click_updates_last_modified(client):
+    short_code = shorten(client)
+    with SessionLocal() as db:
+        db.query(URL).filter(URL.short_code == short_code).update({URL.updated_at: datetime(2020, 1, 1)})
+        db.commit()
+    info = client.get(f"/shortener/v1/urls/{short_code}")
+    assert info.headers["last-modified"] == "Wed, 01 Jan 2020 00:00:00 GMT"
+
+    client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+    res = client.get(f"/shortener/v1/urls/{short_code}", headers={"If-Modified-Since": info.headers["last-modified"]})
+    assert res.status_code == 200
@@ -0,0 +1,95 @@
+# IP 저장 형식 / IP 대역 인덱스 테스트
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app.analytics.crud import log_click
+from app.analytics.iprange import IPRangeIndex, ip_ranges
+from app.analytics.models import ClickLog
+from app.db.database import SessionLocal
+from app.utils.ipaddr import pack_ip, unpack_ip
+
+RANGES_CSV = """start_ip,end_ip,network,country
+# 주석 줄
+10.0.0.0,10.0.0.255,AS64500 Example Net,kr
+10.0.1.0,10.0.255.255,AS64501 Other,US
+1.0.0.0,1.0.0.255,AS13335 Cloudflare,AU
+2001:db8::,2001:db8:ffff:ffff:ffff:ffff:ffff:ffff,AS64502 Docs,JP
+"""
+
+
+@pytest.fixture
+def ranges_csv(tmp_path):
+    path = tmp_path / "ranges.csv"
+    path.write_text(RANGES_CSV, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def loaded_ranges(ranges_csv):
+    ip_ranges.load_csv(ranges_csv, cache=False)
+    yield ip_ranges
+    ip_ranges.clear()
+
+
+def test_pack_ip_round_trips_and_keeps_address_order():
+    assert len(pack_ip("1.2.3.4")) == 16
+    assert unpack_ip(pack_ip("1.2.3.4")) == "1.2.3.4"
+    assert unpack_ip(pack_ip("::ffff:1.2.3.4")) == "1.2.3.4"
+    assert unpack_ip(pack_ip("2001:DB8:0::1")) == "2001:db8::1"
+    assert pack_ip("testclient") is None and pack_ip("") is None and pack_ip("1.2.3") is None
+    assert pack_ip("9.255.255.255") < pack_ip("10.0.0.0") < pack_ip("2001:db8::1")
+
+
+def test_lookup_finds_the_containing_range(ranges_csv):
+    index = IPRangeIndex()
+    assert index.load_csv(ranges_csv) == 4
+    assert index.lookup("10.0.0.0") == ("AS64500 Example Net", "KR")
+    assert index.lookup("10.0.0.255") == ("AS64500 Example Net", "KR")
+    assert index.lookup("10.0.200.1") == ("AS64501 Other", "US")  # 다른 버킷으로 이어지는 대역
+    assert index.lookup("1.0.0.9") == ("AS13335 Cloudflare", "AU")
+    assert index.lookup("::ffff:1.0.0.9") == ("AS13335 Cloudflare", "AU")
+    assert index.lookup("2001:db8::42") == ("AS64502 Docs", "JP")
+    for ip in ("9.255.255.255", "10.1.0.0", "0.0.0.0", "255.255.255.255", "2001:db9::", "bogus", None):
+        assert index.lookup(ip) == (None, None)
+
+
+def test_binary_cache_is_used_until_the_csv_changes(ranges_csv):
+    IPRangeIndex().load_csv(ranges_csv)
+    assert os.path.exists(f"{ranges_csv}.idx")
+
+    cached = IPRangeIndex()
+    assert cached.load_csv(ranges_csv) == 4
+    assert cached.lookup("2001:db8::1") == ("AS64502 Docs", "JP")
+
+    with open(ranges_csv, "a", encoding="utf-8") as f:
+        f.write("192.168.0.0,192.168.255.255,Private,\n")
+    refreshed = IPRangeIndex()
+    assert refreshed.load_csv(ranges_csv) == 5
+    assert refreshed.lookup("192.168.1.1") == ("Private", None)
+
+
+def test_client_ip_is_stored_packed_with_network(loaded_ranges):
+    with SessionLocal() as db:
+        log_click(db, "packed", "10.0.0.7", "pytest")
+        log_click(db, "packed", "testclient", "pytest")
+        raw = db.execute(text("SELECT client_ip FROM click_logs ORDER BY id")).scalars().all()
+        assert len(raw[0]) == 16 and raw[1] is None
+        logs = db.query(ClickLog).order_by(ClickLog.id).all()
+        assert [(log.client_ip, log.network, log.country) for log in logs] == [
+            ("10.0.0.7", "AS64500 Example Net", "KR"), (None, None, None),
+        ]
+
+
+def test_network_and_country_breakdowns(client, loaded_ranges):
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/geo"}).json()["short_code"]
+    with SessionLocal() as db:
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.5.5", "1.0.0.1", "8.8.8.8"):
+            log_click(db, short_code, ip, "pytest")
+
+    networks = client.get(f"/analytics/v1/{short_code}/networks").json()
+    assert networks["total_clicks"] == 5
+    assert networks["items"][0] == {"value": "AS64500 Example Net", "clicks": 2}
+    countries = {item["value"]: item["clicks"] for item in client.get(f"/analytics/v1/{short_code}/countries").json()["items"]}
+    assert countries == {"KR": 2, "US": 1, "AU": 1, None: 1}
@@ -0,0 +1,35 @@
+# 지연 생성 DB 세션(LazySession) 테스트
+from app.db.database import SessionLocal
+from app.db.lazy_session import LazySession
+from app.monitoring.sql import db_sessions_total
+
+
+def test_session_is_created_on_first_use_and_cleaned_up():
+    cleanups = []
+
+    def factory(stack):
+        stack.callback(cleanups.append, "connection")
+        return SessionLocal()
+
+    db = LazySession(factory)
+    assert not db.created
+    db.close()  # 사용하지 않았으면 아무것도 하지 않음
+    assert cleanups == []
+
+    assert isinstance(db.info, dict)  # 첫 속성 접근 시 세션 생성
+    assert db.created
+    db.close()
+    db.close()
+    assert cleanups == ["connection"]
+    assert not db.created
+
+
+def unused_sessions():
+    return db_sessions_total.labels("primary", "false").value
+
+
+def test_request_failing_validation_does_not_open_a_session(client):
+    before = unused_sessions()
+    res = client.post("/shortener/v1/shorten", json={"wrong": "field"})
+    assert res.status_code == 422
+    assert unused_sessions() == before + 1
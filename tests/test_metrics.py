@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import get_engine
+from app.monitoring.metrics import Counter, Histogram, Registry
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    counter = Counter("demo_total", "Demo counter", ("route",), registry=registry)
+    histogram = Histogram("demo_seconds", "Demo histogram", buckets=(0.1, 1.0), registry=registry)
+
+    counter.labels("/a").inc()
+    counter.labels("/a").inc(2)
+    assert counter.labels("/a") is counter.labels("/a")
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{route="/a"} 3' in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 2' in text
+    assert "demo_seconds_count 2" in text
+
+
+def test_metrics_endpoint_reports_route_and_sql(client):
+    res = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com"})
+    short_code = res.json()["short_code"]
+    client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+
+    res = client.get("/internal/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    text = res.text
+    assert 'http_requests_total{method="GET",route="/shortener/v1/{short_code}",status="307"}' in text
+    assert 'http_request_duration_seconds_count{method="POST",route="/shortener/v1/shorten"}' in text
+    assert 'http_request_db_queries_count{method="GET",route="/shortener/v1/{short_code}"}' in text
+    assert "db_queries_total" in text
+
+
+def test_failed_statement_does_not_leave_start_time_on_connection():
+    with get_engine().connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
+
+
+def test_after_hook_without_before_hook_is_ignored():
+    # 훅 등록 전에 시작된 문장은 after 훅만 호출됨: 측정하지 않고 넘어감
+    from app.monitoring.sql import _after_cursor_execute
+
+    with get_engine().connect() as conn:
+        conn.info.pop("query_start_time", None)
+        _after_cursor_execute(conn, None, "SELECT 1", (), None, False)
+        conn.info["query_start_time"] = []
+        _after_cursor_execute(conn, None, "SELECT 1", (), None, False)
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
@@ -0,0 +1,115 @@
+# 샘플링 프로파일러 / 느린 요청 캡처 테스트
+import threading
+import time
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.monitoring.profiler import ProfilerBusy, SamplingProfiler, SlowRequestMonitor, slow_request_monitor
+from app.monitoring.sql import RequestDBStats
+
+EMAIL = "admin@example.com"
+PASSWORD = "admin-password"
+
+
+def busy_handler(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_handler, args=(stop,), name="busy")
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+def auth_headers(client, superuser=True):
+    from app.auth.models.user import User
+
+    client.post("/user/v1/register/", json={"email": EMAIL, "password": PASSWORD})
+    if superuser:
+        with SessionLocal() as db:
+            db.query(User).filter(User.email == EMAIL).update({User.is_superuser: True})
+            db.commit()
+    token = client.post("/user/v1/login/", json={"email": EMAIL, "password": PASSWORD}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_profiler_aggregates_busy_stacks_and_skips_idle_threads(busy_thread):
+    idle = threading.Event()
+    waiter = threading.Thread(target=idle.wait, name="idle-waiter")
+    waiter.start()
+    try:
+        counts, samples = SamplingProfiler(interval_ms=2).run(0.1)
+    finally:
+        idle.set()
+        waiter.join()
+    assert samples > 10
+    stacks = list(counts)
+    assert any(stack.startswith("busy;") and "busy_handler (" in stack for stack in stacks)
+    assert not any(stack.startswith("idle-waiter;") for stack in stacks)
+
+
+def test_only_one_profile_runs_at_a_time():
+    profiler = SamplingProfiler()
+    assert profiler._running.acquire()
+    try:
+        with pytest.raises(ProfilerBusy):
+            profiler.run(0.01)
+    finally:
+        profiler._running.release()
+
+
+def test_profile_endpoint_requires_superuser(client, busy_thread):
+    assert client.post("/internal/profile?seconds=0.05").status_code == 401
+    assert client.post("/internal/profile?seconds=0.05", headers=auth_headers(client, superuser=False)).status_code == 400
+
+    res = client.post("/internal/profile?seconds=0.1&interval_ms=2", headers=auth_headers(client))
+    assert res.status_code == 200
+    assert int(res.headers["x-profile-samples"]) > 10
+    # collapsed 형식: "프레임;프레임;... 횟수"
+    lines = res.text.splitlines()
+    assert any("busy_handler" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert client.post("/internal/profile?seconds=3600", headers=auth_headers(client)).status_code == 422
+
+
+def test_slow_request_is_captured_with_stacks_and_rate_limited():
+    monitor = SlowRequestMonitor(threshold=0.05, per_minute=1, interval_ms=2)
+    assert monitor.end(monitor.begin("GET", "/fast"), 200) is None
+
+    stats = RequestDBStats()
+    stats.queries = 3
+    request_id = monitor.begin("GET", "/analytics/v1/abc", stats)
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_handler, args=(stop,), name="busy")
+    worker.start()
+    time.sleep(0.2)
+    stop.set()
+    worker.join()
+    capture = monitor.end(request_id, 200, "/analytics/v1/{code}")
+    assert capture["route"] == "/analytics/v1/{code}"
+    assert capture["db_queries"] == 3
+    assert capture["seconds"] >= 0.2
+    assert capture["samples"] > 0
+    assert "busy_handler" in capture["stacks"]
+    assert list(monitor.captures) == [capture]
+
+    # 분당 1개: 다음 느린 요청은 캡처하지 않음
+    request_id = monitor.begin("GET", "/analytics/v1/abc")
+    time.sleep(0.1)
+    assert monitor.end(request_id, 200) is None
+    assert len(monitor.captures) == 1
+
+
+def test_slow_request_captures_are_listed(client, monkeypatch):
+    headers = auth_headers(client)
+    monkeypatch.setattr(slow_request_monitor, "captures", [{"path": "/shortener/v1/stats/abc", "seconds": 1.5}])
+    res = client.get("/internal/profile/slow", headers=headers)
+    assert res.status_code == 200
+    assert res.json()["captures"] == [{"path": "/shortener/v1/stats/abc", "seconds": 1.5}]
+    assert client.get("/internal/profile/slow").status_code == 401
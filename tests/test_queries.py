@@ -0,0 +1,27 @@
+# 경량 조회(queries) 테스트
+from app.db.database import SessionLocal
+from app.shortener.crud import create_url, deactivate_url_from_db
+from app.shortener.queries import find_redirect, find_url_stats
+
+
+def test_find_redirect_loads_only_redirect_columns():
+    with SessionLocal() as db:
+        code = create_url(db, target_url="https://example.com/core", redirect_code=308).short_code
+        deactivate_url_from_db(db, code)
+
+    with SessionLocal() as db:
+        row = find_redirect(db, code)
+        assert row._fields == ("target_url", "redirect_code", "expires_at", "is_active")
+        assert (row.target_url, row.redirect_code, row.is_active) == ("https://example.com/core", 308, False)
+        assert find_redirect(db, "nosuch") is None
+        assert len(db.identity_map) == 0  # ORM 객체를 만들지 않음
+
+
+def test_find_url_stats(client):
+    code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/s"}).json()["short_code"]
+    client.get(f"/shortener/v1/{code}", follow_redirects=False)
+
+    with SessionLocal() as db:
+        row = find_url_stats(db, code)
+    assert (row.short_code, row.clicks, row.is_active) == (code, 1, True)
+    assert row.created_at is not None
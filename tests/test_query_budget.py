@@ -0,0 +1,153 @@
+# 엔드포인트별 최대 SQL 실행 횟수(쿼리 예산)를 검증합니다.
+# - 새 공개 엔드포인트를 추가하면 QUERY_BUDGETS에 예산과 시나리오를 함께 선언해야 합니다.
+# - 예산을 초과하면 실행된 쿼리 목록과 함께 테스트가 실패합니다.
+import pytest
+from fastapi.routing import APIRoute
+
+from app.main import app
+from app.auth.crud.token import create_token
+from app.db.database import SessionLocal
+from app.security import create_access_token, create_refresh_token
+
+from datetime import timedelta
+
+EMAIL = "budget@example.com"
+PASSWORD = "budget-password"
+
+
+def register(client, email=EMAIL):
+    res = client.post("/user/v1/register/", json={"email": email, "password": PASSWORD})
+    assert res.status_code == 201, res.text
+    return res.json()
+
+
+def login(client):
+    res = client.post("/user/v1/login/", json={"email": EMAIL, "password": PASSWORD})
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def shorten(client):
+    res = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/seed"})
+    return res.json()["short_code"]
+
+
+def deactivated(client):
+    short_code = shorten(client)
+    client.delete(f"/shortener/v1/{short_code}")
+    return short_code
+
+
+def make_superuser(email):
+    from app.auth.models.user import User
+
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.email == email).update({User.is_superuser: True})
+        db.commit()
+    finally:
+        db.close()
+
+
+def reset_token(user_id):
+    db = SessionLocal()
+    try:
+        create_token(db, token="reset-token", token_type="reset", user_id=user_id,
+                     expires_delta=timedelta(hours=1))
+    finally:
+        db.close()
+
+
+# (method, path 템플릿) -> (최대 쿼리 수, 준비 함수(client) -> 요청 kwargs)
+QUERY_BUDGETS = {
+    ("POST", "/user/v1/register/"): (
+        3, lambda c: {"json": {"email": EMAIL, "password": PASSWORD}},
+    ),
+    ("POST", "/user/v1/login/"): (
+        2, lambda c: (register(c), {"json": {"email": EMAIL, "password": PASSWORD}})[1],
+    ),
+    ("POST", "/user/v1/login/oauth2"): (
+        2, lambda c: (register(c), {"data": {"username": EMAIL, "password": PASSWORD}})[1],
+    ),
+    ("POST", "/user/v1/refresh/"): (
+        4, lambda c: (register(c), {"json": {"refresh_token": login(c)["refresh_token"]}})[1],
+    ),
+    ("POST", "/user/v1/password-reset-request/"): (
+        2, lambda c: (register(c), {"json": {"email": EMAIL}})[1],
+    ),
+    ("POST", "/user/v1/password-reset/"): (
+        4, lambda c: (reset_token(register(c)["id"]),
+                      {"json": {"token": "reset-token", "new_password": "new-password"}})[1],
+    ),
+    ("PATCH", "/user/v1/reset-password-by-poweruser/"): (
+        3, lambda c: (register(c), make_superuser(EMAIL), register(c, "target@example.com"),
+                      {"json": {"target_user_email": "target@example.com"},
+                       "headers": {"Authorization": f"Bearer {login(c)['access_token']}"}})[-1],
+    ),
+    ("POST", "/shortener/v1/shorten"): (
+        6, lambda c: {"json": {"target_url": "https://example.com/new"}},
+    ),
+    ("GET", "/shortener/v1/{short_code}"): (
+        3, lambda c: {"path": {"short_code": shorten(c)}, "follow_redirects": False},
+    ),
+    ("DELETE", "/shortener/v1/{short_code}"): (
+        2, lambda c: {"path": {"short_code": shorten(c)}},
+    ),
+    ("POST", "/shortener/v1/deactivate"): (
+        3, lambda c: (register(c), make_superuser(EMAIL),
+                      {"json": {"short_codes": [shorten(c), "missing"]},
+                       "headers": {"Authorization": f"Bearer {login(c)['access_token']}"}})[-1],
+    ),
+    ("POST", "/shortener/v1/{short_code}/activate"): (
+        3, lambda c: (register(c), make_superuser(EMAIL),
+                      {"path": {"short_code": deactivated(c)},
+                       "headers": {"Authorization": f"Bearer {login(c)['access_token']}"}})[-1],
+    ),
+    ("GET", "/shortener/v1/urls/{short_code}"): (
+        1, lambda c: {"path": {"short_code": shorten(c)}},
+    ),
+    ("GET", "/shortener/v1/stats/stream"): (
+        1, lambda c: {"params": {"codes": shorten(c), "limit": 1}},  # 생산자의 첫 tick 조회
+    ),
+    ("GET", "/shortener/v1/stats/{short_code}"): (
+        1, lambda c: {"path": {"short_code": shorten(c)}},
+    ),
+    ("GET", "/analytics/v1/{code}"): (
+        1, lambda c: {"path": {"code": shorten(c)}},
+    ),
+    ("GET", "/analytics/v1/{code}/networks"): (
+        1, lambda c: {"path": {"code": shorten(c)}},
+    ),
+    ("POST", "/analytics/v1/batch"): (
+        2, lambda c: {"json": {"short_codes": [shorten(c), "missing"]}},  # 통계 조회 + 클릭 로그 GROUP BY
+    ),
+    ("GET", "/analytics/v1/{code}/countries"): (
+        1, lambda c: {"path": {"code": shorten(c)}},
+    ),
+}
+
+
+def public_routes():
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.include_in_schema:
+            for method in route.methods:
+                yield method, route.path
+
+
+def test_every_public_endpoint_declares_a_budget():
+    missing = sorted(set(public_routes()) - set(QUERY_BUDGETS))
+    assert not missing, f"query budget not declared for: {missing}"
+
+
+@pytest.mark.parametrize("endpoint", sorted(QUERY_BUDGETS), ids=lambda e: f"{e[0]} {e[1]}")
+def test_endpoint_stays_within_query_budget(client, query_counter, endpoint):
+    method, path = endpoint
+    budget, prepare = QUERY_BUDGETS[endpoint]
+    kwargs = prepare(client)
+    url = path.format(**kwargs.pop("path", {}))
+
+    with query_counter() as counter:
+        res = client.request(method, url, **kwargs)
+
+    assert res.status_code < 400, res.text
+    assert counter.count <= budget, f"{method} {path} exceeded budget {budget}\n{counter.report()}"
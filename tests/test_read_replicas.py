@@ -0,0 +1,124 @@
+# 읽기 복제본 라우팅 테스트
+# - 두 개의 로컬 SQLite 파일을 복제본으로 사용 (복제는 테스트가 직접 행을 넣어 흉내 냄)
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db.database import Base, configure_replicas
+from app.db.routing import ReplicaSet
+from app.shortener import crud
+from app.shortener.models import URL
+
+
+@pytest.fixture
+def replicas():
+    workdir = tempfile.mkdtemp(prefix="shortener-replica-")
+    urls = [f"sqlite:///{os.path.join(workdir, f'replica{i}.db')}" for i in range(2)]
+    replica_set = configure_replicas(urls)
+    for replica in replica_set.replicas:
+        Base.metadata.create_all(bind=replica.engine)
+    yield replica_set
+    configure_replicas([])
+
+
+def replicate(replica_set, short_code, target_url="https://example.com/replicated"):
+    for replica in replica_set.replicas:
+        with Session(bind=replica.engine) as db:
+            db.add(URL(short_code=short_code, target_url=target_url, clicks=0))
+            db.commit()
+
+
+def test_reads_are_served_by_replicas(client, replicas):
+    # primary에는 없고 복제본에만 있는 행 -> 복제본에서 읽었다는 증거
+    replicate(replicas, "onlyrep")
+
+    for _ in range(4):
+        assert client.get("/shortener/v1/urls/onlyrep").status_code == 200
+        assert client.get("/shortener/v1/stats/onlyrep").status_code == 200
+
+
+def test_read_your_writes_routes_recent_writer_to_primary(client, replicas):
+    res = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/new"},
+                      headers={"X-Client-Id": "writer"})
+    short_code = res.json()["short_code"]
+
+    # 아직 복제되지 않은 링크: 쓴 클라이언트는 primary에서 읽고, 다른 클라이언트는 복제본에서 읽음
+    assert client.get(f"/shortener/v1/stats/{short_code}", headers={"X-Client-Id": "writer"}).status_code == 200
+    assert client.get(f"/shortener/v1/stats/{short_code}", headers={"X-Client-Id": "other"}).status_code == 404
+
+
+def test_following_a_redirect_does_not_pin_client_to_primary(client, replicas):
+    # 클릭 기록은 primary에 쓰지만 사용자에게 보이는 쓰기가 아니므로 이후 읽기는 계속 복제본에서
+    replicate(replicas, "onlyrep")
+    headers = {"X-Client-Id": "visitor"}
+
+    assert client.get("/shortener/v1/onlyrep", headers=headers, follow_redirects=False).status_code == 307
+    assert client.get("/shortener/v1/stats/onlyrep", headers=headers).status_code == 200
+
+
+def test_primary_pinned_reader_never_shares_a_replica_lookup(client, replicas, monkeypatch):
+    # 복제본에서 진행 중인 같은 단축 키 조회(404)에 쓴 클라이언트의 primary 조회가 합류하면 안 됨
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/pinned"},
+                             headers={"X-Client-Id": "writer"}).json()["short_code"]
+    real_lookup = crud.find_url_stats
+
+    def slow_lookup(db, code):
+        time.sleep(0.2)  # 복제본 조회가 진행 중인 동안 primary 조회가 들어오도록
+        return real_lookup(db, code)
+
+    monkeypatch.setattr(crud, "find_url_stats", slow_lookup)
+    statuses = {}
+
+    def get(client_id):
+        statuses[client_id] = client.get(f"/shortener/v1/stats/{short_code}",
+                                         headers={"X-Client-Id": client_id}).status_code
+
+    other = threading.Thread(target=get, args=("other",))
+    other.start()
+    time.sleep(0.05)
+    get("writer")
+    other.join()
+    assert statuses == {"other": 404, "writer": 200}
+
+
+def test_unreachable_replica_is_ejected(client, replicas):
+    broken = configure_replicas(["sqlite:////nonexistent-dir/replica.db"])
+    res = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/x"})
+    short_code = res.json()["short_code"]
+
+    res = client.get(f"/shortener/v1/urls/{short_code}", headers={"X-Client-Id": "reader"})
+
+    assert res.status_code == 200  # primary로 대체
+    assert not broken.replicas[0].healthy
+
+
+def test_replica_failing_queries_is_ejected(client, replicas):
+    # 연결은 되지만 쿼리가 실패하는 복제본(여기서는 스키마가 없는 DB)도 제외
+    workdir = tempfile.mkdtemp(prefix="shortener-replica-")
+    broken = configure_replicas([f"sqlite:///{os.path.join(workdir, 'empty.db')}"])
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/y"}).json()["short_code"]
+
+    with pytest.raises(OperationalError):
+        client.get(f"/shortener/v1/urls/{short_code}", headers={"X-Client-Id": "reader"})
+    assert not broken.replicas[0].healthy
+    assert client.get(f"/shortener/v1/urls/{short_code}", headers={"X-Client-Id": "reader"}).status_code == 200
+
+
+def test_least_connections_prefers_idle_replica(replicas):
+    replica_set = ReplicaSet([r.engine for r in replicas.replicas], strategy="least_connections")
+    busy = replica_set.replicas[0].engine.connect()
+    try:
+        assert replica_set.candidates()[0] is replica_set.replicas[1]
+    finally:
+        busy.close()
+    assert replica_set.replicas[0].in_use == 0
+
+
+def test_round_robin_rotates_between_replicas(replicas):
+    firsts = {replicas.candidates()[0].engine.url for _ in range(4)}
+    assert len(firsts) == 2
@@ -0,0 +1,182 @@
+# 수평 샤딩 테스트
+# - 로컬 SQLite 파일 여러 개를 샤드로 사용
+import json
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.analytics.crud import log_click
+from app.analytics.models import ClickLog
+from app.db.database import SessionLocal, configure_shards, create_all_tables, get_shard_engines
+from app.db.rebalance import rebalance
+from app.db.sharding import HashRing, shard_ids_for
+from app.shortener import crud
+from app.shortener.code_filter import ShortCodeFilter
+from app.shortener.counters import CLICK_COUNTER_SLOTS, fold_click_counters
+from app.shortener.models import URL, ArchivedURL, URLClickCounter, URLTarget
+from app.shortener.queries import find_url_stats
+from app.shortener.tiering import archive_links, reactivate_link
+
+
+def shard_urls(workdir, count):
+    return [f"sqlite:///{os.path.join(workdir, f'shard{i}.db')}" for i in range(count)]
+
+
+@pytest.fixture
+def shards():
+    workdir = tempfile.mkdtemp(prefix="shortener-shard-")
+    urls = shard_urls(workdir, 3)
+    configure_shards(urls)
+    create_all_tables()
+    yield workdir, urls
+    configure_shards([])
+
+
+def rows_per_shard(model):
+    counts = {}
+    for shard_id, engine in get_shard_engines().items():
+        if shard_id == "global":
+            continue
+        with engine.connect() as conn:
+            counts[shard_id] = conn.execute(select(func.count()).select_from(model.__table__)).scalar()
+    return counts
+
+
+def test_hash_ring_moves_few_keys_when_adding_a_shard():
+    keys = [f"key{i}" for i in range(3000)]
+    before, after = HashRing(shard_ids_for(3)), HashRing(shard_ids_for(4))
+    moved = sum(before.shard_for(k) != after.shard_for(k) for k in keys)
+    # 이상적으로는 1/4, 가상 노드 분포 오차 허용
+    assert moved < len(keys) * 0.4
+    assert all(after.shard_for(k) == "shard3" for k in keys if before.shard_for(k) != after.shard_for(k))
+
+
+def test_crud_is_routed_by_short_code(shards):
+    with SessionLocal() as db:
+        codes = [crud.create_url(db, f"https://example.com/{i}").short_code for i in range(30)]
+        for code in codes[:5]:
+            log_click(db, code, "127.0.0.1", "pytest")
+
+    counts = rows_per_shard(URL)
+    assert sum(counts.values()) == 30
+    assert all(counts.values()), "every shard should own some links"
+    assert sum(rows_per_shard(URLTarget).values()) == 30
+    assert sum(rows_per_shard(ClickLog).values()) == 5
+
+    with SessionLocal() as db:
+        assert crud.get_url(db, codes[0]).target_url == "https://example.com/0"
+        # 원본 URL 중복 확인은 url_targets 샤드를 거쳐 기존 링크를 반환
+        assert crud.create_url(db, "https://example.com/7").short_code == codes[7]
+        crud.deactivate_url_from_db(db, codes[1])
+        crud.increment_clicks(db, codes[2])
+        db.commit()
+        assert crud.get_url(db, codes[1]).is_active is False
+        assert crud.get_url_stats_from_db(db, codes[2]).clicks == 1
+        assert fold_click_counters(db) == {"links": 1, "clicks": 1, "bot_clicks": 0}
+        assert crud.get_url(db, codes[2]).clicks == 1
+        assert db.query(ClickLog).filter(ClickLog.short_code == codes[0]).count() == 1
+        # 여러 샤드에 걸친 UPDATE ... RETURNING 결과가 합쳐짐
+        found, missing, _ = crud.bulk_deactivate_urls(db, codes[10:20] + ["missing"], chunk_size=4)
+        assert sorted(found) == sorted(codes[10:20]) and missing == ["missing"]
+        assert len(db.query(URL).filter(URL.is_active.is_(False)).all()) == 11
+
+
+def test_archive_and_restore_are_routed_by_short_code(shards):
+    with SessionLocal() as db:
+        codes = [crud.create_url(db, f"https://example.com/cold/{i}").short_code for i in range(12)]
+        for code in codes:
+            crud.deactivate_url_from_db(db, code)
+        # LIMIT은 샤드마다 적용되므로 배치 수는 샤드 분포에 따라 다름
+        assert archive_links(db, batch_size=5)["archived"] == 12
+
+    assert sum(rows_per_shard(URL).values()) == 0
+    assert sum(rows_per_shard(URLTarget).values()) == 0
+    assert sum(rows_per_shard(ArchivedURL).values()) == 12
+    with SessionLocal() as db:
+        assert crud.get_url_stats_from_db(db, codes[3]).is_active is False
+        assert reactivate_link(db, codes[3]).is_active is True
+        assert crud.generate_short_code(db) not in codes
+    assert sum(rows_per_shard(URL).values()) == 1
+    assert sum(rows_per_shard(ArchivedURL).values()) == 11
+
+
+def test_api_works_when_sharded(client, shards):
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/api"}).json()["short_code"]
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 307
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 1
+    assert client.get(f"/analytics/v1/{short_code}").status_code == 200
+
+
+def test_code_filter_catches_up_every_shard(shards, monkeypatch):
+    monkeypatch.setattr("app.shortener.code_filter.BLOOM_SYNC_INTERVAL_SECONDS", 0)
+    code_filter = ShortCodeFilter()
+    with SessionLocal() as db:
+        first = [crud.create_url(db, f"https://example.com/first{i}").short_code for i in range(12)]
+        code_filter.build(db, snapshot_path="")
+        # 다른 워커가 만든 링크 (샤드마다 id가 따로 발급됨)
+        later = [crud.create_url(db, f"https://example.com/later{i}").short_code for i in range(12)]
+        assert code_filter.sync(db)
+    assert all(code_filter.might_exist(code, record=False) for code in first + later)
+
+
+def test_batch_analytics_groups_across_shards(client, shards):
+    codes = [
+        client.post("/shortener/v1/shorten", json={"target_url": f"https://example.com/batch{i}"}).json()["short_code"]
+        for i in range(12)
+    ]
+    for i, code in enumerate(codes):
+        for n in range(i % 3):
+            client.get(f"/shortener/v1/{code}", headers={"user-agent": f"ua{n}"}, follow_redirects=False)
+    assert sum(1 for count in rows_per_shard(URL).values() if count) > 1
+
+    res = client.post("/analytics/v1/batch", json={"short_codes": codes + ["missing"]})
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [(row["clicks"], row["logged_clicks"]) for row in rows[:-1]] == [(i % 3, i % 3) for i in range(12)]
+    assert rows[-1] == {"short_code": "missing", "found": False}
+
+
+def test_rebalance_moves_rows_to_new_owner(shards):
+    workdir, urls = shards
+    with SessionLocal() as db:
+        codes = [crud.create_url(db, f"https://example.com/{i}").short_code for i in range(40)]
+        for code in codes:
+            log_click(db, code, "127.0.0.1", "pytest")
+
+    # 1단계: 새 샤드를 추가하고 이전 목록을 함께 설정 (이동 전에도 모두 조회 가능)
+    new_urls = urls + shard_urls(workdir, 4)[3:]
+    configure_shards(new_urls, previous_urls=urls)
+    create_all_tables()
+    with SessionLocal() as db:
+        assert all(crud.get_url(db, code) is not None for code in codes)
+
+    # 옮겨질 링크의 slot 0: 이전 샤드에 접지 않은 클릭이 있고, 새 소유 샤드에도 같은 slot 행이 이미 있음
+    # (중단 후 재실행 / 이동 중 새 소유 샤드에 쌓인 클릭) → 합쳐져야 함
+    old_ring, new_ring = HashRing(shard_ids_for(3)), HashRing(shard_ids_for(4))
+    moving = [code for code in codes if new_ring.shard_for(code) == "shard3"]
+    engines = get_shard_engines()
+    for code in moving:
+        with engines[old_ring.shard_for(code)].begin() as conn:
+            conn.execute(update(URLClickCounter.__table__)
+                         .where(URLClickCounter.short_code == code, URLClickCounter.slot == 0)
+                         .values(n=3, bots=1))
+        with engines["shard3"].begin() as conn:
+            conn.execute(URLClickCounter.__table__.insert(), {"short_code": code, "slot": 0, "n": 2, "bots": 1})
+
+    summary = rebalance(urls, new_urls, batch_size=7)
+    assert summary["urls"] > 0
+    assert summary["urls"] == summary["click_logs"]
+    assert summary["url_click_counters"] == summary["urls"] * CLICK_COUNTER_SLOTS
+
+    # 2단계: 이전 목록 제거 후에도 모든 데이터가 새 소유 샤드에 있음
+    configure_shards(new_urls)
+    assert rows_per_shard(URL)["shard3"] == summary["urls"]
+    with SessionLocal() as db:
+        for i, code in enumerate(codes):
+            assert crud.get_url(db, code).target_url == f"https://example.com/{i}"
+            assert db.query(ClickLog).filter(ClickLog.short_code == code).count() == 1
+            assert crud.get_url_by_target_url(db, f"https://example.com/{i}").short_code == code
+            stats = find_url_stats(db, code)
+            assert (stats.clicks, stats.bot_clicks) == ((5, 2) if code in moving else (0, 0))
+    assert rows_per_shard(URLClickCounter)["shard3"] == len(moving) * CLICK_COUNTER_SLOTS
@@ -1,24 +1,132 @@
-from fastapi.testclient import TestClient
-from app.main import app
+from app.db.database import SessionLocal
 
-client = TestClient(app)
+EMAIL = "moderator@example.com"
+PASSWORD = "moderator-password"
 
-def get_token():
-    user = {"email": "urltester@example.com", "password": "urlpass"}
-    client.post("/api/auth/signup", json=user)
-    res = client.post("/api/auth/login", json=user)
-    return res.json()["access_token"]
 
-def test_url_shortening():
-    token = get_token()
-    headers = {"Authorization": f"Bearer {token}"}
-
-    payload = {"original_url": "https://example.com"}
-    res = client.post("/api/shortener/", json=payload, headers=headers)
+def shorten(client, target_url="https://example.com"):
+    res = client.post("/shortener/v1/shorten", json={"target_url": target_url})
     assert res.status_code == 200
-    assert "short_code" in res.json()
+    return res.json()
+
+
+def superuser_headers(client):
+    from app.auth.models.user import User
+
+    client.post("/user/v1/register/", json={"email": EMAIL, "password": PASSWORD})
+    with SessionLocal() as db:
+        db.query(User).filter(User.email == EMAIL).update({User.is_superuser: True})
+        db.commit()
+    token = client.post("/user/v1/login/", json={"email": EMAIL, "password": PASSWORD}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_url_shortening(client):
+    body = shorten(client)
+    assert body["target_url"] == "https://example.com"
+    assert body["is_active"] is True
+    assert len(body["short_code"]) == 6
+
+    # 같은 원본 URL은 기존 단축 코드를 재사용
+    assert shorten(client)["short_code"] == body["short_code"]
+
+
+def test_redirect_counts_clicks(client):
+    short_code = shorten(client)["short_code"]
+
+    res = client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+    assert res.status_code == 307
+    assert res.headers["location"] == "https://example.com"
+
+    info = client.get(f"/shortener/v1/urls/{short_code}").json()
+    assert info["clicks"] == 1
+
+    stats = client.get(f"/shortener/v1/stats/{short_code}").json()
+    assert stats["clicks"] == 1
+    assert stats["short_code"] == short_code
+
+    analytics = client.get(f"/analytics/v1/{short_code}").json()
+    assert analytics["total_clicks"] == 1
+
+
+def test_deactivated_url_is_not_redirected(client):
+    short_code = shorten(client)["short_code"]
+
+    assert client.delete(f"/shortener/v1/{short_code}").status_code == 200
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 404
+    assert client.delete("/shortener/v1/missing").status_code == 404
+
+
+def test_bulk_deactivate_by_codes_and_host(client, monkeypatch):
+    from app.shortener import crud
+    from app.shortener.events import link_events
+
+    codes = [shorten(client, f"https://spam.example.com/{i}")["short_code"] for i in range(5)]
+    keep = shorten(client, "https://example.org/?next=spam.example.com")["short_code"]
+    other = shorten(client, "https://example.org/other")["short_code"]
+    for code in (codes[0], keep):
+        client.get(f"/shortener/v1/{code}", follow_redirects=False)  # 리디렉션 캐시에 올림
+
+    headers = superuser_headers(client)
+    events = []
+    listener = link_events.subscribe(events.append)
+    monkeypatch.setattr(crud, "BULK_DEACTIVATE_CHUNK", 2)
+    try:
+        res = client.post("/shortener/v1/deactivate", json={"short_codes": [other, "missing"], "host": "*.example.com"},
+                          headers=headers)
+    finally:
+        link_events.unsubscribe(listener)
 
-    short_code = res.json()["short_code"]
-    res = client.get(f"/api/shortener/{short_code}")
     assert res.status_code == 200
-    assert res.json()["original_url"] == "https://example.com"
+    body = res.json()
+    assert sorted(body["deactivated"]) == sorted([other, *codes])
+    assert body["not_found"] == ["missing"]
+    assert body["truncated"] is False
+    assert len(events) == 4 and sum(map(len, events)) == 6  # 키 7개 → 청크(2개)마다 이벤트 1개
+    assert client.get(f"/shortener/v1/{codes[0]}", follow_redirects=False).status_code == 404
+    assert client.get(f"/shortener/v1/{keep}", follow_redirects=False).status_code == 307
+
+    assert client.post("/shortener/v1/deactivate", json={}, headers=headers).status_code == 422
+
+
+def test_bulk_deactivate_requires_superuser(client):
+    short_code = shorten(client, "https://victim.example.com/")["short_code"]
+    assert client.post("/shortener/v1/deactivate", json={"target_url_prefix": "h"}).status_code == 401
+
+    client.post("/user/v1/register/", json={"email": "user@example.com", "password": PASSWORD})
+    token = client.post("/user/v1/login/", json={"email": "user@example.com", "password": PASSWORD}).json()["access_token"]
+    res = client.post("/shortener/v1/deactivate", json={"target_url_prefix": "h"},
+                      headers={"Authorization": f"Bearer {token}"})
+    assert res.status_code == 400
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 307
+
+
+def test_activate_requires_superuser(client):
+    short_code = shorten(client, "https://takedown.example.com/")["short_code"]
+    client.delete(f"/shortener/v1/{short_code}")
+    assert client.post(f"/shortener/v1/{short_code}/activate").status_code == 401
+
+    client.post("/user/v1/register/", json={"email": "user@example.com", "password": PASSWORD})
+    token = client.post("/user/v1/login/", json={"email": "user@example.com", "password": PASSWORD}).json()["access_token"]
+    res = client.post(f"/shortener/v1/{short_code}/activate", headers={"Authorization": f"Bearer {token}"})
+    assert res.status_code == 400
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 404
+
+    assert client.post(f"/shortener/v1/{short_code}/activate", headers=superuser_headers(client)).status_code == 200
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 307
+
+
+def test_bulk_deactivate_by_prefix_is_capped_per_request(client, monkeypatch):
+    from app.shortener import crud
+
+    codes = {shorten(client, f"https://spam.example.net/{i}")["short_code"] for i in range(5)}
+    headers = superuser_headers(client)
+    monkeypatch.setattr(crud, "BULK_DEACTIVATE_MAX_MATCHES", 2)
+
+    deactivated = set()
+    for truncated in (True, True, False):
+        body = client.post("/shortener/v1/deactivate", json={"target_url_prefix": "https://spam.example.net/"},
+                           headers=headers).json()
+        assert len(body["deactivated"]) <= 2 and body["truncated"] is truncated
+        deactivated |= set(body["deactivated"])
+    assert deactivated == codes
@@ -0,0 +1,116 @@
+# 동시 요청 병합(single-flight) 테스트
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.shortener import crud
+from app.utils.singleflight import AsyncSingleFlight, SingleFlight
+
+N = 8
+
+
+def run_concurrently(fn, count=N):
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        try:
+            return fn()
+        except Exception as exc:  # 예외도 결과로 모아 비교
+            return exc
+
+    with ThreadPoolExecutor(count) as pool:
+        return list(pool.map(call, range(count)))
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results = run_concurrently(lambda: flight.do("abc", lookup))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert len(flight) == 0
+    # 결과는 캐시하지 않음
+    flight.do("abc", lookup)
+    assert len(calls) == 2
+
+
+def test_errors_are_shared_and_not_remembered():
+    flight = SingleFlight("test")
+
+    def broken():
+        time.sleep(0.1)
+        raise ValueError("db down")
+
+    results = run_concurrently(lambda: flight.do("abc", broken))
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+    assert flight.do("abc", lambda: "ok") == "ok"
+
+
+def test_followers_run_their_own_call_after_timeout():
+    flight = SingleFlight("test", timeout=0.01)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "ok"
+
+    results = run_concurrently(lambda: flight.do("abc", slow), count=2)
+    assert results == ["ok", "ok"]
+    assert len(calls) == 2  # follower가 leader를 기다리지 않고 직접 실행
+    assert len(flight) == 0
+
+
+def test_async_callers_share_one_execution_even_if_leader_is_cancelled():
+    async def scenario():
+        flight = AsyncSingleFlight("test")
+        calls = []
+
+        async def lookup(code):
+            calls.append(code)
+            await asyncio.sleep(0.05)
+            return code.upper()
+
+        leader = asyncio.create_task(flight.do("abc", lookup, "abc"))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.do("abc", lookup, "abc")) for _ in range(N - 1)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await asyncio.gather(*followers) == ["ABC"] * (N - 1)
+        assert calls == ["abc"]
+        assert len(flight) == 0
+
+        async def broken():
+            raise ValueError("db down")
+
+        with pytest.raises(ValueError):
+            await flight.do("abc", broken)
+        assert len(flight) == 0
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_stats_requests_run_one_query(client, query_counter, monkeypatch):
+    short_code = client.post("/shortener/v1/shorten", json={"target_url": "https://example.com/viral"}).json()["short_code"]
+    real_lookup = crud.find_url_stats
+
+    def slow_lookup(db, code):
+        time.sleep(0.1)  # 다른 요청이 모두 같은 조회에 합류할 시간
+        return real_lookup(db, code)
+
+    monkeypatch.setattr(crud, "find_url_stats", slow_lookup)
+    with query_counter() as counter:
+        responses = run_concurrently(lambda: client.get(f"/shortener/v1/stats/{short_code}"))
+    assert all(res.status_code == 200 for res in responses)
+    assert counter.count == 1, counter.report()
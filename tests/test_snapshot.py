@@ -0,0 +1,155 @@
+# 리디렉션 스냅샷(mmap) / edge 모드 테스트
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import SessionLocal, get_engine
+from app.shortener.code_filter import code_filter
+from app.shortener.models import URL, ArchivedURL
+from app.shortener.snapshot import RedirectSnapshot, build_snapshot, encode_code, write_delta, write_snapshot
+from app.shortener.tiering import archive_links
+
+
+@pytest.fixture
+def snapshot_path():
+    return os.path.join(tempfile.mkdtemp(prefix="shortener-snap-"), "redirects.snap")
+
+
+def seed(**codes):
+    with SessionLocal() as db:
+        db.add_all(URL(short_code=code, target_url=target, clicks=0) for code, target in codes.items())
+        db.commit()
+
+
+def test_encoding_preserves_order():
+    codes = sorted(["abc", "abcd", "ab", "A_9", "zz", "-x", "_"])
+    encoded = [encode_code(code) for code in codes]
+    assert encoded == sorted(encoded)
+    assert encode_code("toolongcode") is None
+    assert encode_code("a b") is None
+
+
+def test_lookup_binary_search(snapshot_path):
+    expires = datetime(2030, 1, 1)
+    rows = [(f"c{i:05d}", f"https://example.com/{i}", None, None) for i in range(0, 2000, 2)]
+    rows.append(("perm", "https://example.com/perm", 301, expires))
+    summary = write_snapshot(snapshot_path, rows)
+    assert summary["links"] == 1001
+
+    snapshot = RedirectSnapshot(snapshot_path)
+    snapshot.open()
+    assert snapshot.lookup("c00042").target_url == "https://example.com/42"
+    assert snapshot.lookup("c00043") is None
+    assert snapshot.lookup("perm") == ("https://example.com/perm", 301, expires)
+    assert snapshot.lookup("zzzzzz") is None
+    assert snapshot.lookup("") is None
+
+
+def test_deltas_are_applied_on_refresh(snapshot_path):
+    seed(keep="https://example.com/keep", gone="https://example.com/gone")
+    with SessionLocal() as db:
+        build_snapshot(db, snapshot_path)
+    snapshot = RedirectSnapshot(snapshot_path)
+    snapshot.refresh()
+    assert snapshot.lookup("gone").target_url == "https://example.com/gone"
+
+    seed(fresh="https://example.com/fresh")
+    with SessionLocal() as db:
+        db.query(URL).filter(URL.short_code == "gone").update({URL.is_active: False})
+        db.commit()
+        delta = write_delta(db, snapshot_path)
+    # 늦은 커밋 대비 겹치는 구간 때문에 스냅샷 직전에 만든 keep도 다시 포함될 수 있음
+    assert delta["changes"] >= 2
+
+    assert snapshot.refresh() == 1
+    assert snapshot.lookup("fresh").target_url == "https://example.com/fresh"
+    assert snapshot.lookup("gone") is None
+    assert snapshot.lookup("keep").target_url == "https://example.com/keep"
+
+
+def test_archived_active_links_stay_in_snapshot(snapshot_path):
+    seed(idle="https://example.com/idle", other="https://example.com/other")
+    old = datetime.utcnow() - timedelta(days=400)
+    with SessionLocal() as db:
+        db.query(URL).filter(URL.short_code.in_(["idle", "other"])).update(
+            {URL.created_at: old, URL.updated_at: old}, synchronize_session=False
+        )
+        db.commit()
+        assert archive_links(db, idle_days=180)["archived"] == 2
+        build_snapshot(db, snapshot_path)
+    snapshot = RedirectSnapshot(snapshot_path)
+    snapshot.refresh()
+    assert snapshot.lookup("idle").target_url == "https://example.com/idle"
+
+    # 보관된 링크를 비활성화하면 델타에 del로 반영
+    with SessionLocal() as db:
+        db.query(ArchivedURL).filter(ArchivedURL.short_code == "other").update({ArchivedURL.is_active: False})
+        db.commit()
+        write_delta(db, snapshot_path)
+    snapshot.refresh()
+    assert snapshot.lookup("other") is None
+    assert snapshot.lookup("idle").target_url == "https://example.com/idle"
+
+
+def test_edge_mode_serves_from_snapshot_without_db(client, snapshot_path, monkeypatch, query_counter):
+    write_snapshot(snapshot_path, [("edge01", "https://example.com/edge", 308, None)])
+    snapshot = RedirectSnapshot(snapshot_path)
+    snapshot.refresh()
+    monkeypatch.setattr("app.shortener.service.redirect_snapshot", snapshot)
+    monkeypatch.setattr("app.shortener.service.REDIRECT_SOURCE", "edge")
+
+    with query_counter() as counter:
+        res = client.get("/shortener/v1/edge01", follow_redirects=False)
+        assert client.get("/shortener/v1/nosuch", follow_redirects=False).status_code == 404
+    assert res.status_code == 308
+    assert res.headers["location"] == "https://example.com/edge"
+    assert counter.count == 0
+
+
+def test_fallback_mode_uses_snapshot_when_db_fails(client, snapshot_path, monkeypatch):
+    write_snapshot(snapshot_path, [("fall01", "https://example.com/fall", None, None)])
+    snapshot = RedirectSnapshot(snapshot_path)
+    snapshot.refresh()
+    monkeypatch.setattr("app.shortener.service.redirect_snapshot", snapshot)
+    monkeypatch.setattr("app.shortener.service.REDIRECT_SOURCE", "fallback")
+
+    def broken_lookup(*args, **kwargs):
+        raise OperationalError("SELECT", {}, Exception("database is down"))
+
+    monkeypatch.setattr("app.shortener.service.get_redirect_from_db", broken_lookup)
+    res = client.get("/shortener/v1/fall01", follow_redirects=False)
+    assert res.status_code == 307
+    assert res.headers["location"] == "https://example.com/fall"
+
+
+def test_fallback_mode_keeps_redirecting_during_outage(client, snapshot_path, monkeypatch):
+    # 캐시에 있는 링크는 클릭 기록을 건너뛰고, 필터에 없는 키는 sync 대신 스냅샷으로 응답
+    seed(warm01="https://example.com/warm")
+    with SessionLocal() as db:
+        code_filter.build(db, snapshot_path="")
+    assert client.get("/shortener/v1/warm01", follow_redirects=False).status_code == 307
+    write_snapshot(snapshot_path, [("fresh1", "https://example.com/fresh", None, None)])
+    snapshot = RedirectSnapshot(snapshot_path)
+    snapshot.refresh()
+    monkeypatch.setattr("app.shortener.service.redirect_snapshot", snapshot)
+    monkeypatch.setattr("app.shortener.service.REDIRECT_SOURCE", "fallback")
+    monkeypatch.setattr("app.shortener.code_filter.BLOOM_SYNC_INTERVAL_SECONDS", 0)
+
+    def database_down(*args):
+        raise OperationalError("SELECT", {}, Exception("database is down"))
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", database_down)
+    try:
+        res = client.get("/shortener/v1/warm01", headers={"user-agent": "outage"}, follow_redirects=False)
+        fresh = client.get("/shortener/v1/fresh1", follow_redirects=False)
+    finally:
+        event.remove(engine, "before_cursor_execute", database_down)
+    assert (res.status_code, res.headers["location"]) == (307, "https://example.com/warm")
+    assert (fresh.status_code, fresh.headers["location"]) == (307, "https://example.com/fresh")
+    with SessionLocal() as db:
+        assert db.query(URL.clicks).filter(URL.short_code == "warm01").scalar() == 1
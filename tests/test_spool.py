@@ -0,0 +1,143 @@
+# 클릭 스풀(append-only 세그먼트 파일) 테스트
+import os
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.analytics import spool as spool_module
+from app.analytics.spool import (
+    ClickEvent, ClickSpool, click_spool_discarded, encode_event, list_segments, read_checkpoint, read_records,
+)
+from app.db.database import SessionLocal, get_engine
+
+
+def shorten(client, target_url="https://example.com/spooled"):
+    return client.post("/shortener/v1/shorten", json={"target_url": target_url}).json()["short_code"]
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    """fsync는 테스트에서 직접 호출 (sync), 리디렉션이 이 스풀을 사용하도록 교체"""
+    spool = ClickSpool(root=str(tmp_path), writer_id="worker", fsync_ms=60_000)
+    spool.open()
+    monkeypatch.setattr("app.shortener.service.click_spool", spool)
+    yield spool
+    spool.close()
+
+
+def drain(spool):
+    get_engine()
+    with SessionLocal() as db:
+        return spool.drain(db)
+
+
+def test_redirect_appends_to_spool_without_touching_the_database(client, spool, query_counter):
+    short_code = shorten(client)
+    assert client.get(f"/shortener/v1/{short_code}", follow_redirects=False).status_code == 307
+    with query_counter() as counter:
+        res = client.get(f"/shortener/v1/{short_code}", headers={"user-agent": "other"}, follow_redirects=False)
+    assert res.status_code == 307
+    assert counter.count == 0, counter.report()  # 캐시된 리디렉션 + 스풀 append
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 0
+
+    spool.sync()
+    assert drain(spool) == 2
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 2
+    assert client.get(f"/analytics/v1/{short_code}").json()["total_clicks"] == 2
+    assert read_checkpoint(spool.directory) == (1, os.path.getsize(os.path.join(spool.directory, "clicks-000000000001.seg")))
+    assert drain(spool) == 0  # 체크포인트 이후에 새 레코드 없음
+
+
+def test_unsynced_records_wait_for_fsync(client, spool):
+    short_code = shorten(client)
+    spool.append(short_code, "10.0.0.1", "ua", False)
+    assert drain(spool) == 0
+    spool.sync()
+    assert drain(spool) == 1
+
+
+def test_segments_rotate_and_drained_segments_are_removed(client, tmp_path):
+    short_code = shorten(client)
+    spool = ClickSpool(root=str(tmp_path), writer_id="worker", segment_bytes=200, fsync_ms=60_000)
+    spool.open()
+    try:
+        for i in range(20):
+            assert spool.append(short_code, f"10.0.0.{i}", "ua", False)
+        spool.sync()
+        assert len(list_segments(spool.directory)) > 3
+        assert drain(spool) == 20
+        # 쓰는 중인 세그먼트만 남고 스풀 크기도 그만큼으로 줄어듦
+        remaining = list_segments(spool.directory)
+        assert len(remaining) == 1
+        assert spool._bytes == os.path.getsize(os.path.join(spool.directory, f"clicks-{remaining[0]:012d}.seg"))
+    finally:
+        spool.close()
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 20
+
+
+def test_crashed_writer_directory_is_drained_by_another_process(client, tmp_path):
+    short_code = shorten(client)
+    dead = ClickSpool(root=str(tmp_path), writer_id="dead", fsync_ms=60_000)
+    dead.open()
+    for i in range(3):
+        dead.append(short_code, f"10.0.0.{i}", "ua", False)
+    dead.close()  # 잠금이 풀린 디렉터리 = 끝난 프로세스
+    # 쓰는 도중 죽어 마지막 레코드가 잘린 상태
+    with open(os.path.join(dead.directory, "clicks-000000000001.seg"), "ab") as f:
+        f.write(encode_event(ClickEvent(short_code, "10.0.0.9", "ua", False, 0.0))[:-5])
+    torn_before = click_spool_discarded.labels("torn").value
+
+    live = ClickSpool(root=str(tmp_path), writer_id="live", fsync_ms=60_000)
+    live.open()
+    try:
+        assert drain(live) == 3
+    finally:
+        live.close()
+    assert click_spool_discarded.labels("torn").value == torn_before + 1
+    assert not os.path.exists(dead.directory)
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 3
+
+
+def test_corrupt_record_stops_reading_the_segment(tmp_path):
+    path = tmp_path / "clicks-000000000001.seg"
+    records = [encode_event(ClickEvent("abc", None, None, False, float(i))) for i in range(3)]
+    broken = bytearray(records[1])
+    broken[-1] ^= 0xFF
+    path.write_bytes(records[0] + bytes(broken) + records[2])
+    events, offset, problem = read_records(str(path), 0, path.stat().st_size, 100)
+    assert [event.timestamp for event in events] == [0.0]
+    assert (offset, problem) == (len(records[0]), "corrupt")
+
+
+def test_full_spool_falls_back_to_database(client, tmp_path, monkeypatch):
+    spool = ClickSpool(root=str(tmp_path), writer_id="worker", max_bytes=1, fsync_ms=60_000)
+    spool.open()
+    monkeypatch.setattr("app.shortener.service.click_spool", spool)
+    try:
+        short_code = shorten(client)
+        client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+    finally:
+        spool.close()
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 1
+
+
+def test_clicks_are_kept_while_the_database_is_down(client, spool, monkeypatch):
+    short_code = shorten(client)
+    for i in range(5):
+        spool.append(short_code, f"10.0.0.{i}", "ua", False)
+    spool.sync()
+
+    def db_down(*args, **kwargs):
+        raise OperationalError("UPDATE", {}, Exception("database is down"))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(spool_module, "increment_clicks", db_down)
+        with pytest.raises(OperationalError):
+            drain(spool)
+    # 롤백: 클릭 로그도 남지 않고 체크포인트도 그대로
+    assert read_checkpoint(spool.directory) == (0, 0)
+    assert client.get(f"/analytics/v1/{short_code}").json()["total_clicks"] == 0
+
+    assert drain(spool) == 5
+    assert client.get(f"/shortener/v1/stats/{short_code}").json()["clicks"] == 5
+    assert client.get(f"/analytics/v1/{short_code}").json()["total_clicks"] == 5
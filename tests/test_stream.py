@@ -0,0 +1,106 @@
+# 실시간 클릭 수 스트림(SSE) 테스트
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.shortener.stream import ClickStreamHub, stats_stream
+
+
+def shorten(client, target_url="https://example.com/live"):
+    return client.post("/shortener/v1/shorten", json={"target_url": target_url}).json()["short_code"]
+
+
+def parse(chunk: str) -> tuple[str, dict]:
+    lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+class FakeCounts:
+    def __init__(self, counts):
+        self.counts = counts
+        self.reads = []
+
+    def __call__(self, codes):
+        self.reads.append(codes)
+        return dict((code, self.counts[code]) for code in codes if code in self.counts)
+
+
+def test_one_read_per_tick_and_coalesced_deltas_for_slow_subscribers():
+    async def scenario():
+        read = FakeCounts({"a": (1, 0), "b": (5, 1)})
+        hub = ClickStreamHub(tick=0.02, read=read)
+        fast = hub.events(["a", "b"])
+        slow = hub.subscribe(["a", "missing"])  # 읽지 않고 쌓아 두는 구독자
+        assert parse(await anext(fast)) == ("snapshot", {"a": {"clicks": 1, "bot_clicks": 0},
+                                                         "b": {"clicks": 5, "bot_clicks": 1}})
+
+        # 구독자가 여럿이어도 tick마다 합집합을 한 번만 조회
+        await asyncio.sleep(0.05)
+        assert all(codes == ["a", "b", "missing"] for codes in read.reads)
+        assert len(read.reads) <= 5
+
+        read.counts["a"] = (3, 0)
+        assert parse(await anext(fast)) == ("clicks", {"a": {"clicks": 3, "bot_clicks": 0, "delta": 2, "bot_delta": 0}})
+        # slow는 아직 첫 이벤트도 읽지 않음: snapshot 합계만 최신으로
+        assert slow.take() == ("snapshot", {"a": {"clicks": 3, "bot_clicks": 0}, "missing": None})
+
+        # 읽지 않는 동안의 변경은 키별로 합쳐짐 (이벤트가 쌓이지 않음)
+        for clicks in (4, 6, 9):
+            read.counts["a"] = (clicks, 1)
+            await asyncio.sleep(0.05)
+        assert slow.take() == ("clicks", {"a": {"clicks": 9, "bot_clicks": 1, "delta": 6, "bot_delta": 1}})
+
+        await fast.aclose()
+        hub.unsubscribe(slow)
+        assert len(hub) == 0
+        await asyncio.sleep(0.05)
+        assert hub._task.done()  # 구독자가 없으면 생산자도 멈춤
+
+    asyncio.run(scenario())
+
+
+def test_keepalive_and_read_errors():
+    async def scenario():
+        def broken(codes):
+            raise RuntimeError("db down")
+
+        hub = ClickStreamHub(tick=0.01, keepalive=0.03, read=broken)
+        events = hub.events(["a"])
+        assert await anext(events) == ": keepalive\n\n"
+        await events.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_stream_endpoint_sends_snapshot_then_changes(client, monkeypatch):
+    monkeypatch.setattr(stats_stream, "tick", 0.05)
+    short_code = shorten(client)
+    client.get(f"/shortener/v1/{short_code}", follow_redirects=False)
+
+    # TestClient는 응답 본문을 끝까지 받은 뒤 반환하므로 두 번째 클릭은 다른 스레드에서
+    click = threading.Timer(
+        0.2, lambda: client.get(f"/shortener/v1/{short_code}", headers={"user-agent": "second"}, follow_redirects=False)
+    )
+    click.start()
+    res = client.get("/shortener/v1/stats/stream", params={"codes": f"{short_code},nope", "limit": 2})
+    click.join()
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    snapshot, changes = res.text.strip().split("\n\n")
+    assert parse(snapshot) == ("snapshot", {short_code: {"clicks": 1, "bot_clicks": 0}, "nope": None})
+    assert parse(changes) == ("clicks", {short_code: {"clicks": 2, "bot_clicks": 0, "delta": 1, "bot_delta": 0}})
+    assert len(stats_stream) == 0
+
+
+@pytest.mark.parametrize("codes", ["", ",,", ",".join(f"c{i}" for i in range(101))])
+def test_stream_rejects_empty_or_oversized_subscriptions(client, codes):
+    assert client.get("/shortener/v1/stats/stream", params={"codes": codes}).status_code == 422
+
+
+def test_stream_rejects_when_worker_is_full(client, monkeypatch):
+    monkeypatch.setattr(stats_stream, "max_subscribers", 0)
+    res = client.get("/shortener/v1/stats/stream", params={"codes": "abc"})
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "5"
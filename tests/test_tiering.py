@@ -0,0 +1,137 @@
+# 링크 보관(cold storage) 계층 테스트
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.db.database import SessionLocal
+from app.shortener import crud
+from app.shortener.code_filter import code_filter
+from app.shortener.models import URL, ArchivedURL, URLClickCounter, URLTarget
+from app.shortener.tiering import archive_links, restore_revived
+
+
+def shorten(client, target_url):
+    return client.post("/shortener/v1/shorten", json={"target_url": target_url}).json()["short_code"]
+
+
+def superuser_headers(client, email="archivist@example.com", password="archivist-password"):
+    from app.auth.models.user import User
+
+    client.post("/user/v1/register/", json={"email": email, "password": password})
+    with SessionLocal() as db:
+        db.query(User).filter(User.email == email).update({User.is_superuser: True})
+        db.commit()
+    token = client.post("/user/v1/login/", json={"email": email, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def click(client, short_code, user_agent="tiering-test"):
+    return client.get(f"/shortener/v1/{short_code}", headers={"user-agent": user_agent}, follow_redirects=False)
+
+
+def test_deactivated_and_idle_links_move_to_archive_in_batches(client):
+    inactive = shorten(client, "https://example.com/inactive")
+    idle = shorten(client, "https://example.com/idle")
+    live = shorten(client, "https://example.com/live")
+    click(client, inactive)
+    client.delete(f"/shortener/v1/{inactive}")
+    old = datetime.utcnow() - timedelta(days=400)
+    with SessionLocal() as db:
+        db.query(URL).filter(URL.short_code == idle).update(
+            {URL.created_at: old, URL.updated_at: old}, synchronize_session=False
+        )
+        db.commit()
+
+        assert archive_links(db, idle_days=180, batch_size=1) == {"archived": 2, "batches": 2}
+        assert archive_links(db, idle_days=180) == {"archived": 0, "batches": 0}
+
+        assert {u.short_code for u in db.query(URL)} == {live}
+        assert {a.short_code for a in db.query(ArchivedURL)} == {inactive, idle}
+        assert not db.scalars(select(URLClickCounter.short_code).where(URLClickCounter.short_code != live)).all()
+        assert [t.short_code for t in db.query(URLTarget)] == [live]
+        # 접지 않은 분산 카운터 클릭도 보관 행에 합쳐짐
+        assert db.query(ArchivedURL).filter(ArchivedURL.short_code == inactive).one().clicks == 1
+
+    # 보관된 링크: 비활성은 404, 활성(idle)은 보관 테이블에서 리디렉션
+    assert click(client, inactive).status_code == 404
+    assert click(client, idle).status_code == 307
+    stats = client.get(f"/shortener/v1/stats/{inactive}").json()
+    assert stats["clicks"] == 1 and stats["is_active"] is False
+    assert client.get(f"/shortener/v1/stats/{idle}").json()["clicks"] == 1
+
+
+def test_archive_folds_the_counter_rows_it_deletes(client, query_counter):
+    # 합계는 DELETE ... RETURNING으로 지운 행에서 계산 (따로 SELECT sum 후 DELETE하지 않음)
+    short_code = shorten(client, "https://example.com/folded")
+    for user_agent in ("first", "second", "curl/8.4.0"):
+        click(client, short_code, user_agent)
+    client.delete(f"/shortener/v1/{short_code}")
+
+    with SessionLocal() as db, query_counter() as counter:
+        assert archive_links(db)["archived"] == 1
+    statements = [statement.lower() for statement in counter.statements]
+    assert any(s.startswith("delete from url_click_counters") and "returning" in s for s in statements)
+    assert not any("sum(url_click_counters" in s for s in statements)
+    with SessionLocal() as db:
+        archived = db.query(ArchivedURL).filter(ArchivedURL.short_code == short_code).one()
+        assert (archived.clicks, archived.bot_clicks) == (2, 1)
+
+
+def test_archive_lookup_only_on_primary_miss(client, query_counter):
+    short_code = shorten(client, "https://example.com/hot-only")
+    with query_counter() as counter:
+        assert click(client, short_code).status_code == 307
+    assert not any("archived_urls" in statement for statement in counter.statements)
+
+
+def test_reactivation_moves_archived_link_back(client):
+    short_code = shorten(client, "https://example.com/comeback")
+    click(client, short_code)
+    client.delete(f"/shortener/v1/{short_code}")
+    with SessionLocal() as db:
+        assert archive_links(db)["archived"] == 1
+
+    headers = superuser_headers(client)
+    res = client.post(f"/shortener/v1/{short_code}/activate", headers=headers)
+    assert res.status_code == 200
+    with SessionLocal() as db:
+        url = db.query(URL).filter(URL.short_code == short_code).one()
+        assert url.is_active and url.clicks == 1
+        assert db.query(ArchivedURL).count() == 0
+        assert db.query(URLClickCounter).filter(URLClickCounter.short_code == short_code).count() > 0
+    assert click(client, short_code).status_code == 307
+    # url_targets도 복원되어 같은 원본 URL은 같은 단축 키를 받음
+    assert shorten(client, "https://example.com/comeback") == short_code
+    assert client.post("/shortener/v1/missing/activate", headers=headers).status_code == 404
+
+
+def test_clicked_archived_links_are_restored_by_the_job(client):
+    short_code = shorten(client, "https://example.com/revived")
+    old = datetime.utcnow() - timedelta(days=400)
+    with SessionLocal() as db:
+        db.query(URL).filter(URL.short_code == short_code).update(
+            {URL.created_at: old, URL.updated_at: old}, synchronize_session=False
+        )
+        db.commit()
+        assert archive_links(db, idle_days=180, now=datetime.utcnow() - timedelta(seconds=1))["archived"] == 1
+        assert restore_revived(db) == 0
+
+    assert click(client, short_code).status_code == 307
+    with SessionLocal() as db:
+        assert db.query(ArchivedURL).one().clicks == 1
+        assert restore_revived(db) == 1
+        assert db.query(URL).filter(URL.short_code == short_code).one().clicks == 1
+
+
+def test_new_codes_do_not_reuse_archived_codes(client, monkeypatch):
+    short_code = shorten(client, "https://example.com/taken")
+    client.delete(f"/shortener/v1/{short_code}")
+    with SessionLocal() as db:
+        archive_links(db)
+        code_filter.build(db, snapshot_path="")
+        assert code_filter.might_exist(short_code, record=False)
+        code_filter.reset()
+
+        keys = iter([short_code, "fresh1"])
+        monkeypatch.setattr(crud.secrets, "token_urlsafe", lambda length: next(keys))
+        assert crud.generate_short_code(db) == "fresh1"
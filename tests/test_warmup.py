@@ -0,0 +1,77 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.db.database import SessionLocal
+from app.main import app
+from app.shortener.cache import RedirectCache, redirect_cache
+from app.shortener.models import URL
+from app.shortener.warmup import warm_up_redirect_cache
+
+
+def seed_urls(clicks_by_code):
+    db = SessionLocal()
+    try:
+        for code, clicks in clicks_by_code.items():
+            db.add(URL(short_code=code, target_url=f"https://example.com/{code}", clicks=clicks))
+        db.add(URL(short_code="gone", target_url="https://example.com/gone", clicks=999, is_active=False))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_warm_up_loads_most_clicked_active_urls():
+    seed_urls({"aaa": 5, "bbb": 50, "ccc": 500})
+    cache = RedirectCache(max_entries=10)
+
+    summary = warm_up_redirect_cache(cache, top_k=2, batch_size=1, time_budget=5)
+
+    assert summary["loaded"] == 2 and not summary["timed_out"]
+    assert cache.get("ccc").target_url == "https://example.com/ccc"
+    assert cache.get("bbb").target_url == "https://example.com/bbb"
+    assert cache.get("aaa") is None
+    assert cache.get("gone") is None
+
+
+def test_warm_up_stops_at_time_budget():
+    seed_urls({f"c{i}": i for i in range(10)})
+    cache = RedirectCache(max_entries=100)
+
+    summary = warm_up_redirect_cache(cache, top_k=10, batch_size=2, time_budget=0)
+
+    assert summary["timed_out"]
+    assert summary["loaded"] == 2
+
+
+def test_redirect_served_from_cache_skips_url_lookup(client, query_counter):
+    seed_urls({"hot": 100})
+    redirect_cache.put("hot", "https://example.com/hot")
+
+    with query_counter() as counter:
+        res = client.get("/shortener/v1/hot", follow_redirects=False)
+
+    assert res.headers["location"] == "https://example.com/hot"
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in counter.statements)
+
+
+def test_deactivate_invalidates_cache(client):
+    seed_urls({"hot": 100})
+    redirect_cache.put("hot", "https://example.com/hot")
+
+    client.delete("/shortener/v1/hot")
+
+    assert redirect_cache.get("hot") is None
+    assert client.get("/shortener/v1/hot", follow_redirects=False).status_code == 404
+
+
+def test_ready_after_startup_warm_up():
+    seed_urls({"hot": 100})
+    with TestClient(app) as client:
+        for _ in range(100):
+            res = client.get("/internal/health/ready")
+            if res.status_code == 200:
+                break
+            time.sleep(0.01)
+        assert res.status_code == 200
+        assert res.json()["checks"]["redirect_cache_warmup"]["status"] == "ok"
+        assert redirect_cache.get("hot").target_url == "https://example.com/hot"